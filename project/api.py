@@ -0,0 +1,358 @@
+"""
+Steam游戏数据分析JSON API
+以ASGI应用的形式提供仪表盘的关键指标、各标签页聚合表、热门发行商和数据质量结果
+运行方式（在project目录下）：uvicorn api:app --port 8000
+自检（在当前数据上请求各接口，包括没有满足条件的游戏的过滤条件）：python api.py
+环境变量STEAM_CSV指定CSV数据路径；STEAM_PARQUET指定Parquet文件时改用DuckDB后端
+数据文件更新后（最多VERSION_CHECK_SECONDS秒内）自动重新加载，无需重启服务
+"""
+import asyncio  # 导入asyncio用于并发请求合并
+import hashlib  # 导入hashlib用于生成ETag
+import json  # 导入json用于序列化响应
+import math  # 导入math用于处理非有限浮点数
+import os  # 导入os用于读取环境变量
+import sys  # 导入sys用于自检的退出码
+import time  # 导入time用于记录计算耗时
+from urllib.parse import parse_qs  # 导入查询字符串解析函数
+
+import numpy as np  # 导入numpy用于类型转换
+import pandas as pd  # 导入pandas用于数据处理
+from utils.backend import create_backend, compute_key_metrics, compute_aggregates  # 从utils.backend模块导入查询后端和聚合函数
+from utils.io import DATA_PATH, preprocess_data, data_version  # 从utils.io模块导入数据路径、预处理函数和数据版本函数
+from utils.prep import filters_cache_key  # 从utils.prep模块导入过滤条件规范化函数
+from utils.viz import compute_data_quality  # 从utils.viz模块导入数据质量计算函数
+from utils.memory import memory_budget  # 从utils.memory模块导入共享内存预算
+
+DEFAULT_TOP_K = 10  # 热门发行商默认返回数量
+MAX_TOP_K = 500  # 热门发行商最大返回数量
+PUBLISHER_SORT_KEYS = ('game_count', 'owners_median', 'positive_ratio')  # 热门发行商可用的排序指标
+PLATFORMS = ('Windows', 'Mac', 'Linux')  # 可过滤的平台
+VERSION_CHECK_SECONDS = 2.0  # 检查数据文件是否更新的最短间隔（秒），避免每个请求都访问文件系统
+CHECK_REQUESTS = [  # 自检请求：(路径, 查询字符串, 期望状态码, 期望的total_games（None表示不检查）)
+    ('/health', '', 200, None),
+    ('/metrics', '', 200, None),
+    ('/metrics', 'year_min=2030', 200, 0),  # 没有满足条件的游戏：返回空指标而不是500
+    ('/metrics', 'price_min=1000', 200, 0),
+    ('/aggregates', 'year_min=2030', 200, None),
+    ('/publishers/top', 'price_min=1000', 200, None),
+    ('/data-quality', 'year_min=2030', 200, None),
+    ('/metrics', 'year_min=abc', 400, None),  # 参数错误
+    ('/publishers/top', 'by=x', 400, None),
+    ('/nope', '', 404, None),
+]
+
+
+class HTTPError(Exception):
+    """
+    请求参数错误等需要直接返回给客户端的错误
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status  # HTTP状态码
+        self.message = message  # 错误信息
+
+
+_state = {'backend': None, 'version': None, 'quarantine': None, 'path': None, 'checked': 0.0}  # 查询后端、数据版本、加载时被隔离的行、数据路径和上次检查版本的时间（首次请求时加载）
+_inflight = {}  # 正在计算的请求：缓存键 -> asyncio.Future
+
+
+def _load_backend():
+    """
+    创建查询后端并计算数据版本号（在读取数据之前计算，加载期间文件被更新时下一次检查会再次重新加载）
+    返回(后端, 版本号, 被隔离的行, 数据路径)；Parquet文件只包含有效行，没有隔离记录
+    """
+    parquet_path = os.environ.get('STEAM_PARQUET')  # Parquet文件路径
+    path = parquet_path or os.environ.get('STEAM_CSV', DATA_PATH)  # 数据文件路径
+    version = data_version(path)
+    if parquet_path:  # 有Parquet文件时使用SQL后端，不把数据加载到内存
+        backend, quarantine = create_backend('duckdb', parquet_path), None
+    else:  # 否则读取CSV并预处理，使用pandas后端
+        df, details = preprocess_data(pd.read_csv(path), return_details=True)
+        backend, quarantine = create_backend('pandas', df), details['date_quarantine']
+    return backend, version, quarantine, path
+
+
+async def _ensure_backend():
+    """
+    确保查询后端已加载且数据文件没有更新（并发的请求共享同一次加载）
+    每VERSION_CHECK_SECONDS秒最多比较一次数据版本，版本改变时重新加载并丢弃旧版本的缓存响应
+    返回查询后端
+    """
+    now = time.monotonic()
+    if _state['backend'] is not None and now - _state['checked'] >= VERSION_CHECK_SECONDS:  # 定期检查数据文件
+        _state['checked'] = now
+        if data_version(_state['path']) != _state['version']:  # 数据文件已更新
+            _state['backend'] = None
+            memory_budget.clear('api')  # 旧版本的响应不会再被命中
+    if _state['backend'] is None:
+        _state['backend'], _state['version'], _state['quarantine'], _state['path'] = await _coalesce(('__load__',), _load_backend)
+        _state['checked'] = time.monotonic()
+    return _state['backend']
+
+
+async def _coalesce(key, func, *args):
+    """
+    请求合并：相同键的并发请求只在工作线程中计算一次，其余请求等待同一个结果
+    返回计算结果
+    """
+    future = _inflight.get(key)  # 是否已有相同的计算在进行
+    if future is not None:
+        return await asyncio.shield(future)  # 等待者断开连接时不取消共享的计算
+    future = asyncio.get_running_loop().create_future()  # 新建共享结果
+    _inflight[key] = future
+    try:
+        result = await asyncio.to_thread(func, *args)  # 阻塞的pandas/DuckDB计算放到线程池
+        future.set_result(result)
+        return result
+    except BaseException as error:
+        future.set_exception(error)  # 把异常传给所有等待者
+        future.exception()  # 标记异常已读取，没有等待者时不产生警告
+        raise
+    finally:
+        _inflight.pop(key, None)  # 计算结束，后续请求重新进入缓存或计算
+
+
+def _to_jsonable(value):
+    """
+    将结果中的DataFrame、numpy类型和非有限浮点数转换为可JSON序列化的对象
+    """
+    if isinstance(value, pd.DataFrame):  # DataFrame转为记录列表
+        return [_to_jsonable(record) for record in value.to_dict(orient='records')]
+    if isinstance(value, dict):
+        return {str(k): _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, np.generic):  # numpy标量转为Python标量
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):  # NaN和无穷大转为null
+        return None
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return value
+
+
+def _single(params, name, default=None):
+    """
+    读取单值查询参数
+    """
+    values = params.get(name)
+    return values[-1] if values else default
+
+
+def _number(params, name, default, cast=float):
+    """
+    读取数值查询参数，格式错误时返回400
+    """
+    raw = _single(params, name)
+    if raw is None or raw == '':
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        raise HTTPError(400, f"Invalid value for '{name}': {raw}")
+
+
+def _list(params, name):
+    """
+    读取列表查询参数（可重复传参或以逗号分隔）
+    """
+    return [item.strip() for value in params.get(name, []) for item in value.split(',') if item.strip()]
+
+
+def parse_filters(params):
+    """
+    将查询参数转换为与create_sidebar_filters相同结构的过滤条件字典
+    支持year_min、year_max、price_min、price_max、genres、platforms；未指定任何过滤条件时返回None
+    """
+    names = ('year_min', 'year_max', 'price_min', 'price_max', 'genres', 'platforms')  # 过滤参数名
+    if not any(_single(params, name) for name in names):  # 没有过滤条件，使用全部数据
+        return None
+    platforms = _list(params, 'platforms')  # 平台列表
+    unknown = [p for p in platforms if p not in PLATFORMS]
+    if unknown:
+        raise HTTPError(400, f"Unknown platform(s): {', '.join(unknown)}")
+    return {
+        'year_range': (_number(params, 'year_min', 0, int), _number(params, 'year_max', 9999, int)),  # 年份范围
+        'price_range': (_number(params, 'price_min', 0.0), _number(params, 'price_max', math.inf)),  # 价格范围
+        'selected_genres': sorted(set(_list(params, 'genres'))),  # 类型（去重排序）
+        'platform_options': [p for p in PLATFORMS if p in platforms]  # 平台（按固定顺序）
+    }
+
+
+def _top_publishers(backend, filters, k, by, min_games):
+    """
+    统计发行商并按指定指标取前k个
+    返回DataFrame
+    """
+    publishers = backend.aggregate(filters, ('publisher',), {  # 发行商统计
+        'game_count': ('appid', 'count'), 'positive_ratio': ('positive_ratio', 'mean'), 'owners_median': ('owners_median', 'mean')})
+    publishers = publishers[publishers['game_count'] >= min_games]  # 排除游戏数过少的发行商
+    return publishers.sort_values([by, 'publisher'], ascending=[False, True]).head(k).reset_index(drop=True)
+
+
+def _data_quality(backend, filters):
+    """
+    计算过滤后数据的质量报告
+    返回结果字典
+    """
+    frame = backend.df if filters is None and hasattr(backend, 'df') else backend.fetch(filters)  # 过滤后的数据
+    return compute_data_quality(frame, _state['quarantine'])
+
+
+def _route(path, params):
+    """
+    根据路径和查询参数确定要执行的计算
+    返回(缓存键, 计算函数)；计算函数接收查询后端并返回可序列化的结果
+    """
+    filters = parse_filters(params)  # 过滤条件
+    key = filters_cache_key(filters)  # 过滤条件的缓存键
+    if path == '/metrics':  # 关键指标
+        return ('metrics', key), lambda backend: compute_key_metrics(backend, filters)
+    if path == '/aggregates' or path.startswith('/aggregates/'):  # 各标签页聚合表
+        top_n = _number(params, 'top_n', 15, int)
+        table = path[len('/aggregates/'):] if path.startswith('/aggregates/') else None  # 指定的单个聚合表
+
+        def aggregates(backend):
+            tables = compute_aggregates(backend, filters, top_n)
+            if table is None:
+                return tables
+            if table not in tables:
+                raise HTTPError(404, f"Unknown aggregate: {table}")
+            return tables[table]
+        return ('aggregates', key, top_n, table), aggregates
+    if path == '/publishers/top':  # 热门发行商
+        k = _number(params, 'k', DEFAULT_TOP_K, int)
+        by = _single(params, 'by', 'game_count')
+        min_games = _number(params, 'min_games', 1, int)
+        if not 1 <= k <= MAX_TOP_K:
+            raise HTTPError(400, f"'k' must be between 1 and {MAX_TOP_K}")
+        if by not in PUBLISHER_SORT_KEYS:
+            raise HTTPError(400, f"'by' must be one of: {', '.join(PUBLISHER_SORT_KEYS)}")
+        return ('publishers', key, k, by, min_games), lambda backend: _top_publishers(backend, filters, k, by, min_games)
+    if path == '/data-quality':  # 数据质量
+        return ('data-quality', key), lambda backend: _data_quality(backend, filters)
+    raise HTTPError(404, f"Not found: {path}")
+
+
+def _encode(result):
+    """
+    将结果编码为JSON响应体并计算ETag（响应体的哈希，内容相同则ETag相同）
+    返回(ETag, 响应体)
+    """
+    body = json.dumps(_to_jsonable(result), ensure_ascii=False, separators=(',', ':')).encode('utf-8')  # 紧凑JSON
+    return f'"{hashlib.sha1(body).hexdigest()}"', body
+
+
+async def _respond(send, status, body=b'', etag=None, head=False):
+    """
+    发送HTTP响应
+    """
+    headers = [(b'content-type', b'application/json; charset=utf-8'), (b'content-length', str(len(body)).encode())]
+    if etag:  # 允许客户端缓存并用If-None-Match重新验证
+        headers += [(b'etag', etag.encode()), (b'cache-control', b'no-cache')]
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': b'' if head else body})
+
+
+async def _error(send, status, message):
+    """
+    发送JSON格式的错误响应
+    """
+    await _respond(send, status, json.dumps({'error': message}).encode('utf-8'))
+
+
+async def app(scope, receive, send):
+    """
+    ASGI入口：只读GET接口，相同查询的并发请求合并计算，结果按ETag缓存
+    """
+    if scope['type'] == 'lifespan':  # 服务启动时预先加载数据
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await _ensure_backend()
+                    await send({'type': 'lifespan.startup.complete'})
+                except Exception as error:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(error)})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+    if scope['method'] not in ('GET', 'HEAD'):
+        await _error(send, 405, "Method not allowed")
+        return
+
+    path = scope['path'].rstrip('/') or '/'  # 去掉末尾斜杠
+    if path == '/health':  # 健康检查（不触发计算）
+        await _respond(send, 200, json.dumps({'status': 'ok', 'data_version': _state['version'], 'cache_bytes': memory_budget.usage}).encode('utf-8'))
+        return
+    params = parse_qs(scope.get('query_string', b'').decode('utf-8'))  # 查询参数
+    try:
+        route_key, compute = _route(path, params)  # 校验参数并确定计算
+        backend = await _ensure_backend()  # 查询后端
+        key = (_state['version'],) + route_key  # 缓存键包含数据版本：数据文件更新并重新加载后，旧结果不再被命中
+        cached = memory_budget.get('api', key)  # 已缓存的响应（ETag, 响应体），按内存预算淘汰
+        if cached is None:
+            start = time.perf_counter()  # 记录计算耗时作为淘汰代价
+            cached = await _coalesce(key, lambda: _encode(compute(backend)))  # 合并并发的相同请求
+            memory_budget.put('api', key, cached, cost=time.perf_counter() - start)
+    except HTTPError as error:
+        await _error(send, error.status, error.message)
+        return
+    except Exception as error:  # 计算出错
+        await _error(send, 500, f"{type(error).__name__}: {error}")
+        return
+
+    etag, body = cached
+    request_headers = dict(scope.get('headers', []))  # 请求头
+    if_none_match = request_headers.get(b'if-none-match', b'').decode('latin-1')  # 客户端缓存的ETag
+    if etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*':  # 客户端缓存仍然有效
+        await _respond(send, 304, etag=etag, head=True)
+        return
+    await _respond(send, 200, body, etag=etag, head=scope['method'] == 'HEAD')
+
+
+
+async def _request(path, query=''):
+    """
+    在进程内向ASGI应用发送一个GET请求
+    返回(状态码, 响应体)
+    """
+    response = {}
+
+    async def receive():
+        return {'type': 'http.request'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        else:
+            response['body'] = message['body']
+    await app({'type': 'http', 'method': 'GET', 'path': path, 'query_string': query.encode('utf-8'), 'headers': []}, receive, send)
+    return response['status'], response['body']
+
+
+async def check_endpoints():
+    """
+    依次执行CHECK_REQUESTS中的请求，检查状态码和游戏数
+    返回问题描述列表（为空表示全部通过）
+    """
+    problems = []
+    for path, query, status, total_games in CHECK_REQUESTS:
+        actual, body = await _request(path, query)
+        url = f"{path}?{query}" if query else path
+        if actual != status:
+            problems.append(f"{url}: status {actual}, expected {status}: {body[:200].decode('utf-8', 'replace')}")
+        elif total_games is not None and json.loads(body)['total_games'] != total_games:
+            problems.append(f"{url}: total_games {json.loads(body)['total_games']}, expected {total_games}")
+    return problems
+
+
+if __name__ == "__main__":
+    problems = asyncio.run(check_endpoints())
+    for problem in problems:
+        print(problem)
+    print(f"{len(CHECK_REQUESTS) - len(problems)}/{len(CHECK_REQUESTS)} API checks passed")
+    sys.exit(1 if problems else 0)
@@ -1,22 +1,48 @@
 import streamlit as st  # 导入streamlit库，用于构建网页应用
 import pandas as pd  # 导入pandas库，用于数据处理和分析
 from PIL import Image  # 导入PIL库用于处理图片
-from utils.io import load_and_preprocess_data  # 从utils.io模块导入数据加载和预处理函数
-from utils.prep import create_sidebar_filters, apply_filters, calculate_key_metrics  # 从utils.prep模块导入过滤器创建、应用和指标计算函数
-from utils.viz import create_all_visualizations  # 从utils.viz模块导入可视化图表创建函数
+from utils.io import DATA_PATH, load_and_preprocess_data, data_version  # 从utils.io模块导入数据路径、数据加载和预处理函数、数据版本函数
+from utils.prep import create_sidebar_filters, filters_cache_key, require_games  # 从utils.prep模块导入过滤器创建、过滤条件规范化和空选择提示函数
+from utils.incremental import session_filter  # 从utils.incremental模块导入会话级增量过滤引擎
+from utils.linked import linked_filters, linked_figure_overrides, show_linked_selection  # 从utils.linked模块导入图表联动选择函数
+from utils.singleflight import single_flight, FlightTimeout  # 从utils.singleflight模块导入单飞去重函数
+from utils.i18n import DEFAULT_LOCALE, set_locale, t  # 从utils.i18n模块导入界面语言设置和翻译函数
+from utils.figcache import LazyFigures  # 从utils.figcache模块导入按需构建的图表字典
+from utils.memory import memory_budget, estimate_size  # 从utils.memory模块导入共享内存预算和大小估算函数
+from utils.viz import VISUAL_BUILDERS  # 从utils.viz模块导入各图表的构建函数
+from utils.search import build_search_index  # 从utils.search模块导入搜索索引构建函数
+from utils.similarity import build_similarity_index  # 从utils.similarity模块导入相似度索引构建函数
+from utils.explorer import build_explorer_index  # 从utils.explorer模块导入数据浏览器排序索引构建函数
+from utils.export import show_export_panel  # 从utils.export模块导入侧边栏导出面板
+from utils.compare import build_comparison, show_compare_controls  # 从utils.compare模块导入切片对比计算和侧边栏控件
+from utils.cooccurrence import build_cooccurrence_index  # 从utils.cooccurrence模块导入标签关联矩阵构建函数
 from sections.data_overview import show_tab1, show_tab11  # 从sections.data_overview模块导入标签页1和11显示函数
 from sections.trend_analysis import show_tab2, show_tab3, show_tab4, show_tab5  # 从sections.trend_analysis模块导入标签页2-5显示函数
 from sections.market_analysis import show_tab6, show_tab7, show_tab8, show_tab9, show_tab10  # 从sections.market_analysis模块导入标签页6-10显示函数
 from sections.conclusions import show_tab12  # 从sections.conclusions模块导入标签页12显示函数
+from sections.similar_games import show_tab13  # 从sections.similar_games模块导入标签页13显示函数
+from sections.compare_slices import show_tab14  # 从sections.compare_slices模块导入标签页14显示函数
+from sections.tag_cooccurrence import show_tab15  # 从sections.tag_cooccurrence模块导入标签页15显示函数
 
-def main():
+def build_dashboard_view(engine, filters, view_key):
+    """
+    根据过滤条件计算过滤后的数据和关键指标
+    过滤和指标由本会话的增量过滤引擎计算：只改动一个侧边栏控件时只重算该维度，并只统计进入、离开选择的行
+    结果按view_key保存在内存预算中，相同过滤条件再次访问时不再重新计算
+    返回(过滤后的DataFrame, 指标字典)
+    """
+    return memory_budget.get_or_compute('views', view_key, engine.update, filters)  # 过滤结果和指标（按成本感知LRU淘汰）
+
+def main(locale=DEFAULT_LOCALE):
     """
     Streamlit应用主函数
-    构建完整的网页应用界面
+    构建完整的网页应用界面；locale为界面语言（'en'或'zh'，旧版入口steam-analysis.py使用中文）
     """
+    set_locale(locale)  # 设置本会话的界面语言
+    
     # 设置网页配置 - 这些设置会影响整个网页应用的显示
     st.set_page_config(
-        page_title="Steam Game Data Analysis Platform",  # 浏览器标签页标题
+        page_title=t("Steam Game Data Analysis Platform"),  # 浏览器标签页标题
         page_icon="🎮",  # 网页图标（显示在浏览器标签页）
         layout="wide",  # 宽屏布局（充分利用屏幕宽度）
         initial_sidebar_state="expanded"  # 侧边栏初始状态为展开
@@ -41,26 +67,48 @@ def main():
                 st.image(efrei_image, width=160)  # 设置宽度为160像素
                 
             except FileNotFoundError:
-                st.error("❌ Icon files not found, please check file paths")
+                st.error(t("❌ Icon files not found, please check file paths"))
             except Exception as e:
-                st.error(f"❌ Error loading images: {e}")
+                st.error(t("❌ Error loading images: {error}", error=e))
         
         # 添加分隔线
         st.markdown("---")
     
     # 显示加载状态 - 在数据加载和处理期间显示旋转图标和提示文本
-    with st.spinner('🚀 Loading data and generating visualizations...'):
+    with st.spinner(t("🚀 Loading data and generating visualizations...")):
         df = load_and_preprocess_data()  # 加载并预处理数据，返回处理后的DataFrame
+        search_index = build_search_index(df)  # 构建搜索索引（缓存，只在数据加载后构建一次）
+        similarity_index = build_similarity_index(df)  # 构建相似度索引（缓存，只在数据加载后构建一次）
+        explorer_index = build_explorer_index(df)  # 构建数据浏览器的排序索引（缓存，只在数据加载后构建一次）
+        version = data_version()  # 数据版本号
+        cooccurrence_index = build_cooccurrence_index(df, version)  # 构建类型、标签关联矩阵（缓存，每个数据版本只构建一次）
+        if not memory_budget.contains('datasets', (DATA_PATH, version)):  # 数据加载后登记数据集和索引的大小（只计入用量，不会被淘汰）
+            memory_budget.clear('datasets', pinned=True)  # 数据文件更新后移除旧版本的登记
+            memory_budget.clear('indexes', pinned=True)
+            memory_budget.put('datasets', (DATA_PATH, version), None, size=estimate_size(df), pinned=True)
+            memory_budget.put('indexes', ('search', version), None, size=estimate_size(search_index), pinned=True)
+            memory_budget.put('indexes', ('similarity', version), None, size=estimate_size(similarity_index), pinned=True)
+            memory_budget.put('indexes', ('explorer', version), None, size=estimate_size({key: value for key, value in explorer_index.items() if key != 'df'}), pinned=True)
+            memory_budget.put('indexes', ('cooccurrence', version), None, size=estimate_size(cooccurrence_index['matrices']), pinned=True)
         filters = create_sidebar_filters(df)  # 创建侧边栏过滤器，返回用户选择的过滤条件字典
-        filtered_df = apply_filters(df, filters)  # 应用过滤器，返回过滤后的DataFrame
-        metrics = calculate_key_metrics(filtered_df)  # 计算关键指标，返回包含各种指标的字典
-        visuals = create_all_visualizations(filtered_df)  # 创建所有可视化图表，返回包含所有图表的字典
+        filters.update(linked_filters())  # 在图表中选择的年份范围、类型作为额外的过滤维度
+        show_linked_selection()  # 在侧边栏显示联动选择（可清除）
+        show_compare_controls(filters, df)  # 在侧边栏显示对比模式控件（固定当前过滤条件为切片）
+        engine = session_filter(df, search_index, version)  # 本会话的增量过滤引擎（记住上一次的过滤条件和各维度掩码）
+        view_key = ('dashboard', version, filters_cache_key(filters))  # 同一数据版本下相同过滤条件的会话共享一次计算
+        try:
+            filtered_df, metrics = single_flight(view_key, build_dashboard_view, engine, filters, view_key)
+        except FlightTimeout:  # 等待其他会话超时，改为在本会话中计算
+            filtered_df, metrics = build_dashboard_view(engine, filters, view_key)
+        show_export_panel(filtered_df)  # 在侧边栏显示当前选择和聚合表的导出
+        visuals = LazyFigures(view_key, VISUAL_BUILDERS, filtered_df,  # 按需构建（或从缓存还原）的图表字典：只有当前标签页用到的图表才会构建
+                              overrides=linked_figure_overrides(version, filters, engine))  # 联动图表只应用除自身选择外的过滤条件
     
     # 应用主标题 - 显示在网页顶部的标题
-    st.title("🎮 Steam Game Data Analysis Platform")
+    st.title(t("🎮 Steam Game Data Analysis Platform"))
     
-    # 创建顶部标签页导航 - 定义12个标签页
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10, tab11, tab12_tab = st.tabs([
+    # 创建顶部标签页导航 - 定义15个标签页
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10, tab11, tab12_tab, tab13, tab14, tab15 = st.tabs([t(label) for label in [
         "📋 Dataset Overview",      # 标签1：数据概览和基本信息
         "📈 Time Trend Analysis",    # 标签2：时间序列分析  
         "📅 Monthly Release Analysis",    # 标签3：月度分析板块
@@ -72,65 +120,96 @@ def main():
         "🆓 Free vs Paid Analysis",    # 标签9：商业模式对比分析
         "📊 Multi-dimensional Analysis",      # 标签10：多维度对比分析
         "✅ Data Quality Report",     # 标签11：数据质量检查
-        "💡 Business Insights"   # 标签12：业务结论和建议
-    ])
+        "💡 Business Insights",   # 标签12：业务结论和建议
+        "🔗 Similar Games",   # 标签13：相似游戏推荐
+        "⚖️ Compare Slices",   # 标签14：过滤切片对比
+        "🧩 Tag Co-occurrence"   # 标签15：类型与标签共现分析
+    ]], key='active_tab', on_change='rerun')  # 切换标签页时重新运行，未选中的标签页不执行
     
     # 标签页1：数据集概览
     with tab1:
-        show_tab1(filtered_df, metrics, visuals)  # 调用标签页1显示函数
+        if tab1.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab1(filtered_df, metrics, visuals, explorer_index)  # 调用标签页1显示函数
     
     # 标签页2：时间趋势分析
     with tab2:
-        show_tab2(filtered_df, metrics, visuals)  # 调用标签页2显示函数
+        if tab2.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab2(filtered_df, metrics, visuals)  # 调用标签页2显示函数
     
     # 标签页3：月度发布分析
     with tab3:
-        show_tab3(filtered_df, metrics, visuals)  # 调用标签页3显示函数
+        if tab3.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab3(filtered_df, metrics, visuals)  # 调用标签页3显示函数
     
     # 标签页4：价格销量分析
     with tab4:
-        show_tab4(filtered_df, metrics, visuals)  # 调用标签页4显示函数
+        if tab4.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab4(filtered_df, metrics, visuals)  # 调用标签页4显示函数
     
     # 标签页5：评价参与度分析
     with tab5:
-        show_tab5(filtered_df, metrics, visuals)  # 调用标签页5显示函数
+        if tab5.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab5(filtered_df, metrics, visuals)  # 调用标签页5显示函数
     
     # 标签页6：游戏类型分析
     with tab6:
-        show_tab6(filtered_df, metrics, visuals)  # 调用标签页6显示函数
+        if tab6.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab6(filtered_df, metrics, visuals)  # 调用标签页6显示函数
     
     # 标签页7：开发商分析
     with tab7:
-        show_tab7(filtered_df, metrics, visuals)  # 调用标签页7显示函数
+        if tab7.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab7(filtered_df, metrics, visuals)  # 调用标签页7显示函数
     
     # 标签页8：平台支持分析
     with tab8:
-        show_tab8(filtered_df, metrics, visuals)  # 调用标签页8显示函数
+        if tab8.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab8(filtered_df, metrics, visuals)  # 调用标签页8显示函数
     
     # 标签页9：免费付费分析
     with tab9:
-        show_tab9(filtered_df, metrics, visuals)  # 调用标签页9显示函数
+        if tab9.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab9(filtered_df, metrics, visuals)  # 调用标签页9显示函数
     
     # 标签页10：小倍数分析
     with tab10:
-        show_tab10(filtered_df, metrics, visuals)  # 调用标签页10显示函数
+        if tab10.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab10(filtered_df, metrics, visuals)  # 调用标签页10显示函数
     
     # 标签页11：数据质量报告
     with tab11:
-        show_tab11(filtered_df, metrics, visuals)  # 调用标签页11显示函数
+        if tab11.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab11(filtered_df, metrics, visuals)  # 调用标签页11显示函数
     
     # 标签页12：业务结论和建议
     with tab12_tab:
-        show_tab12(filtered_df, metrics, visuals)  # 调用标签页12显示函数
+        if tab12_tab.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab12(filtered_df, metrics, visuals, cooccurrence_index)  # 调用标签页12显示函数
+    
+    # 标签页13：相似游戏推荐
+    with tab13:
+        if tab13.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab13(filtered_df, metrics, visuals, similarity_index, search_index)  # 调用标签页13显示函数
+    
+    # 标签页14：过滤切片对比
+    with tab14:
+        if tab14.open:  # 只运行当前选中的标签页
+            comparison = build_comparison(df, filters, search_index, version)  # 当前过滤条件与固定切片的对比（一次计算所有切片）
+            show_tab14(filtered_df, metrics, visuals, comparison)  # 调用标签页14显示函数
+    
+    # 标签页15：类型与标签共现分析
+    with tab15:
+        if tab15.open and require_games(filtered_df):  # 只运行当前选中的标签页；选择为空时只显示提示
+            show_tab15(filtered_df, metrics, visuals, cooccurrence_index)  # 调用标签页15显示函数
     
     # 页脚信息 - 显示在网页底部
     st.markdown("---")  # 分隔线
-    st.markdown("*Steam Game Data Analysis Platform: Interactive analysis tool based on real Steam data*")  # 平台描述
-    st.markdown("*Data Source: Steam Game Database*")  # 数据来源
-    st.markdown("*Analysis Tools: Python + Streamlit*")  # 技术栈信息
-    st.markdown("*Professor:Mano Mathew*")
-    st.markdown("*Student name:Yueteng Zhang*")
-    st.markdown("*github Url:https://github.com/junmohan1/Steam-Game-Data-Analysis-Platform.git*")
+    st.markdown(t("*Steam Game Data Analysis Platform: Interactive analysis tool based on real Steam data*"))  # 平台描述
+    st.markdown(t("*Data Source: Steam Game Database*"))  # 数据来源
+    st.markdown(t("*Analysis Tools: Python + Streamlit*"))  # 技术栈信息
+    st.markdown(t("*Professor:Mano Mathew*"))
+    st.markdown(t("*Student name:Yueteng Zhang*"))
+    st.markdown(t("*github Url:https://github.com/junmohan1/Steam-Game-Data-Analysis-Platform.git*"))
 
 
 # 程序入口点 - 确保代码只在直接运行时执行，不在导入时执行
@@ -0,0 +1,70 @@
+import streamlit as st  # 导入streamlit用于创建网页应用界面
+import numpy as np  # 导入numpy用于数值判断
+import pandas as pd  # 导入pandas用于整理指标对比表
+from utils.viz import create_compare_trend_chart, create_compare_genre_chart, create_compare_platform_chart  # 从utils.viz模块导入切片对比图表
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+
+COMPARE_METRICS = [  # 对比的指标：(指标键, 显示名称, 格式)
+    ('total_games', "Total Games", "{:,.0f}"),
+    ('free_game_percentage', "Free Games (%)", "{:.1f}"),
+    ('avg_rating', "Average Positive Rating (%)", "{:.1f}"),
+    ('avg_price', "Average Price (USD)", "{:.2f}"),
+    ('median_price', "Median Price (USD)", "{:.2f}"),
+    ('peak_year', "Peak Release Year", "{:.0f}"),
+    ('unique_genres', "Number of Genres", "{:,.0f}"),
+]
+
+
+def _format(value, fmt):
+    """
+    格式化指标值（缺失值显示为"-"）
+    """
+    if value is None or (isinstance(value, (float, np.floating)) and np.isnan(value)):
+        return "-"
+    return fmt.format(value)
+
+
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
+def show_tab14(df, metrics, visuals, comparison):
+    """
+    显示标签页14：过滤切片对比
+    当前过滤条件为基准切片，与侧边栏中固定的切片并排对比指标和图表，并显示相对基准的变化
+    """
+    st.header(t("⚖️ Filter Slice Comparison"))  # 模块标题
+
+    if comparison is None:  # 还没有固定的切片
+        st.info(t("Set the sidebar filters to a slice you want to compare (e.g. Indie, 2016) and click "
+                  "📌 Pin current filters in the ⚖️ Compare panel, then change the filters. "
+                  "The current filters are compared against every pinned slice."))
+        return
+
+    labels, slice_metrics = comparison['labels'], comparison['metrics']
+    baseline = slice_metrics[0]  # 基准切片（当前过滤条件）的指标
+    columns = st.columns(len(labels))  # 每个切片一列
+    for column, label, values in zip(columns, labels, slice_metrics):
+        with column:
+            st.markdown(f"**{label}**")
+            if values is None:  # 空切片
+                st.caption(t("No games match this slice"))
+                continue
+            for key, name, fmt in COMPARE_METRICS:
+                delta = None
+                if values is not baseline and baseline is not None:  # 非基准切片显示相对基准的变化
+                    difference = values[key] - baseline[key]
+                    delta = None if np.isnan(difference) else fmt.format(difference)
+                st.metric(t(name), _format(values[key], fmt), delta=delta)
+
+    st.subheader(t("📋 Metrics by Slice"))  # 指标对比表
+    table = pd.DataFrame({
+        label: [_format(values[key], fmt) if values else "-" for key, _, fmt in COMPARE_METRICS] +
+               [', '.join(values['top_genres']) if values else "-"]
+        for label, values in zip(labels, slice_metrics)
+    }, index=[name for _, name, _ in COMPARE_METRICS] + ["Top Genres"])
+    st.dataframe(table, use_container_width=True)  # 显示指标对比表
+
+    st.plotly_chart(create_compare_trend_chart(comparison['yearly']), use_container_width=True)  # 年度发布数量对比
+    show_delta = st.radio(t("Genre shares"), [t("Side by side"), t("Difference from current filters")],
+                          horizontal=True, key='compare_genre_mode') != t("Side by side")  # 是否显示相对基准的差值
+    st.plotly_chart(create_compare_genre_chart(comparison['genres'], labels, delta=show_delta), use_container_width=True)  # 类型占比对比
+    st.plotly_chart(create_compare_platform_chart(comparison['platforms']), use_container_width=True)  # 平台支持比例对比
+    st.caption(t("All slices are evaluated in one pass over the data: each count is a single grouped count keyed by slice."))
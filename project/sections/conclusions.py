@@ -1,114 +1,178 @@
 import streamlit as st  # 导入streamlit用于创建网页应用界面
 import pandas as pd  # 导入pandas用于数据处理
+import plotly.express as px  # 导入plotly.express用于创建交互式图表
+from utils.opportunity import score_market_opportunities, summarize_price_ranges, MIN_CELL_GAMES  # 从utils.opportunity模块导入市场机会评分函数
+from utils.cooccurrence import view_cooccurrence, pair_table  # 从utils.cooccurrence模块导入共现统计函数
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
 
-def show_tab12(df, metrics, visuals):
+DEFAULT_ENTRY_PRICE = 5  # 当前选择没有付费游戏（价格中位数为NaN）时建议的入门价格下限
+
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
+def show_tab12(df, metrics, visuals, cooccurrence_index):
     """
     显示标签页12：业务结论和建议
     这是新增的标签页12内容
     """
-    st.header("💡 Business Insights & Strategic Recommendations")  # 模块主标题
+    st.header(t("💡 Business Insights & Strategic Recommendations"))  # 模块主标题
+    
+    opportunities = score_market_opportunities(df)  # 计算当前过滤结果下每个细分市场的蓝海得分
+    price_ranges = summarize_price_ranges(df)  # 计算各价格区间的销量和好评率
+    price_ranges = price_ranges[price_ranges['game_count'] >= MIN_CELL_GAMES]  # 只比较样本量足够的价格区间
+    fusions = pair_table(view_cooccurrence(cooccurrence_index, df, 'genres', visuals.key), MIN_CELL_GAMES)  # 当前过滤结果中的类型组合（按提升度降序）
+    fusions['owners_vs_average'] = fusions['avg_owners_median'] / df['owners_median'].mean()  # 类型组合的平均销量相对当前选择平均值的倍数
+    underexplored = fusions[fusions['lift'] < 1].sort_values('owners_vs_average', ascending=False)  # 比随机组合更少见、但销量较高的类型组合
     
     # 关键发现总结
-    st.subheader("🎯 Key Findings Summary")  # 关键发现子标题
+    st.subheader(t("🎯 Key Findings Summary"))  # 关键发现子标题
     
     col1, col2 = st.columns(2)  # 创建2列布局显示关键指标
     
     with col1:
-        st.metric("Total Market Size", f"{metrics['total_games']:,} games")  # 显示市场总规模指标
-        st.metric("Paid Games Dominance", f"{(100 - metrics['free_game_percentage']):.1f}%")  # 显示付费游戏占比指标
-        st.metric("Player Satisfaction", f"{metrics['avg_rating']:.1f}% positive rating")  # 显示玩家满意度指标
+        st.metric(t("Total Market Size"), f"{metrics['total_games']:,} games")  # 显示市场总规模指标
+        st.metric(t("Paid Games Dominance"), f"{(100 - metrics['free_game_percentage']):.1f}%")  # 显示付费游戏占比指标
+        st.metric(t("Player Satisfaction"), f"{metrics['avg_rating']:.1f}% positive rating")  # 显示玩家满意度指标
     
     with col2:
-        st.metric("Release Peak", f"{metrics['peak_year']}")  # 显示发布高峰年份指标
-        st.metric("Multi-platform Trend", f"{metrics['multi_platform_games']:,} games")  # 显示多平台游戏数量指标
-        st.metric("Genre Diversity", f"{metrics['unique_genres']} genres")  # 显示类型多样性指标
+        st.metric(t("Release Peak"), f"{metrics['peak_year']}")  # 显示发布高峰年份指标
+        st.metric(t("Multi-platform Trend"), f"{metrics['multi_platform_games']:,} games")  # 显示多平台游戏数量指标
+        st.metric(t("Genre Diversity"), f"{metrics['unique_genres']} genres")  # 显示类型多样性指标
     
     # 市场趋势分析
-    st.subheader("📈 Market Trend Analysis")  # 市场趋势分析子标题
+    st.subheader(t("📈 Market Trend Analysis"))  # 市场趋势分析子标题
     
-    st.info(f"""
-    **Annual Release Trend**: Steam platform game releases show continuous growth, especially peaking in {metrics['peak_year']}, indicating the prosperity of the digital distribution market.
-    **Monthly Release Pattern**: Month {metrics['peak_month']} is the peak period for game releases, possibly related to holiday seasons and business strategies, with developers tending to release games before important sales seasons.
-    """)  # 使用信息框显示市场趋势分析，动态插入指标数据
+    st.info(t("""
+    **Annual Release Trend**: Steam platform game releases show continuous growth, especially peaking in {peak_year}, indicating the prosperity of the digital distribution market.
+    **Monthly Release Pattern**: Month {peak_month} is the peak period for game releases, possibly related to holiday seasons and business strategies, with developers tending to release games before important sales seasons.
+    """, peak_year=metrics['peak_year'], peak_month=metrics['peak_month']))  # 使用信息框显示市场趋势分析，动态插入指标数据
     
     # 定价策略洞察
-    st.subheader("💰 Pricing Strategy Insights")  # 定价策略洞察子标题
-    
-    st.success(f"""
-    **Price Sensitivity**: Games in the $20-30 price range perform best in both sales and positive ratings, indicating this is the most accepted price range by consumers.
-    **Free Game Effect**: Although free games account for {metrics['free_game_percentage']:.1f}% of the total, they have unique advantages in user acquisition and player engagement.
+    st.subheader(t("💰 Pricing Strategy Insights"))  # 定价策略洞察子标题
+    
+    if len(price_ranges) > 0:  # 有足够数据时根据数据得出最佳价格区间
+        best_sales_range = price_ranges.loc[price_ranges['avg_owners'].idxmax()]  # 平均销量最高的价格区间
+        best_rating_range = price_ranges.loc[price_ranges['avg_rating'].idxmax()]  # 平均好评率最高的价格区间
+        price_sensitivity = t("Games in the {sales_range} price range have the highest average sales ({owners:,.0f} owners), "
+                              "while the {rating_range} range has the highest average positive rating ({rating:.1%}).",
+                              sales_range=best_sales_range['price_range'], owners=best_sales_range['avg_owners'],
+                              rating_range=best_rating_range['price_range'], rating=best_rating_range['avg_rating'])
+    else:
+        price_sensitivity = t("Not enough games in the current selection to compare price ranges.")  # 数据不足时的提示
+    
+    st.success(t("""
+    **Price Sensitivity**: {price_sensitivity}
+    **Free Game Effect**: Although free games account for {free_percentage:.1f}% of the total, they have unique advantages in user acquisition and player engagement.
     **Value Perception**: High-priced games need to provide corresponding high-quality content to justify their value, otherwise they may face sales challenges.
-    """)  # 使用成功框显示定价策略洞察，动态插入免费游戏比例
+    """, price_sensitivity=price_sensitivity, free_percentage=metrics['free_game_percentage']))  # 使用成功框显示定价策略洞察，动态插入免费游戏比例
     
     # 平台战略建议
-    st.subheader("🔧 Platform Strategy Recommendations")  # 平台战略建议子标题
+    st.subheader(t("🔧 Platform Strategy Recommendations"))  # 平台战略建议子标题
     
-    st.warning("""
+    st.warning(t("""
     **Windows Dominance**: Windows platform supports nearly 100% of games and is the essential base platform for ensuring compatibility.
     **Cross-platform Opportunities**: Multi-platform games have obvious advantages in user coverage and business performance, supporting Mac and Linux can additionally cover about 30% of potential users.
     **Technical Investment**: Cross-platform development requires upfront technical investment but can significantly expand market coverage in the long term.
-    """)  # 使用警告框显示平台战略建议
+    """))  # 使用警告框显示平台战略建议
     
     # 类型市场机会
-    st.subheader("🎮 Genre Market Opportunities")  # 类型市场机会子标题
-    
-    st.write(f"""
-    **Mainstream Genres**: {', '.join(metrics['top_genres'][:3])} and other genres dominate in quantity, with intense competition but large user bases.
-    **Niche Opportunities**: Small niche genres may have blue ocean market opportunities, especially those with high ratings but low quantity.
-    **Innovation Space**: Genre fusion and innovation may bring new market growth points.
-    """)  # 显示类型市场机会分析，动态插入前3个热门类型
+    st.subheader(t("🎮 Genre Market Opportunities"))  # 类型市场机会子标题
+    
+    niches = '; '.join(t("{genre} at {price_range} on {platforms}", genre=row.main_genre, price_range=row.price_range, platforms=row.platforms)
+                       for row in opportunities.head(3).itertuples()) or t("not enough data in the current selection")  # 前3个蓝海细分市场
+    fusion_gaps = '; '.join(t("{tag_a} + {tag_b} games average {owners:.2f}× the typical owners but appear together only {lift:.2f}× as often as chance",
+                              tag_a=row.tag_a, tag_b=row.tag_b, owners=row.owners_vs_average, lift=row.lift)
+                            for row in underexplored.head(2).itertuples())  # 前2个少见但高销量的类型组合
+    st.write(t("""
+    **Mainstream Genres**: {genres} and other genres dominate in quantity, with intense competition but large user bases.
+    **Niche Opportunities**: {niches} combine high demand and satisfaction with low supply.
+    **Innovation Space**: Genre fusion and innovation may bring new market growth points{fusion_gaps}.
+    """, genres=', '.join(metrics['top_genres'][:3]), niches=niches, fusion_gaps=f": {fusion_gaps}" if fusion_gaps else ""))  # 显示类型市场机会分析，动态插入前3个热门类型、前3个蓝海细分市场和前2个少见但高销量的类型组合
+    
+    # 类型融合洞察
+    st.subheader(t("🧬 Genre Fusion Insights"))  # 类型融合洞察子标题
+    
+    if len(fusions) > 0:  # 有满足样本量要求的类型组合
+        fusion_columns = ['tag_a', 'tag_b', 'games', 'lift', 'avg_positive_ratio', 'avg_owners_median', 'owners_vs_average']  # 显示的列
+        col1, col2 = st.columns(2)  # 创建2列布局：常见组合和少见但高销量的组合
+        with col1:
+            st.write(t("**Established Fusions** (most over-represented pairs)"))  # 提升度最高的类型组合
+            st.dataframe(fusions[fusion_columns].head(5), use_container_width=True, hide_index=True)
+        with col2:
+            st.write(t("**Under-explored Fusions** (rarer than chance, highest owners)"))  # 少见但销量高的类型组合
+            st.dataframe(underexplored[fusion_columns].head(5), use_container_width=True, hide_index=True)
+    else:
+        st.info(t("No genre pair has at least {count} games in the current selection", count=MIN_CELL_GAMES))  # 数据不足提示
+    
+    # 蓝海市场机会排名
+    st.subheader(t("🌊 Blue-Ocean Opportunity Ranking"))  # 蓝海市场机会子标题
+    
+    if len(opportunities) > 0:  # 有满足样本量要求的细分市场
+        fig_opportunity = px.scatter(opportunities,  # 创建供给-需求散点图
+                                     x='game_count',  # X轴：供给（游戏数）
+                                     y='avg_owners',  # Y轴：需求（平均销量）
+                                     color='avg_rating',  # 根据满意度着色
+                                     size='opportunity_score',  # 点大小表示蓝海得分
+                                     hover_data=['main_genre', 'price_range', 'platforms'],  # 悬停显示细分市场信息
+                                     log_x=True, log_y=True,  # 对数坐标，便于比较不同量级
+                                     title=t('🌊 Market Cells: Supply vs Demand (color = satisfaction)'),  # 图表标题
+                                     labels={'game_count': t('Supply (Games)'), 'avg_owners': t('Demand (Average Owners)'), 'avg_rating': t('Positive Rating')},  # 轴标签重命名
+                                     color_continuous_scale='viridis')  # 使用viridis颜色方案
+        st.plotly_chart(fig_opportunity, use_container_width=True)  # 显示图表，自适应宽度
+        st.dataframe(opportunities.head(10), use_container_width=True)  # 显示前10个蓝海细分市场
+    else:
+        st.info(t("No genre × price × platform cell has at least {count} games in the current selection", count=MIN_CELL_GAMES))  # 数据不足提示
     
     # 开发者策略
-    st.subheader("🏢 Developer Strategy Recommendations")  # 开发者策略建议子标题
+    st.subheader(t("🏢 Developer Strategy Recommendations"))  # 开发者策略建议子标题
     
     col1, col2 = st.columns(2)  # 创建2列布局显示开发者策略
     
     with col1:
-        st.write("**Independent Developers**:")  # 独立开发者策略标题
-        st.write("""
+        st.write(t("**Independent Developers**:"))  # 独立开发者策略标题
+        st.write(t("""
         - Focus on niche genres and unique gameplay
         - Use free or low-price strategies to acquire initial users
         - Emphasize community building and player feedback
         - Consider multi-platform releases to expand influence
-        """)  # 独立开发者具体建议
+        """))  # 独立开发者具体建议
     
     with col2:
-        st.write("**Large Developers**:")  # 大型开发商策略标题
-        st.write("""
+        st.write(t("**Large Developers**:"))  # 大型开发商策略标题
+        st.write(t("""
         - Invest in high-quality, high-price point flagship products
         - Establish genre brands and serialized products
         - Deploy multi-platform and cross-platform experiences
         - Explore free + in-app purchase hybrid business models
-        """)  # 大型开发商具体建议
+        """))  # 大型开发商具体建议
     
     # 未来展望
-    st.subheader("🔮 Future Development Trends")  # 未来发展趋势子标题
+    st.subheader(t("🔮 Future Development Trends"))  # 未来发展趋势子标题
     
-    st.info("""
+    st.info(t("""
     **Technology Driven**: Cloud gaming, AI-generated content and other new technologies will reshape game development and distribution models.
     **Business Model Evolution**: Subscription models, games as a service and other new models will continue to develop and grow.
     **Globalization Opportunities**: Growth in emerging markets provides new growth momentum for game globalization.
     **Community Operations**: Player communities will become key factors in long-term game success.
-    """)  # 使用信息框显示未来发展趋势
+    """))  # 使用信息框显示未来发展趋势
     
     # 行动建议
-    st.subheader("🚀 Immediate Action Recommendations")  # 立即行动建议子标题
+    st.subheader(t("🚀 Immediate Action Recommendations"))  # 立即行动建议子标题
     
-    st.success(f"""
-    1. **Market Entry**: New developers are advised to enter with ${int(metrics['median_price'])}-$20 price range {metrics['top_genres'][0] if metrics['top_genres'] else "mainstream"} genres
+    entry_price = int(metrics['median_price']) if pd.notna(metrics['median_price']) else DEFAULT_ENTRY_PRICE  # 没有付费游戏时使用默认价格区间
+    st.success(t("""
+    1. **Market Entry**: New developers are advised to enter with ${entry_price}-$20 price range {genre} genres
     2. **Platform Strategy**: Ensure Windows compatibility, actively consider Mac/Linux support
     3. **Quality First**: Invest in game quality and player experience, positive ratings are key to long-term success
     4. **Data Driven**: Continuously monitor market data and player feedback, adjust strategies promptly
-    """)  # 使用成功框显示立即行动建议，动态插入价格和类型数据
+    """, entry_price=entry_price, genre=metrics['top_genres'][0] if metrics['top_genres'] else t("mainstream")))  # 使用成功框显示立即行动建议，动态插入价格和类型数据
     
     # 数据局限性说明
     st.markdown("---")  # 添加分隔线
-    st.subheader("📝 Analysis Limitations")  # 分析局限性说明子标题
+    st.subheader(t("📝 Analysis Limitations"))  # 分析局限性说明子标题
     
-    st.write("""
+    st.write(t("""
     - **Data Timeliness**: This analysis is based on historical data, market conditions may have changed
     - **Data Coverage**: The dataset may not include all Steam games, especially recently released works
     - **Estimated Data**: Sales data are range estimates and may have certain errors
     - **Causality**: Correlation analysis cannot directly prove causality, requires further verification
     - **Cultural Factors**: Analysis is mainly based on quantitative data, qualitative factors like culture and region are not considered
-    """)  # 显示分析局限性说明
\ No newline at end of file
+    """))  # 显示分析局限性说明
\ No newline at end of file
@@ -1,49 +1,77 @@
 import streamlit as st  # 导入streamlit用于创建网页应用界面
 import pandas as pd  # 导入pandas用于数据处理
 from utils.viz import create_data_quality_section  # 从utils.viz模块导入数据质量报告函数
+from utils.memory import memory_budget  # 从utils.memory模块导入共享内存预算
+from utils.explorer import show_data_explorer  # 从utils.explorer模块导入数据浏览器
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+from utils.io import dataset_details  # 从utils.io模块导入加载时的附带信息（日期隔离表）
 
-def show_tab1(df, metrics, visuals):
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
+def show_tab1(df, metrics, visuals, explorer_index):
     """
     显示标签页1：数据集概览
     对应原标签页1的内容
     """
-    st.header("📋 Dataset Overview")  # 模块标题
+    st.header(t("📋 Dataset Overview"))  # 模块标题
     
     col1, col2, col3, col4 = st.columns(4)  # 创建4个等宽列布局用于显示关键指标
     
     with col1:
-        st.metric("Total Games", f"{metrics['total_games']:,}")  # 显示游戏总数指标卡，使用千位分隔符格式化数字
+        st.metric(t("Total Games"), f"{metrics['total_games']:,}")  # 显示游戏总数指标卡，使用千位分隔符格式化数字
     
     with col2:
-        st.metric("Free Games Percentage", f"{metrics['free_game_percentage']:.1f}%")  # 显示免费游戏比例指标卡，保留1位小数
+        st.metric(t("Free Games Percentage"), f"{metrics['free_game_percentage']:.1f}%")  # 显示免费游戏比例指标卡，保留1位小数
     
     with col3:
-        st.metric("Average Positive Rating", f"{metrics['avg_rating']:.1f}%")  # 显示平均好评率指标卡，保留1位小数
+        st.metric(t("Average Positive Rating"), f"{metrics['avg_rating']:.1f}%")  # 显示平均好评率指标卡，保留1位小数
     
     with col4:
-        st.metric("Data Time Range", metrics['year_range'])  # 显示数据时间范围指标卡
+        st.metric(t("Data Time Range"), metrics['year_range'])  # 显示数据时间范围指标卡
     
-    st.subheader("📄 Data Sample Preview")  # 数据样本展示子标题
-    sample_data = df[['name', 'release_year', 'main_genre', 'price', 'positive_ratio', 'owners_median']].head(10)  # 选择要显示的列并取前10行数据
-    st.dataframe(sample_data, use_container_width=True)  # 显示数据表格，自适应容器宽度
+    show_data_explorer(df, explorer_index, visuals.key)  # 显示可排序、过滤和分页的完整数据浏览器（只发送当前页）
     
-    st.subheader("ℹ️ Dataset Basic Information")  # 数据集基本信息子标题
+    st.subheader(t("ℹ️ Dataset Basic Information"))  # 数据集基本信息子标题
     col1, col2 = st.columns(2)  # 创建2列布局
     
     with col1:
-        st.write(f"- **Total Records**: {metrics['total_games']:,}")  # 显示总记录数，使用千位分隔符
-        st.write(f"- **Number of Columns**: {len(df.columns)}")  # 显示数据列数
-        st.write(f"- **Number of Game Genres**: {metrics['unique_genres']}")  # 显示唯一游戏类型数量
+        st.write(t("- **Total Records**: {count:,}", count=metrics['total_games']))  # 显示总记录数，使用千位分隔符
+        st.write(t("- **Number of Columns**: {count}", count=len(df.columns)))  # 显示数据列数
+        st.write(t("- **Number of Game Genres**: {count}", count=metrics['unique_genres']))  # 显示唯一游戏类型数量
     
     with col2:
-        st.write(f"- **Windows Games**: {metrics['windows_games']:,}")  # 显示Windows平台游戏数
-        st.write(f"- **Mac Games**: {metrics['mac_games']:,}")  # 显示Mac平台游戏数
-        st.write(f"- **Linux Games**: {metrics['linux_games']:,}")  # 显示Linux平台游戏数
+        st.write(t("- **Windows Games**: {count:,}", count=metrics['windows_games']))  # 显示Windows平台游戏数
+        st.write(t("- **Mac Games**: {count:,}", count=metrics['mac_games']))  # 显示Mac平台游戏数
+        st.write(t("- **Linux Games**: {count:,}", count=metrics['linux_games']))  # 显示Linux平台游戏数
 
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
 def show_tab11(df, metrics, visuals):
     """
     显示标签页11：数据质量报告
     对应原标签页11的内容
     """
 
-    create_data_quality_section(df)  # 调用数据质量报告函数显示完整的数据质量分析
\ No newline at end of file
+    create_data_quality_section(df, dataset_details()['date_quarantine'])  # 调用数据质量报告函数显示完整的数据质量分析（包括加载时被隔离的行）
+    show_memory_diagnostics()  # 显示缓存内存使用情况
+
+def show_memory_diagnostics():
+    """
+    显示缓存内存诊断：总用量、预算上限以及各命名空间的条目数、字节数、命中率和淘汰次数
+    """
+    with st.container(key='memory_diagnostics'):  # 固定键：一致性检查据此跳过随共享缓存状态变化的数值
+        st.subheader(t("🧠 Cache Memory Diagnostics"))
+        stats = memory_budget.stats()  # 各命名空间的统计
+        col1, col2, col3 = st.columns(3)
+        col1.metric(t("Memory Used"), f"{memory_budget.usage / 1024 ** 2:,.1f} MB")  # 当前总用量
+        col2.metric(t("Memory Budget"), f"{memory_budget.capacity / 1024 ** 2:,.0f} MB")  # 预算上限
+        col3.metric(t("Evictions"), f"{int(stats['evictions'].sum()):,}")  # 累计淘汰次数
+        st.progress(min(memory_budget.usage / memory_budget.capacity, 1.0))  # 用量占预算的比例
+
+        table = stats.assign(
+            size_mb=stats['bytes'] / 1024 ** 2,  # 转为MB便于阅读
+            hit_rate=(stats['hit_rate'] * 100).round(1)  # 命中率百分比
+        )[['namespace', 'entries', 'size_mb', 'hits', 'misses', 'hit_rate', 'evictions', 'rejected']]
+        table.columns = ['Cache', 'Entries', 'Size (MB)', 'Hits', 'Misses', 'Hit Rate (%)', 'Evictions', 'Too Large']
+        st.dataframe(table.round({'Size (MB)': 2}), use_container_width=True, hide_index=True)
+        st.caption(t("Datasets and indexes are counted but never evicted; filtered views, figures and API responses are evicted "
+                     "least-recently-used first, keeping results that are expensive to recompute per byte for longer. "
+                     "Set STEAM_MEMORY_BUDGET_MB to change the budget."))
\ No newline at end of file
@@ -1,31 +1,60 @@
 import streamlit as st  # 导入streamlit用于创建网页应用界面
 import pandas as pd  # 导入pandas用于数据处理
 import plotly.express as px  # 导入plotly.express用于创建交互式图表
-from utils.viz import create_small_multiples  # 从utils.viz模块导入小倍数图函数
+from utils.viz import create_small_multiples, small_multiples_points, create_group_comparison_chart, create_platform_combination_chart, create_revenue_chart  # 从utils.viz模块导入小倍数图、分组对比图、平台组合图和收入估计图函数
+from utils.opportunity import summarize_platform_combinations  # 从utils.opportunity模块导入平台组合统计函数
+from utils.progressive import show_progressive_chart  # 从utils.progressive模块导入渐进式渲染函数
+from utils.stats import compare_groups, describe_effect, COMPARISON_METRICS, METRIC_NAMES  # 从utils.stats模块导入显著性检验函数
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+from utils.linked import show_linked_chart  # 从utils.linked模块导入联动图表显示函数
+from utils.ratings import group_ratings, RATING_BASES  # 从utils.ratings模块导入按评价数加权的分组评分函数
+from utils.revenue import view_revenue, revenue_by, price_share_input  # 从utils.revenue模块导入收入区间估计函数
 
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
 def show_tab6(df, metrics, visuals):
     """
     显示标签页6：游戏类型分析
     对应原标签页6的内容
     """
-    st.header("🎮 Game Genre Market Analysis")  # 模块标题
-    st.plotly_chart(visuals['genre_distribution'], use_container_width=True)  # 显示类型分布图，自适应宽度
-    st.write("""  # 市场洞察分析
+    st.header(t("🎮 Game Genre Market Analysis"))  # 模块标题
+    show_linked_chart(visuals['genre_distribution'], 'genre_distribution')  # 显示可联动的类型分布图（选择后筛选其他图表）
+    
+    st.subheader(t("⭐ Genre Ratings"))  # 类型评分子标题
+    genre_ratings = group_ratings(df, 'main_genre').head(15)  # 游戏数最多的15个类型的评分（简单平均、按评价数加权、贝叶斯收缩）
+    st.dataframe(genre_ratings, use_container_width=True, hide_index=True)
+    st.caption(t("weighted_ratio pools all reviews in the genre, so a game with 3 reviews counts far less than one with 300k; mean_ratio weights every game equally."))  # 说明加权口径
+    st.write(t("""  # 市场洞察分析
     **Market Insights:**
     - Action and Adventure genres dominate the market in terms of quantity
     - Different genres show significant differences in pricing strategies and player acceptance
     - Niche genres may perform exceptionally well in specific market segments
-    """)
+    """))
 
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
 def show_tab7(df, metrics, visuals):
     """
     显示标签页7：开发商分析
     对应原标签页7的内容
     """
-    st.header("🏢 Game Developer & Publisher Analysis")  # 模块标题
+    st.header(t("🏢 Game Developer & Publisher Analysis"))  # 模块标题
     st.plotly_chart(visuals['publisher_analysis'], use_container_width=True)  # 显示发行商分析图，自适应宽度
     
-    st.subheader("⭐ Valve Special Analysis")  # Valve专门分析子标题
+    st.subheader(t("⭐ Top-rated Publishers"))  # 高分发行商子标题
+    col1, col2 = st.columns(2)
+    bases = {t(name): column for name, column in RATING_BASES.items()}  # 显示名称 -> 评分列
+    basis = bases[col1.radio(t("Rating basis"), list(bases), horizontal=True, key='publisher_rating_basis')]  # 评分口径
+    min_games = col2.number_input(t("Minimum games"), min_value=1, value=5, step=1, key='publisher_min_games')  # 最少游戏数
+    publisher_ratings = group_ratings(df, 'publisher')  # 每个发行商的评分
+    publisher_ratings = publisher_ratings[publisher_ratings['game_count'] >= min_games]  # 排除游戏数过少的发行商
+    st.dataframe(publisher_ratings.sort_values(basis, ascending=False).head(15), use_container_width=True, hide_index=True)  # 按所选口径取前15个
+    
+    st.subheader(t("💵 Publisher Revenue Estimates"))  # 发行商收入估计子标题
+    price_share = price_share_input('publisher_price_share')  # 实际到手价格比例
+    publisher_revenue = revenue_by(df, view_revenue(df, visuals.key, price_share), 'Publisher')  # 每个发行商的收入区间（按收入中值降序）
+    st.plotly_chart(create_revenue_chart(publisher_revenue, 'Publisher'), use_container_width=True)  # 显示收入最高的发行商
+    st.dataframe(publisher_revenue.head(50), use_container_width=True, hide_index=True)  # 前50个发行商的收入区间
+    
+    st.subheader(t("⭐ Valve Special Analysis"))  # Valve专门分析子标题
     
     valve_games = df[df['publisher'] == 'Valve']  # 筛选Valve发行的游戏
     non_valve_games = df[df['publisher'] != 'Valve']  # 筛选非Valve发行的游戏
@@ -34,32 +63,33 @@ def show_tab7(df, metrics, visuals):
         col1, col2, col3 = st.columns(3)  # 创建3列布局显示Valve分析指标
         
         with col1:
-            st.metric("Valve Games Count", len(valve_games))  # 显示Valve游戏数量指标
+            st.metric(t("Valve Games Count"), len(valve_games))  # 显示Valve游戏数量指标
         
         with col2:
             valve_rating = valve_games['positive_ratio'].mean() * 100  # 计算Valve游戏平均好评率
-            st.metric("Valve Average Positive Rating", f"{valve_rating:.1f}%")  # 显示Valve平均好评率指标，保留1位小数
+            st.metric(t("Valve Average Positive Rating"), f"{valve_rating:.1f}%")  # 显示Valve平均好评率指标，保留1位小数
         
         with col3:
             valve_sales = valve_games['owners_median'].mean()  # 计算Valve游戏平均销量
-            st.metric("Valve Average Sales", f"{valve_sales:,.0f}")  # 显示Valve平均销量指标，使用千位分隔符
+            st.metric(t("Valve Average Sales"), f"{valve_sales:,.0f}")  # 显示Valve平均销量指标，使用千位分隔符
         
-        st.write("""  # Valve表现分析结论
+        st.write(t("""  # Valve表现分析结论
         **Valve Performance Analysis:**
         - As the platform owner, Valve excels in both game quality and quantity
         - Valve games typically have high production standards and player recognition
         - Platform ecosystem and first-party games form a virtuous cycle
-        """)
+        """))
 
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
 def show_tab8(df, metrics, visuals):
     """
     显示标签页8：平台支持分析
     对应原标签页8的内容
     """
-    st.header("💻 Cross-platform Support Analysis")  # 模块标题
+    st.header(t("💻 Cross-platform Support Analysis"))  # 模块标题
     st.plotly_chart(visuals['platform_support'], use_container_width=True)  # 显示平台支持饼图，自适应宽度
     
-    st.subheader("🔧 Multi-platform Support Value Analysis")  # 多平台支持价值分析子标题
+    st.subheader(t("🔧 Multi-platform Support Value Analysis"))  # 多平台支持价值分析子标题
     
     platform_comparison = df.groupby('multi_platform').agg({  # 按多平台支持分组统计
         'positive_ratio': 'mean',  # 平均好评率
@@ -67,33 +97,53 @@ def show_tab8(df, metrics, visuals):
         'average_playtime': 'mean',  # 平均游戏时长
         'name': 'count'  # 游戏数量
     }).reset_index()  # 重置索引
-    platform_comparison['Platform Type'] = platform_comparison['multi_platform'].map({True: 'Multi-platform Games', False: 'Single-platform Games'})  # 映射平台类型名称
+    platform_comparison['Platform Type'] = platform_comparison['multi_platform'].map({True: t('Multi-platform Games'), False: t('Single-platform Games')})  # 映射平台类型名称
     
     for _, row in platform_comparison.iterrows():  # 遍历平台对比数据
         st.write(f"**{row['Platform Type']}**")  # 显示平台类型标题
-        st.write(f"- Game Count: {row['name']:,} games ({row['name']/len(df)*100:.1f}%)")  # 显示游戏数量及占比，使用千位分隔符
-        st.write(f"- Average Positive Rating: {row['positive_ratio']:.2%}")  # 显示平均好评率，百分比格式
-        st.write(f"- Average Sales: {row['owners_median']:,.0f}")  # 显示平均销量，使用千位分隔符
-        st.write(f"- Average Playtime: {row['average_playtime']:.0f} minutes")  # 显示平均游戏时长
+        st.write(t("- Game Count: {count:,} games ({share:.1f}%)", count=row['name'], share=row['name']/len(df)*100))  # 显示游戏数量及占比，使用千位分隔符
+        st.write(t("- Average Positive Rating: {rating:.2%}", rating=row['positive_ratio']))  # 显示平均好评率，百分比格式
+        st.write(t("- Average Sales: {owners:,.0f}", owners=row['owners_median']))  # 显示平均销量，使用千位分隔符
+        st.write(t("- Average Playtime: {minutes:.0f} minutes", minutes=row['average_playtime']))  # 显示平均游戏时长
         st.write("")  # 空行分隔，提高可读性
     
-    st.write("""  # 平台策略建议
+    # 平台组合分析 - 按位掩码一次bincount统计所有组合
+    st.subheader(t("🧩 Platform Combinations"))  # 平台组合分析子标题
+    combos = summarize_platform_combinations(df)  # 各平台组合的统计
+    st.plotly_chart(create_platform_combination_chart(combos), use_container_width=True)  # 显示平台组合对比图，自适应宽度
+    st.dataframe(combos.rename(columns={  # 显示平台组合统计表格
+        'platforms': 'Platforms', 'game_count': 'Games', 'share': 'Share', 'avg_owners': 'Avg Sales',
+        'avg_rating': 'Avg Positive Rating', 'avg_playtime': 'Avg Playtime (min)'}), use_container_width=True)
+    
+    # 显著性检验 - 自助法置信区间和效应量
+    st.subheader(t("📐 Statistical Significance"))  # 显著性检验子标题
+    platform_stats, platform_effects = compare_groups(df, 'multi_platform', COMPARISON_METRICS)  # 多平台 vs 单平台的自助法对比
+    st.plotly_chart(create_group_comparison_chart(platform_stats,  # 带95%置信区间误差线的对比图
+                                                  {True: t('Multi-platform'), False: t('Single-platform')},
+                                                  t('📐 Multi-platform vs Single-platform (95% bootstrap CI)')),
+                    use_container_width=True)  # 显示图表，自适应宽度
+    platform_findings = [describe_effect(effect, 'multi-platform games', 'single-platform games', METRIC_NAMES[effect['metric']])  # 每个指标的检验结论
+                         for _, effect in platform_effects.iterrows()]
+    platform_findings_text = "\n".join(f"- {finding}" for finding in platform_findings) or t("- Not enough data to compare multi-platform and single-platform games")  # 检验结论列表
+    
+    st.write(t("""  # 平台策略建议
     **Platform Strategy Recommendations:**
-    - Multi-platform games generally perform better in both sales and ratings
+    {findings}
     - Windows is the essential base platform that must be supported
     - Supporting Mac and Linux can reach a wider player base
     - Cross-platform development requires consideration of technical costs and target users
-    """)
+    """, findings=platform_findings_text))
 
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
 def show_tab9(df, metrics, visuals):
     """
     显示标签页9：免费付费分析
     对应原标签页9的内容
     """
-    st.header("🆓 Free vs Paid Games Business Model Analysis")  # 模块标题
+    st.header(t("🆓 Free vs Paid Games Business Model Analysis"))  # 模块标题
     st.plotly_chart(visuals['free_vs_paid'], use_container_width=True)  # 显示免费付费对比图，自适应宽度
     
-    st.subheader("💼 Business Model Deep Analysis")  # 商业模式深度分析子标题
+    st.subheader(t("💼 Business Model Deep Analysis"))  # 商业模式深度分析子标题
     
     free_paid_stats = df.groupby('is_free').agg({  # 按是否免费分组统计
         'name': 'count',  # 游戏数量
@@ -102,47 +152,62 @@ def show_tab9(df, metrics, visuals):
         'owners_median': 'mean',  # 平均销量
         'achievements': 'mean'  # 平均成就数量
     }).reset_index()  # 重置索引
-    free_paid_stats['Type'] = free_paid_stats['is_free'].map({True: 'Free Games', False: 'Paid Games'})  # 映射类型名称
+    free_paid_stats['Type'] = free_paid_stats['is_free'].map({True: t('Free Games'), False: t('Paid Games')})  # 映射类型名称
     
     for _, row in free_paid_stats.iterrows():  # 遍历免费和付费游戏统计数据
         st.write(f"### {row['Type']}")  # 使用三级标题显示游戏类型
         col1, col2, col3, col4 = st.columns(4)  # 创建4列布局显示详细指标
         
         with col1:
-            st.metric("Game Count", f"{row['name']:,}")  # 显示游戏数量，使用千位分隔符
+            st.metric(t("Game Count"), f"{row['name']:,}")  # 显示游戏数量，使用千位分隔符
         
         with col2:
-            st.metric("Average Positive Rating", f"{row['positive_ratio']:.2%}")  # 显示平均好评率，百分比格式
+            st.metric(t("Average Positive Rating"), f"{row['positive_ratio']:.2%}")  # 显示平均好评率，百分比格式
         
         with col3:
-            st.metric("Average Playtime", f"{row['average_playtime']:.0f}")  # 显示平均游戏时长
+            st.metric(t("Average Playtime"), f"{row['average_playtime']:.0f}")  # 显示平均游戏时长
         
         with col4:
-            st.metric("Average Sales", f"{row['owners_median']:,.0f}")  # 显示平均销量，使用千位分隔符
+            st.metric(t("Average Sales"), f"{row['owners_median']:,.0f}")  # 显示平均销量，使用千位分隔符
+    
+    # 显著性检验 - 图表中的误差线即为这里的置信区间
+    st.subheader(t("📐 Statistical Significance"))  # 显著性检验子标题
+    _, free_paid_effects = compare_groups(df, 'is_free', COMPARISON_METRICS)  # 免费 vs 付费的自助法对比（与图表共用缓存）
+    if len(free_paid_effects) > 0:  # 两组都有数据时显示检验结果
+        effects_table = free_paid_effects.assign(metric=free_paid_effects['metric'].map(METRIC_NAMES))  # 使用展示名称
+        st.dataframe(effects_table.rename(columns={'metric': 'Metric', 'difference': 'Free - Paid',  # 列名重命名
+                                                   'ci_low': '95% CI Low', 'ci_high': '95% CI High',
+                                                   'cohens_d': "Cohen's d", 'significant': 'Significant'}),
+                     use_container_width=True)
+        for _, effect in free_paid_effects.iterrows():  # 每个指标一句结论
+            st.write(f"- {describe_effect(effect, 'free games', 'paid games', METRIC_NAMES[effect['metric']])}")
+    else:
+        st.info(t("Both free and paid games are needed in the current selection to test the difference"))  # 数据不足提示
     
-    st.write("""  # 商业模式选择建议
+    st.write(t("""  # 商业模式选择建议
     **Business Model Selection Recommendations:**
     - **Free Games**: Suitable for products pursuing user scale and network effects
     - **Paid Games**: Suitable for products focusing on core experience and single sales
     - **Hybrid Model**: Free base version + paid content hybrid model is increasingly popular
     - **Subscription Model**: Suitable for service-type games providing continuous content updates
-    """)
+    """))
 
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
 def show_tab10(df, metrics, visuals):
     """
     显示标签页10：小倍数分析
     对应原标签页10的内容
     """
-    st.header("📊 Multi-dimensional Comparative Analysis")  # 模块标题
-    small_multiples_fig = create_small_multiples(df)  # 生成小倍数图
-    st.plotly_chart(small_multiples_fig, use_container_width=True)  # 显示小倍数图，自适应宽度
+    st.header(t("📊 Multi-dimensional Comparative Analysis"))  # 模块标题
+    show_progressive_chart(small_multiples_points(df), 'small_multiples', 'price', 'positive_ratio',  # 渐进式显示小倍数图（各分面共用查看范围）
+                           create_small_multiples, group_col='main_genre', view_key=visuals.key)
     
-    st.subheader("🔍 Analysis Guide")  # 分析说明子标题
-    st.write("""  # 小倍数图解读指南
+    st.subheader(t("🔍 Analysis Guide"))  # 分析说明子标题
+    st.write(t("""  # 小倍数图解读指南
     **Small Multiples Interpretation Guide:**
     - Each subplot represents the relationship between price and positive rating for a game genre
     - Point positions show the pricing strategy and market acceptance of that genre
     - Colors distinguish different game genres for easy comparison
     - Top-right genres indicate high-price, high-rating premium games
     - Bottom-left genres may represent low-price, low-rating entry-level games
-    """)
\ No newline at end of file
+    """))
\ No newline at end of file
@@ -0,0 +1,69 @@
+import streamlit as st  # 导入streamlit用于创建网页应用界面
+import pandas as pd  # 导入pandas用于数据处理
+import plotly.express as px  # 导入plotly.express用于创建交互式图表
+from utils.search import search_games  # 从utils.search模块导入游戏搜索函数
+from utils.similarity import find_similar_games, batch_similar_games  # 从utils.similarity模块导入相似游戏查询函数
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+
+
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
+def show_tab13(df, metrics, visuals, similarity_index, search_index):
+    """
+    显示标签页13：相似游戏推荐
+    基于类型、分类、标签、价格和评价的最近邻查询，推荐范围受侧边栏过滤条件限制
+    """
+    st.header(t("🔗 Similar Games Finder"))  # 模块标题
+
+    if len(df) < 2:  # 过滤后数据不足时无法推荐
+        st.warning(t("Not enough games in the current selection to find similar games"))
+        return
+
+    query = st.text_input(t("Find a game"), placeholder=t("Type a game name, developer or publisher"), key="similar_query")  # 游戏搜索框
+    if query.strip():  # 有搜索词时使用搜索索引
+        candidates = search_games(search_index, query, limit=200)  # 通过索引查询候选游戏
+        candidates = candidates[pd.Index(candidates).isin(df.index)][:50]  # 只保留当前过滤结果中的游戏
+    else:
+        candidates = df['owners_median'].nlargest(50).index.to_numpy()  # 未搜索时默认列出最畅销的游戏
+
+    if len(candidates) == 0:  # 没有匹配的游戏
+        st.info(t("No games match your search in the current selection"))
+        return
+
+    col1, col2 = st.columns([3, 1])  # 创建2列布局：游戏选择和推荐数量
+
+    with col1:
+        selected = st.selectbox(t("Select a game"), candidates, format_func=lambda label: df.at[label, 'name'])  # 游戏选择框，显示游戏名称
+
+    with col2:
+        k = st.slider(t("Number of similar games"), 5, 30, 10)  # 推荐数量滑块
+
+    similar = find_similar_games(similarity_index, selected, k=k, candidate_labels=df.index)  # 在当前过滤结果中查找相似游戏
+    similar_games = df.loc[similar['label'], ['name', 'main_genre', 'price', 'positive_ratio', 'owners_median', 'steamspy_tags']].copy()  # 获取相似游戏的详细信息
+    similar_games['similarity'] = similar['similarity'].to_numpy()  # 添加相似度列
+
+    st.subheader(t("🎯 Games similar to {name}", name=df.at[selected, 'name']))  # 推荐结果子标题
+    st.caption(t("Genres: {genres} | Tags: {tags} | Price: ${price:.2f}",
+                 genres=df.at[selected, 'genres'], tags=df.at[selected, 'steamspy_tags'], price=df.at[selected, 'price']))  # 显示所选游戏的特征
+
+    fig = px.bar(similar_games.iloc[::-1],  # 创建相似度水平条形图（最相似的在顶部）
+                 x='similarity',  # X轴：相似度
+                 y='name',  # Y轴：游戏名称
+                 orientation='h',  # 水平方向条形图
+                 title=t('🔗 Similarity Score'),  # 图表标题
+                 labels={'similarity': t('Cosine Similarity'), 'name': t('Game')},  # 轴标签重命名
+                 color='similarity',  # 根据相似度着色
+                 color_continuous_scale='viridis')  # 使用viridis颜色方案
+    st.plotly_chart(fig, use_container_width=True)  # 显示图表，自适应宽度
+    st.dataframe(similar_games, use_container_width=True)  # 显示相似游戏详细表格
+
+    st.subheader(t("📦 Batch Similar-Games Lists"))  # 批量计算子标题
+    st.write(t("Compute the top similar games for every title in the full catalogue and download them as CSV."))  # 功能说明
+    if st.button(t("Compute similar-games lists for all titles")):  # 批量计算开销较大，由按钮触发
+        with st.spinner(t("Computing similar games for every title...")):
+            batch = batch_similar_games(similarity_index, k=k)  # 批量计算全部游戏的相似列表
+        st.download_button(
+            t("Download CSV"),  # 下载按钮文本
+            batch.to_csv(index=False).encode('utf-8'),  # CSV内容
+            file_name="similar_games.csv",  # 下载文件名
+            mime="text/csv"
+        )
@@ -0,0 +1,40 @@
+import streamlit as st  # 导入streamlit用于创建网页应用界面
+from utils.cooccurrence import view_cooccurrence, pair_table, heatmap_frame, COOCCURRENCE_FIELDS, COOCCURRENCE_METRICS, MIN_PAIR_GAMES  # 从utils.cooccurrence模块导入共现统计函数
+from utils.viz import create_cooccurrence_heatmap  # 从utils.viz模块导入共现热力图函数
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+
+
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
+def show_tab15(df, metrics, visuals, cooccurrence_index):
+    """
+    显示标签页15：类型与标签共现分析
+    共现矩阵由当前过滤结果对关联矩阵按行切片后一次稀疏乘积得到
+    """
+    st.header(t("🧩 Genre & Tag Co-occurrence"))  # 模块标题
+
+    if len(df) == 0:  # 过滤后没有数据
+        st.warning(t("No games in the current selection"))
+        return
+
+    col1, col2, col3, col4 = st.columns(4)  # 创建4列布局：字段、指标、标签数和最少游戏数
+    fields = {t(name): column for name, column in COOCCURRENCE_FIELDS.items()}  # 显示名称 -> 列名
+    metrics_by_name = {t(name): key for name, key in COOCCURRENCE_METRICS.items()}  # 显示名称 -> 结果键
+    field = fields[col1.radio(t("Field"), list(fields), horizontal=True, key='cooccurrence_field')]  # 类型或标签
+    metric = metrics_by_name[col2.radio(t("Metric"), list(metrics_by_name), index=1, horizontal=True, key='cooccurrence_metric')]  # 热力图指标
+    top_n = col3.slider(t("Tags in heatmap"), 5, 40, 20, key='cooccurrence_top_n')  # 热力图中的标签数
+    min_games = col4.number_input(t("Minimum games per pair"), min_value=1, value=MIN_PAIR_GAMES, step=1, key='cooccurrence_min_games')  # 标签对最少游戏数
+
+    result = view_cooccurrence(cooccurrence_index, df, field, visuals.key)  # 当前选择的共现结果（按视图缓存）
+    st.plotly_chart(create_cooccurrence_heatmap(heatmap_frame(result, metric, top_n), metric), use_container_width=True)  # 显示共现热力图，自适应宽度
+    st.caption(t("Lift above 1 (PMI above 0) means two tags appear together more often than if they were independent; below 1, less often."))  # 说明提升度和PMI的含义
+
+    pairs = pair_table(result, int(min_games))  # 所有标签对（按提升度降序）
+    col1, col2 = st.columns(2)  # 创建2列布局显示最常一起出现和最少一起出现的标签对
+    with col1:
+        st.subheader(t("🤝 Strongest Pairs"))  # 提升度最高的标签对
+        st.dataframe(pairs.head(15), use_container_width=True, hide_index=True)
+    with col2:
+        st.subheader(t("↔️ Weakest Pairs"))  # 提升度最低的标签对
+        st.dataframe(pairs.tail(15).iloc[::-1], use_container_width=True, hide_index=True)
+    st.caption(t("{pairs:,} pairs with at least {min_games} games, out of {games:,} games in the current selection",
+                 pairs=len(pairs), min_games=int(min_games), games=result['n_games']))
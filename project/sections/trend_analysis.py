@@ -1,141 +1,229 @@
 import streamlit as st  # 导入streamlit用于创建网页应用界面
 import pandas as pd  # 导入pandas用于数据处理
 import plotly.express as px  # 导入plotly.express用于创建交互式图表
+import plotly.graph_objects as go  # 导入plotly.graph_objects用于创建自定义图表
+from utils.trends import compute_release_trends, trends_to_frame, FORECAST_HORIZON  # 从utils.trends模块导入趋势分析与预测函数
+from utils.viz import price_sales_points, engagement_points, create_price_sales_chart, create_rating_playtime_chart, create_revenue_chart  # 从utils.viz模块导入渐进式散点图的数据和图表函数、收入估计图函数
+from utils.progressive import show_progressive_chart  # 从utils.progressive模块导入渐进式渲染函数
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+from utils.linked import show_linked_chart  # 从utils.linked模块导入联动图表显示函数
+from utils.buckets import edges_input, cached_buckets, bucket_stats  # 从utils.buckets模块导入可配置的向量化分桶函数
+from utils.ratings import show_rating_leaderboard  # 从utils.ratings模块导入高分排行榜显示函数
+from utils.revenue import view_revenue, revenue_by, revenue_totals, price_share_input  # 从utils.revenue模块导入收入区间估计函数
+from utils.io import dataset_details  # 从utils.io模块导入加载时的附带信息（评分先验）
 
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
 def show_tab2(df, metrics, visuals):
     """
     显示标签页2：时间趋势分析
     对应原标签页2的内容
     """
-    st.header("📈 Game Release Trend Analysis")  # 模块标题
-    st.plotly_chart(visuals['time_trend'], use_container_width=True)  # 显示年度趋势图表，自适应宽度
-    st.subheader("📝 Analysis Conclusions")  # 分析结论子标题
-    st.info(f"🎯 **Peak Release Year**: {metrics['peak_year']}, released {metrics['peak_year_count']} games")  # 使用信息框显示发布高峰年份
-    st.success(f"🚀 **Popular Game Genres**: {', '.join(metrics['top_genres'])}")  # 使用成功框显示热门游戏类型
+    st.header(t("📈 Game Release Trend Analysis"))  # 模块标题
+    show_linked_chart(visuals['time_trend'], 'time_trend')  # 显示可联动的年度趋势图表（选择后筛选其他图表）
+    st.subheader(t("📝 Analysis Conclusions"))  # 分析结论子标题
+    st.info(t("🎯 **Peak Release Year**: {year}, released {count} games", year=metrics['peak_year'], count=metrics['peak_year_count']))  # 使用信息框显示发布高峰年份
+    st.success(t("🚀 **Popular Game Genres**: {genres}", genres=', '.join(metrics['top_genres'])))  # 使用成功框显示热门游戏类型
+    
+    # 月度时间序列、趋势与预测
+    st.subheader(t("📉 Monthly Release Trend & Forecast"))  # 月度趋势与预测子标题
+    overall = compute_release_trends(df)  # 计算整体月度序列的滚动平均、季节分解和预测
+    if overall['counts'].shape[1] == 0:  # 没有有效日期数据
+        st.info(t("No dated releases in the current selection"))
+        return
+    
+    trend_df = trends_to_frame(overall)  # 整理为绘图用的长表
+    fig_trend = go.Figure()  # 创建自定义折线图
+    fig_trend.add_trace(go.Scatter(x=trend_df['period'], y=trend_df['Forecast Upper'], line=dict(width=0), showlegend=False, hoverinfo='skip'))  # 预测区间上界（不可见线）
+    fig_trend.add_trace(go.Scatter(x=trend_df['period'], y=trend_df['Forecast Lower'], line=dict(width=0), fill='tonexty', fillcolor='rgba(255,127,14,0.2)', name=t('95% Interval')))  # 预测区间下界并填充
+    for series, color in [('Monthly Releases', 'lightgray'), ('12-Month Rolling Mean', 'royalblue'), ('Trend', 'green'), ('Forecast', 'darkorange')]:  # 依次添加各条序列
+        fig_trend.add_trace(go.Scatter(x=trend_df['period'], y=trend_df[series], name=t(series), line=dict(color=color)))
+    fig_trend.update_layout(title=t('📉 Monthly Releases with Rolling Mean, Trend and Forecast'),  # 图表标题
+                            xaxis_title=t('Release Month'), yaxis_title=t('Number of Games'), height=450)  # 轴标题和高度
+    st.plotly_chart(fig_trend, use_container_width=True)  # 显示图表，自适应宽度
+    
+    # 分类型预测（所有类型一次向量化计算）
+    st.subheader(t("🔮 Genre Release Forecast (next {count} months)", count=FORECAST_HORIZON))  # 类型预测子标题
+    genre_trends = compute_release_trends(df, 'main_genre')  # 所有类型同时计算
+    recent = genre_trends['counts'][:, -12:].sum(axis=1)  # 最近12个月发布数量
+    upcoming = genre_trends['forecast'].sum(axis=1)  # 预测期发布数量
+    forecast_table = pd.DataFrame({
+        'Genre': genre_trends['groups'],  # 类型名称
+        'Releases (Last 12 Months)': recent.astype(int),  # 最近12个月发布数量
+        'Monthly Average (Last 12 Months)': recent / 12,  # 最近12个月月均发布数量
+        f'Forecast Monthly Average (Next {FORECAST_HORIZON} Months)': upcoming / FORECAST_HORIZON  # 预测期月均发布数量
+    }).sort_values('Releases (Last 12 Months)', ascending=False)  # 按近期发布数量排序
+    
+    selected = st.multiselect(t("Genres to plot"), forecast_table['Genre'].tolist(), default=forecast_table['Genre'].head(3).tolist())  # 选择要绘制预测的类型
+    if selected:  # 用户选择了类型
+        group_positions = {name: i for i, name in enumerate(genre_trends['groups'])}  # 类型名称到矩阵行的映射
+        genre_frames = [trends_to_frame(genre_trends, group_positions[name]).assign(Genre=name) for name in selected]  # 每个所选类型的序列
+        genre_df = pd.concat(genre_frames, ignore_index=True)
+        genre_df['Releases'] = genre_df['12-Month Rolling Mean'].fillna(genre_df['Forecast'])  # 历史部分用滚动平均，预测部分用预测值
+        fig_genre = px.line(genre_df, x='period', y='Releases', color='Genre',  # 创建分类型折线图
+                            title=t('🔮 Genre Rolling Mean and Forecast'),  # 图表标题
+                            labels={'period': t('Release Month'), 'Releases': t('Games per Month')})  # 轴标签重命名
+        st.plotly_chart(fig_genre, use_container_width=True)  # 显示图表，自适应宽度
+    st.dataframe(forecast_table, use_container_width=True)  # 显示所有类型的预测表格
 
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
 def show_tab3(df, metrics, visuals):
     """
     显示标签页3：月度发布分析
     对应原标签页3的内容
     """
-    st.header("📅 Monthly Game Release Trend Analysis")  # 模块标题
+    st.header(t("📅 Monthly Game Release Trend Analysis"))  # 模块标题
     st.plotly_chart(visuals['monthly_analysis'], use_container_width=True)  # 显示月度分析柱状图，自适应宽度
-    st.subheader("📊 Monthly Release Statistics")  # 月度发布统计子标题
+    st.subheader(t("📊 Monthly Release Statistics"))  # 月度发布统计子标题
     
     col1, col2, col3 = st.columns(3)  # 创建3列布局显示月度统计数据
     
     with col1:
         peak_month_num, peak_month_count = visuals['peak_month_info']  # 获取高峰月份信息
-        st.metric("Peak Release Month", f"Month {peak_month_num}")  # 显示发布高峰月份
-        st.metric("Peak Month Release Count", f"{peak_month_count} games")  # 显示高峰月游戏数量
+        st.metric(t("Peak Release Month"), f"Month {peak_month_num}")  # 显示发布高峰月份
+        st.metric(t("Peak Month Release Count"), f"{peak_month_count} games")  # 显示高峰月游戏数量
     
     with col2:
-        st.metric("Lowest Release Month", f"Month {metrics['slow_month']}")  # 显示发布低谷月份
-        st.metric("Lowest Month Release Count", f"{metrics['slow_month_count']} games")  # 显示低谷月游戏数量
+        st.metric(t("Lowest Release Month"), f"Month {metrics['slow_month']}")  # 显示发布低谷月份
+        st.metric(t("Lowest Month Release Count"), f"{metrics['slow_month_count']} games")  # 显示低谷月游戏数量
     
     with col3:
         monthly_variation = metrics['peak_month_count'] - metrics['slow_month_count']  # 计算高低峰差异
-        st.metric("Maximum Monthly Difference", f"{monthly_variation} games")  # 显示月度发布差异
+        st.metric(t("Maximum Monthly Difference"), f"{monthly_variation} games")  # 显示月度发布差异
         avg_monthly = len(df) // 12  # 计算月平均发布数量
-        st.metric("Average Monthly Release", f"{avg_monthly} games")  # 显示月平均发布量
-    
-    st.subheader("🔍 Monthly Release Pattern Analysis")  # 月度发布规律分析子标题
-    st.info(f"🎯 **Annual Release Peak**: Month {metrics['peak_month']} is the most concentrated month for game releases, with {metrics['peak_month_count']} games released")  # 使用信息框突出显示年度发布高峰
-    st.warning(f"📉 **Annual Release Low**: Month {metrics['slow_month']} is the month with the fewest game releases, with only {metrics['slow_month_count']} games released")  # 使用警告框突出显示年度发布低谷
+        st.metric(t("Average Monthly Release"), f"{avg_monthly} games")  # 显示月平均发布量
+    
+    st.subheader(t("🔍 Monthly Release Pattern Analysis"))  # 月度发布规律分析子标题
+    st.info(t("🎯 **Annual Release Peak**: Month {month} is the most concentrated month for game releases, with {count} games released",
+              month=metrics['peak_month'], count=metrics['peak_month_count']))  # 使用信息框突出显示年度发布高峰
+    st.warning(t("📉 **Annual Release Low**: Month {month} is the month with the fewest game releases, with only {count} games released",
+                 month=metrics['slow_month'], count=metrics['slow_month_count']))  # 使用警告框突出显示年度发布低谷
+    
+    # 季节分解得到的季节指数（已去除长期增长趋势）
+    st.subheader(t("🌀 Seasonality Index"))  # 季节指数子标题
+    overall = compute_release_trends(df)  # 计算整体月度序列的季节分解
+    seasonal_df = pd.DataFrame({
+        'release_month': range(1, 13),  # 月份（1-12）
+        'seasonal_index': overall['seasonal_index'][0]  # 季节指数：相对趋势的平均偏离
+    })
+    fig_seasonal = px.bar(seasonal_df, x='release_month', y='seasonal_index',  # 创建季节指数柱状图
+                          title=t('🌀 Seasonal Deviation from Trend (games per month)'),  # 图表标题
+                          labels={'release_month': t('Month'), 'seasonal_index': t('Deviation from Trend')},  # 轴标签重命名
+                          color='seasonal_index', color_continuous_scale='RdBu')  # 红蓝发散配色
+    fig_seasonal.update_layout(xaxis=dict(tickmode='linear', dtick=1))  # X轴每个月份都显示
+    st.plotly_chart(fig_seasonal, use_container_width=True)  # 显示图表，自适应宽度
+    st.caption(t("Unlike the raw monthly counts above, the seasonal index removes the long-term growth trend, so it isolates the calendar effect."))  # 说明季节指数与原始计数的区别
 
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
 def show_tab4(df, metrics, visuals):
     """
     显示标签页4：价格销量分析
     对应原标签页4的内容
     """
-    st.header("💰 Price vs Sales Analysis")  # 模块标题
-    st.plotly_chart(visuals['price_vs_sales'], use_container_width=True)  # 显示价格与销量关系散点图，自适应宽度
+    st.header(t("💰 Price vs Sales Analysis"))  # 模块标题
+    show_progressive_chart(price_sales_points(df), 'price_vs_sales', 'price', 'owners_median', create_price_sales_chart, view_key=visuals.key)  # 渐进式显示价格与销量关系散点图
     
     # 价格区间分析部分
-    st.subheader("💰 Price Range Sales Analysis")  # 价格区间分析子标题
-    
-    price_bins = [0, 5, 10, 20, 30, 50, 100, float('inf')]  # 定义价格区间边界
-    price_labels = ['Free', '0-5$', '5-10$', '10-20$', '20-30$', '30-50$', '50$+']  # 价格区间标签
+    st.subheader(t("💰 Price Range Sales Analysis"))  # 价格区间分析子标题
     
-    df_price_analysis = df.copy()  # 创建数据副本用于价格分析
-    df_price_analysis['price_range'] = pd.cut(df_price_analysis['price'], bins=price_bins, labels=price_labels, right=False)  # 为数据分配价格区间
-    
-    price_range_stats = df_price_analysis.groupby('price_range').agg({  # 按价格区间分组统计
-        'owners_median': 'mean',  # 平均销量
-        'name': 'count',  # 游戏数量
-        'positive_ratio': 'mean'  # 平均好评率
-    }).reset_index()  # 重置索引
+    price_edges = edges_input('price', t("Price range edges"))  # 可配置的价格区间边界（免费游戏单独成一档）
+    codes = cached_buckets(df, {'price': price_edges}, visuals.key)  # 一次二分查找分配价格区间（按当前视图缓存）
+    price_range_stats = bucket_stats(df, codes['price'], 'price', price_edges, means=('owners_median', 'positive_ratio'))  # 每个指标一次bincount统计
     
     col1, col2 = st.columns(2)  # 创建2列布局显示价格区间分析图表
     
     with col1:
         fig_price_sales = px.bar(price_range_stats,  # 创建价格区间vs平均销量柱状图
-                               x='price_range',  # X轴：价格区间
+                               x='bucket',  # X轴：价格区间
                                y='owners_median',  # Y轴：平均销量
-                               title='💰 Average Sales by Price Range',  # 图表标题
-                               labels={'price_range': 'Price Range', 'owners_median': 'Average Sales'},  # 轴标签重命名
+                               title=t('💰 Average Sales by Price Range'),  # 图表标题
+                               labels={'bucket': t('Price Range'), 'owners_median': t('Average Sales')},  # 轴标签重命名
                                color='owners_median',  # 根据平均销量值着色
                                color_continuous_scale='viridis')  # 使用viridis颜色方案
         st.plotly_chart(fig_price_sales, use_container_width=True)  # 显示图表，自适应宽度
     
     with col2:
         fig_price_count = px.bar(price_range_stats,  # 创建价格区间vs游戏数量柱状图
-                               x='price_range',  # X轴：价格区间
-                               y='name',  # Y轴：游戏数量
-                               title='📊 Game Count by Price Range',  # 图表标题
-                               labels={'price_range': 'Price Range', 'name': 'Number of Games'},  # 轴标签重命名
-                               color='name',  # 根据游戏数量值着色
+                               x='bucket',  # X轴：价格区间
+                               y='game_count',  # Y轴：游戏数量
+                               title=t('📊 Game Count by Price Range'),  # 图表标题
+                               labels={'bucket': t('Price Range'), 'game_count': t('Number of Games')},  # 轴标签重命名
+                               color='game_count',  # 根据游戏数量值着色
                                color_continuous_scale='plasma')  # 使用plasma颜色方案
         st.plotly_chart(fig_price_count, use_container_width=True)  # 显示图表，自适应宽度
     
-    st.subheader("💡 Key Price Metrics")  # 关键价格指标子标题
+    st.subheader(t("💡 Key Price Metrics"))  # 关键价格指标子标题
     col1, col2, col3, col4 = st.columns(4)  # 创建4列布局显示价格相关指标
     
     with col1:
-        st.metric("Average Price", f"${metrics['avg_price']:.2f}")  # 显示平均价格指标，格式化显示2位小数
+        st.metric(t("Average Price"), f"${metrics['avg_price']:.2f}")  # 显示平均价格指标，格式化显示2位小数
     
     with col2:
-        st.metric("Median Price", f"${metrics['median_price']:.2f}")  # 显示价格中位数指标，格式化显示2位小数
+        st.metric(t("Median Price"), f"${metrics['median_price']:.2f}")  # 显示价格中位数指标，格式化显示2位小数
     
     with col3:
         free_count = df['is_free'].sum()  # 计算免费游戏总数
-        st.metric("Free Games Count", f"{free_count:,}")  # 显示免费游戏数量指标，使用千位分隔符
+        st.metric(t("Free Games Count"), f"{free_count:,}")  # 显示免费游戏数量指标，使用千位分隔符
     
     with col4:
-        best_price_range = price_range_stats.loc[price_range_stats['owners_median'].idxmax()]  # 找到最畅销价格区间
-        st.metric("Best-selling Price Range", best_price_range['price_range'])  # 显示最畅销价格区间指标
+        sold = price_range_stats.dropna(subset=['owners_median'])  # 排除没有游戏的价格区间
+        best_price_range = sold.loc[sold['owners_median'].idxmax(), 'bucket'] if len(sold) else "N/A"  # 找到最畅销价格区间
+        st.metric(t("Best-selling Price Range"), best_price_range)  # 显示最畅销价格区间指标
+    
+    # 收入估计部分（销量区间 × 价格）
+    st.subheader(t("💵 Revenue Estimates"))  # 收入估计子标题
+    col1, col2 = st.columns(2)
+    with col1:
+        dims = {t(name): name for name in ['Price range', 'Genre', 'Release year']}  # 显示名称 -> 汇总维度
+        dim = dims[st.radio(t("Group by"), list(dims), horizontal=True, key='revenue_dim')]  # 汇总维度
+    with col2:
+        price_share = price_share_input('revenue_price_share')  # 实际到手价格比例
+    estimates = view_revenue(df, visuals.key, price_share)  # 每款游戏的收入区间（按当前视图缓存）
+    totals = revenue_totals(estimates)  # 收入区间合计
+    col1, col2, col3 = st.columns(3)  # 创建3列布局显示收入区间合计
+    col1.metric(t("Revenue (Low)"), f"${totals['low']:,.0f}")  # 销量区间下界的收入
+    col2.metric(t("Revenue (Mid)"), f"${totals['mid']:,.0f}")  # 销量区间中值的收入
+    col3.metric(t("Revenue (High)"), f"${totals['high']:,.0f}")  # 销量区间上界的收入
+    st.plotly_chart(create_revenue_chart(revenue_by(df, estimates, dim), dim), use_container_width=True)  # 显示收入估计图，自适应宽度
+    st.caption(t("Owners are only published as ranges, so each game's revenue is an interval: price × the low, middle and high end of its owners range."))  # 说明收入区间的来源
 
+@st.fragment  # 局部重跑：标签页内的控件变化时只重新运行本标签页
 def show_tab5(df, metrics, visuals):
     """
     显示标签页5：评价参与度分析
     对应原标签页5的内容
     """
-    st.header("⏱️ Game Rating & Player Engagement Analysis")  # 模块标题
-    st.plotly_chart(visuals['rating_vs_playtime'], use_container_width=True)  # 显示评价与时长关系图，自适应宽度
+    st.header(t("⏱️ Game Rating & Player Engagement Analysis"))  # 模块标题
+    show_progressive_chart(engagement_points(df), 'rating_vs_playtime', 'positive_ratio', 'average_playtime', create_rating_playtime_chart, view_key=visuals.key)  # 渐进式显示评价与时长关系图
     
-    st.subheader("🎯 Player Engagement Analysis")  # 玩家参与度分析子标题
+    st.subheader(t("🎯 Player Engagement Analysis"))  # 玩家参与度分析子标题
     
-    short_play = df[df['average_playtime'] < 100]  # 筛选短时长游戏（小于100分钟）
-    medium_play = df[(df['average_playtime'] >= 100) & (df['average_playtime'] <= 1000)]  # 筛选中等时长游戏（100-1000分钟）
-    long_play = df[df['average_playtime'] > 1000]  # 筛选长时长游戏（大于1000分钟）
+    playtime_edges = edges_input('playtime', t("Playtime bucket edges"))  # 可配置的游戏时长区间边界
+    with st.expander(t("Owner and rating bucket edges")):  # 销量和好评率的区间边界
+        owners_edges = edges_input('owners', t("Owner tier edges"))
+        rating_edges = edges_input('rating', t("Rating bucket edges"))
+    codes = cached_buckets(df, {'playtime': playtime_edges, 'owners': owners_edges, 'rating': rating_edges}, visuals.key)  # 每个维度一次二分查找分配区间（按当前视图缓存）
+    playtime_stats = bucket_stats(df, codes['playtime'], 'playtime', playtime_edges, means=('positive_ratio',))  # 每个时长区间的游戏数和平均好评率
     
-    col1, col2, col3 = st.columns(3)  # 创建3列布局显示不同时长区间的评价
+    for col, row in zip(st.columns(len(playtime_stats)), playtime_stats.itertuples()):  # 每个时长区间一列
+        with col:
+            rating = f"{row.positive_ratio * 100:.1f}%" if row.game_count else "N/A"  # 空区间没有好评率
+            st.metric(t("{bucket} Positive Rating", bucket=row.bucket), rating, help=t("{count:,} games", count=row.game_count))  # 显示该时长区间的平均好评率，保留1位小数
     
+    col1, col2 = st.columns(2)  # 创建2列布局显示销量档位和好评率区间的统计
     with col1:
-        short_rating = short_play['positive_ratio'].mean() * 100  # 计算短时长游戏平均好评率
-        st.metric("Short Playtime Positive Rating", f"{short_rating:.1f}%")  # 显示短时长游戏好评率指标，保留1位小数
-    
+        owners_stats = bucket_stats(df, codes['owners'], 'owners', owners_edges, means=('positive_ratio', 'average_playtime'))  # 每个销量档位的好评率和时长
+        st.dataframe(owners_stats.rename(columns={'bucket': 'Owners', 'game_count': 'Games', 'positive_ratio': 'Avg Positive Ratio',
+                                                  'average_playtime': 'Avg Playtime (min)'}), use_container_width=True, hide_index=True)
     with col2:
-        medium_rating = medium_play['positive_ratio'].mean() * 100  # 计算中等时长游戏平均好评率
-        st.metric("Medium Playtime Positive Rating", f"{medium_rating:.1f}%")  # 显示中等时长游戏好评率指标，保留1位小数
+        rating_stats = bucket_stats(df, codes['rating'], 'rating', rating_edges, means=('average_playtime', 'owners_median'))  # 每个好评率区间的时长和销量
+        st.dataframe(rating_stats.rename(columns={'bucket': 'Positive Rating', 'game_count': 'Games', 'average_playtime': 'Avg Playtime (min)',
+                                                  'owners_median': 'Avg Owners'}), use_container_width=True, hide_index=True)
     
-    with col3:
-        long_rating = long_play['positive_ratio'].mean() * 100  # 计算长时长游戏平均好评率
-        st.metric("Long Playtime Positive Rating", f"{long_rating:.1f}%")  # 显示长时长游戏好评率指标，保留1位小数
+    show_rating_leaderboard(df, dataset_details()['rating_prior'])  # 按预先计算的Wilson下界排名显示高分游戏
     
-    st.write("""  # 参与度分析结论
+    st.write(t("""  # 参与度分析结论
     **Analysis Conclusions:**
     - Game playtime shows positive correlation with positive ratings
     - The more time players invest, the more positive their evaluations tend to be
     - Game depth and content quality are key factors in maintaining long-term player engagement
-    """)
\ No newline at end of file
+    """))
\ No newline at end of file
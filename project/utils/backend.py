@@ -0,0 +1,385 @@
+import numpy as np  # 导入numpy用于数值计算
+import pandas as pd  # 导入pandas用于数据处理
+from utils.prep import filter_mask, platform_selection_bits, empty_metrics  # 从utils.prep模块导入现有的过滤掩码函数（pandas后端直接复用）、平台位组合函数和空选择的指标
+from utils.search import build_search_index  # 从utils.search模块导入搜索索引构建函数（pandas后端按需构建）
+from utils.opportunity import PLATFORM_COMBINATIONS  # 从utils.opportunity模块导入平台组合标签
+
+AGGREGATE_FUNCTIONS = {'count', 'sum', 'mean', 'min', 'max', 'median', 'nunique'}  # 后端支持的聚合函数
+WHERE_OPERATORS = {'>=', '<=', '>', '<', '==', '!=', 'in'}  # 后端支持的附加条件运算符
+SQL_FUNCTIONS = {'sum': 'SUM', 'mean': 'AVG', 'min': 'MIN', 'max': 'MAX', 'median': 'MEDIAN'}  # 聚合函数到SQL的映射
+PLATFORM_COLUMNS = {'Windows': 'windows_support', 'Mac': 'mac_support', 'Linux': 'linux_support'}  # 平台选项到支持列的映射
+STREAM_BATCH_ROWS = 65536  # 流式读取时每批的行数
+ROW_POSITION = 'row_position'  # 行在预处理后数据中的位置（数量相同的类型按首次出现的先后排序，与value_counts一致）
+
+
+def write_columnar_file(df, path):
+    """
+    将预处理后的数据写为Parquet列式文件，供SQL后端查询
+    按发布年份排序，使年份过滤可以跳过整个行组；原来的行顺序保存在row_position列中
+    """
+    period_columns = [c for c in df.columns if isinstance(df[c].dtype, pd.PeriodDtype)]  # Period列无法写入Parquet
+    frame = df.drop(columns=period_columns).assign(**{ROW_POSITION: np.arange(len(df), dtype=np.int64)})  # 记录排序前的行位置
+    frame.sort_values('release_year', kind='stable').to_parquet(path, index=False, row_group_size=STREAM_BATCH_ROWS)  # 小行组便于谓词下推
+
+
+def _check_where(where):
+    """
+    校验附加条件格式：[(列名, 运算符, 值), ...]
+    """
+    for column, op, value in where or []:
+        if op not in WHERE_OPERATORS:
+            raise ValueError(f"Unsupported operator: {op}")
+
+
+class PandasBackend:
+    """
+    内存pandas后端：整个数据集保存在一个DataFrame中（即应用现有的行为）
+    search_index为build_search_index构建的索引；未提供时在第一次搜索时构建
+    """
+
+    def __init__(self, df, search_index=None):
+        self.df = df  # 预处理后的完整数据
+        self.search_index = search_index  # 搜索索引（与应用的搜索框结果一致）
+
+    def _mask(self, filters, where=None):
+        """
+        计算满足侧边栏过滤条件和附加条件的行掩码
+        返回布尔数组
+        """
+        _check_where(where)  # 校验附加条件
+        if filters and filters.get('search_query', '').strip() and self.search_index is None:  # 第一次搜索时构建索引
+            self.search_index = build_search_index(self.df)
+        mask = filter_mask(self.df, filters, self.search_index) if filters else np.ones(len(self.df), dtype=bool)  # 复用apply_filters的过滤逻辑（包括搜索和联动选择）
+        for column, op, value in where or []:  # 依次应用附加条件
+            series = self.df[column]
+            mask &= (series.isin(value) if op == 'in' else {
+                '>=': series >= value, '<=': series <= value, '>': series > value,
+                '<': series < value, '==': series == value, '!=': series != value}[op]).to_numpy()
+        return mask
+
+    def _filtered(self, filters, where=None):
+        """
+        应用侧边栏过滤条件和附加条件
+        返回过滤后的DataFrame
+        """
+        return self.df[self._mask(filters, where)]
+
+    def count(self, filters=None, where=None):
+        """
+        统计满足条件的游戏数
+        """
+        return len(self._filtered(filters, where))
+
+    def aggregate(self, filters=None, group_by=(), aggregations=None, where=None):
+        """
+        按group_by分组聚合；aggregations为 {输出列: (输入列, 聚合函数)}，count统计行数
+        返回按分组键排序的DataFrame（不分组时为一行）；ROW_POSITION可作为输入列（行在数据中的位置）
+        """
+        mask = self._mask(filters, where)  # 过滤掩码
+        frame = self.df[mask]  # 过滤后的数据
+        if any(column == ROW_POSITION for column, _ in aggregations.values()):  # 行位置不是数据列，按需添加
+            frame = frame.assign(**{ROW_POSITION: np.flatnonzero(mask)})
+        specs = {out: (column, 'size' if func == 'count' else func) for out, (column, func) in aggregations.items()}  # count统计行数
+        if group_by:  # 分组聚合
+            return frame.groupby(list(group_by)).agg(**specs).reset_index().sort_values(list(group_by)).reset_index(drop=True)
+        row = {}  # 不分组时整体聚合为一行
+        for out, (column, func) in specs.items():
+            if func == 'size':  # 行数
+                row[out] = len(frame)
+                continue
+            series = frame[column].astype(float) if frame[column].dtype == bool else frame[column]  # 布尔列转为数值后再聚合
+            row[out] = getattr(series, func)()
+        return pd.DataFrame([row])
+
+    def fetch(self, filters=None, columns=None, where=None, order_by=None, descending=False, limit=None):
+        """
+        读取满足条件的行（只返回所需的列）
+        返回DataFrame
+        """
+        frame = self._filtered(filters, where)  # 过滤后的数据
+        if order_by:  # 排序
+            frame = frame.sort_values(order_by, ascending=not descending)
+        if limit is not None:  # 截取前limit行
+            frame = frame.head(limit)
+        return frame[list(columns)] if columns else frame
+
+    def fetch_batches(self, filters=None, columns=None, where=None, batch_rows=STREAM_BATCH_ROWS):
+        """
+        分批读取满足条件的行：只计算行掩码，每批按位置取出，不复制整个过滤结果
+        返回DataFrame批次的生成器
+        """
+        positions = np.flatnonzero(self._mask(filters, where))  # 选中行的位置
+        for start in range(0, len(positions), batch_rows):  # 按批次取出
+            batch = self.df.iloc[positions[start:start + batch_rows]]
+            yield batch[list(columns)] if columns else batch
+
+    def distinct(self, column):
+        """
+        返回某列排序后的唯一值列表
+        """
+        return sorted(self.df[column].dropna().unique())
+
+
+class DuckDBBackend:
+    """
+    嵌入式分析型SQL后端：对Parquet列式文件执行查询，过滤和分组下推到引擎，
+    只返回聚合结果或所需的列，不在内存中构建完整DataFrame；DuckDB自动多线程执行
+    """
+
+    def __init__(self, parquet_path, threads=None):
+        import duckdb  # 可选依赖，只在使用SQL后端时导入
+        self.connection = duckdb.connect(database=':memory:')  # 内存数据库连接（数据仍在Parquet文件中）
+        if threads:  # 指定线程数
+            self.connection.execute(f"SET threads TO {int(threads)}")
+        escaped = str(parquet_path).replace("'", "''")  # 转义路径中的单引号
+        self.connection.execute(f"CREATE VIEW games AS SELECT * FROM read_parquet('{escaped}')")  # 视图只记录查询，不加载数据
+        self.columns = [row[0] for row in self.connection.execute("DESCRIBE games").fetchall()]  # 可用的列
+        if ROW_POSITION not in self.columns:  # 旧文件没有行位置列：以文件中的行号代替
+            self.connection.execute(f"CREATE OR REPLACE VIEW games AS SELECT *, file_row_number AS {ROW_POSITION} FROM read_parquet('{escaped}', file_row_number=true)")
+            self.columns.append(ROW_POSITION)
+
+    def _execute(self, sql, params=()):
+        """
+        在独立游标上执行查询，多个线程（如API工作线程）可同时使用同一个后端
+        返回游标
+        """
+        return self.connection.cursor().execute(sql, params)
+
+    def _column(self, name):
+        """
+        校验并引用列名，避免SQL注入
+        """
+        if name not in self.columns:
+            raise ValueError(f"Unknown column: {name}")
+        return f'"{name}"'
+
+    def _where_clause(self, filters, where=None):
+        """
+        将侧边栏过滤条件、图表联动选择和附加条件编译为参数化的WHERE子句
+        搜索依赖内存中的倒排索引，SQL后端不支持，带搜索词时抛出ValueError
+        返回(SQL片段, 参数列表)
+        """
+        _check_where(where)  # 校验附加条件
+        clauses, params = [], []  # 条件片段和参数
+        if filters and filters.get('search_query', '').strip():  # 不能静默忽略搜索词
+            raise ValueError("search_query is not supported by the DuckDB backend; use the pandas backend")
+        if filters:
+            clauses.append("release_year BETWEEN ? AND ?")  # 年份范围
+            params.extend(filters['year_range'])
+            clauses.append("price BETWEEN ? AND ?")  # 价格范围
+            params.extend(filters['price_range'])
+            if filters.get('selected_genres'):  # 类型过滤
+                clauses.append(f"main_genre IN ({', '.join('?' * len(filters['selected_genres']))})")
+                params.extend(filters['selected_genres'])
+            selected_bits = platform_selection_bits(filters.get('platform_options', []))  # 所选平台的位组合
+            if selected_bits and 'platform_mask' in self.columns:  # 支持任一所选平台即可（与apply_filters一致，按位与）
+                clauses.append("(platform_mask & ?) != 0")
+                params.append(selected_bits)
+            elif selected_bits:  # 没有位掩码列的旧文件：逐列判断
+                platforms = [PLATFORM_COLUMNS[p] for p in filters['platform_options'] if p in PLATFORM_COLUMNS]
+                clauses.append('(' + ' OR '.join(platforms) + ')')
+            if filters.get('linked_year_range'):  # 联动选择的年份范围
+                clauses.append("release_year BETWEEN ? AND ?")
+                params.extend(filters['linked_year_range'])
+            if filters.get('linked_genres'):  # 联动选择的类型
+                clauses.append(f"main_genre IN ({', '.join('?' * len(filters['linked_genres']))})")
+                params.extend(filters['linked_genres'])
+        for column, op, value in where or []:  # 附加条件
+            if op == 'in':
+                values = list(value)
+                clauses.append(f"{self._column(column)} IN ({', '.join('?' * len(values))})" if values else "FALSE")
+                params.extend(values)
+            else:
+                clauses.append(f"{self._column(column)} {'=' if op == '==' else op} ?")
+                params.append(value.item() if isinstance(value, np.generic) else value)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def _aggregate_expression(self, column, func):
+        """
+        将聚合函数转换为SQL表达式（布尔列先转为数值再求和/求平均）
+        """
+        if func not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Unsupported aggregation: {func}")
+        if func == 'count':
+            return "COUNT(*)"
+        if func == 'nunique':
+            return f"COUNT(DISTINCT {self._column(column)})"
+        if func in ('min', 'max'):
+            return f"{SQL_FUNCTIONS[func]}({self._column(column)})"
+        return f"{SQL_FUNCTIONS[func]}(CAST({self._column(column)} AS DOUBLE))"
+
+    def count(self, filters=None, where=None):
+        """
+        统计满足条件的游戏数
+        """
+        clause, params = self._where_clause(filters, where)  # WHERE子句
+        return self._execute(f"SELECT COUNT(*) FROM games{clause}", params).fetchone()[0]
+
+    def aggregate(self, filters=None, group_by=(), aggregations=None, where=None):
+        """
+        按group_by分组聚合；aggregations为 {输出列: (输入列, 聚合函数)}，count统计行数
+        返回按分组键排序的DataFrame（不分组时为一行）
+        """
+        clause, params = self._where_clause(filters, where)  # WHERE子句
+        keys = [self._column(c) for c in group_by]  # 分组列
+        selects = keys + [f'{self._aggregate_expression(column, func)} AS "{out}"' for out, (column, func) in aggregations.items()]  # 查询列
+        sql = f"SELECT {', '.join(selects)} FROM games{clause}"  # 聚合查询
+        if keys:
+            sql += f" GROUP BY {', '.join(keys)} ORDER BY {', '.join(keys)}"  # 分组并排序
+        return self._execute(sql, params).df()
+
+    def fetch(self, filters=None, columns=None, where=None, order_by=None, descending=False, limit=None):
+        """
+        读取满足条件的行（只读取所需的列，列裁剪下推到Parquet）
+        返回DataFrame
+        """
+        clause, params = self._where_clause(filters, where)  # WHERE子句
+        selects = ', '.join(self._column(c) for c in columns) if columns else '*'  # 查询列
+        sql = f"SELECT {selects} FROM games{clause}"
+        if order_by:  # 排序
+            sql += f" ORDER BY {self._column(order_by)} {'DESC' if descending else 'ASC'}"
+        if limit is not None:  # 限制行数
+            sql += f" LIMIT {int(limit)}"
+        return self._execute(sql, params).df()
+
+    def fetch_batches(self, filters=None, columns=None, where=None, batch_rows=STREAM_BATCH_ROWS):
+        """
+        以Arrow记录批次流式读取满足条件的行，内存中同时只保留一个批次
+        返回DataFrame批次的生成器
+        """
+        clause, params = self._where_clause(filters, where)  # WHERE子句
+        selects = ', '.join(self._column(c) for c in columns) if columns else '*'  # 查询列
+        cursor = self.connection.cursor()  # 独立游标，避免与其他查询互相干扰
+        reader = cursor.execute(f"SELECT {selects} FROM games{clause}", params).fetch_record_batch(batch_rows)  # Arrow批次读取器
+        for batch in reader:  # 逐批转换为DataFrame
+            yield batch.to_pandas()
+
+    def distinct(self, column):
+        """
+        返回某列排序后的唯一值列表
+        """
+        rows = self._execute(f"SELECT DISTINCT {self._column(column)} FROM games WHERE {self._column(column)} IS NOT NULL ORDER BY 1").fetchall()
+        return [row[0] for row in rows]
+
+
+def create_backend(kind='pandas', source=None, **options):
+    """
+    创建查询后端：kind为'pandas'时source为DataFrame，为'duckdb'时source为Parquet文件路径
+    options传给后端构造函数（pandas后端的search_index，DuckDB后端的threads）
+    返回后端对象
+    """
+    if kind == 'pandas':
+        return PandasBackend(source, **options)
+    if kind == 'duckdb':
+        return DuckDBBackend(source, **options)
+    raise ValueError(f"Unknown backend: {kind}")
+
+
+def _first_extreme(table, key, value, largest=True):
+    """
+    在按key排序的聚合表中找到value最大（或最小）的第一行（与pandas的idxmax/idxmin一致）
+    返回(key值, value值)，聚合表为空时返回(None, None)
+    """
+    if len(table) == 0:  # 没有满足条件的行
+        return None, None
+    values = table[value].to_numpy()  # 聚合值
+    position = int(np.argmax(values) if largest else np.argmin(values))  # 第一个极值的位置
+    return table[key].iloc[position], values[position]
+
+
+def _genre_counts(backend, filters):
+    """
+    按类型统计游戏数：数量降序，数量相同时按首次出现的先后排序（与value_counts的顺序一致）
+    返回DataFrame（列：main_genre、count）
+    """
+    genres = backend.aggregate(filters, ('main_genre',), {'count': ('appid', 'count'), 'first_row': (ROW_POSITION, 'min')})
+    genres = genres.sort_values(['count', 'first_row'], ascending=[False, True])  # 数量相同时先出现的在前
+    return genres.drop(columns='first_row').reset_index(drop=True)
+
+
+def compute_key_metrics(backend, filters=None):
+    """
+    通过查询后端计算关键指标（与calculate_key_metrics的结果一致）
+    所有统计都以聚合查询完成，SQL后端无需把数据加载到内存
+    返回包含各种指标的字典（没有满足条件的游戏时与empty_metrics相同）
+    """
+    metrics = {}  # 存储指标的字典
+    overall = backend.aggregate(filters, (), {  # 一次查询得到所有整体指标
+        'total_games': ('appid', 'count'),
+        'free_share': ('is_free', 'mean'),
+        'avg_rating': ('positive_ratio', 'mean'),
+        'min_year': ('release_year', 'min'),
+        'max_year': ('release_year', 'max'),
+        'windows_games': ('windows_support', 'sum'),
+        'mac_games': ('mac_support', 'sum'),
+        'linux_games': ('linux_support', 'sum'),
+        'multi_platform_games': ('multi_platform', 'sum'),
+        'unique_genres': ('main_genre', 'nunique')
+    })
+    overall = {column: overall.at[0, column] for column in overall.columns}  # 逐列取值，保留各列原有的数据类型
+    if overall['total_games'] == 0:  # 空选择：计数为0，其余指标为空值，不再执行后续查询
+        return empty_metrics()
+    metrics['total_games'] = int(overall['total_games'])  # 游戏总数
+    metrics['free_game_percentage'] = overall['free_share'] * 100  # 免费游戏比例
+    metrics['avg_rating'] = overall['avg_rating'] * 100  # 平均好评率
+    metrics['year_range'] = f"{overall['min_year']}-{overall['max_year']}"  # 时间范围字符串
+
+    yearly = backend.aggregate(filters, ('release_year',), {'count': ('appid', 'count')})  # 按年份统计
+    peak_year, peak_year_count = _first_extreme(yearly, 'release_year', 'count')  # 发布高峰年份
+    metrics['peak_year'] = int(peak_year)
+    metrics['peak_year_count'] = int(peak_year_count)
+
+    paid = backend.aggregate(filters, (), {'avg_price': ('price', 'mean'), 'median_price': ('price', 'median')}, where=[('price', '>', 0)])  # 付费游戏价格统计
+    metrics['avg_price'] = paid.at[0, 'avg_price']  # 平均价格
+    metrics['median_price'] = paid.at[0, 'median_price']  # 价格中位数
+
+    for key in ('windows_games', 'mac_games', 'linux_games', 'multi_platform_games'):  # 平台相关指标
+        metrics[key] = int(overall[key])
+
+    genres = _genre_counts(backend, filters)  # 按类型统计
+    metrics['top_genres'] = genres['main_genre'].head(5).tolist()  # 前5个热门类型
+    metrics['unique_genres'] = int(overall['unique_genres'])  # 唯一类型数量
+
+    monthly = backend.aggregate(filters, ('release_month',), {'count': ('appid', 'count')})  # 按月份统计
+    peak_month, peak_month_count = _first_extreme(monthly, 'release_month', 'count')  # 发布高峰月份
+    slow_month, slow_month_count = _first_extreme(monthly, 'release_month', 'count', largest=False)  # 发布低谷月份
+    metrics['peak_month'] = int(peak_month)
+    metrics['peak_month_count'] = int(peak_month_count)
+    metrics['slow_month'] = int(slow_month)
+    metrics['slow_month_count'] = int(slow_month_count)
+    return metrics
+
+
+def _label_platform_combinations(table):
+    """
+    将按platform_mask分组的聚合表转换为带组合标签的表（按游戏数降序）
+    """
+    table = table.assign(platforms=np.asarray(PLATFORM_COMBINATIONS)[table['platform_mask'].to_numpy(dtype=np.int64)])  # 位掩码转为组合标签
+    return table.sort_values('game_count', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def compute_aggregates(backend, filters=None, top_n=15):
+    """
+    通过查询后端计算各标签页图表背后的聚合表
+    返回 {表名: DataFrame} 字典
+    """
+    publishers = backend.aggregate(filters, ('publisher',), {  # 发行商统计
+        'game_count': ('appid', 'count'), 'positive_ratio': ('positive_ratio', 'mean'), 'owners_median': ('owners_median', 'mean')})
+    genres = _genre_counts(backend, filters)  # 类型统计
+    platforms = backend.aggregate(filters, (), {  # 平台支持统计
+        'Windows': ('windows_support', 'sum'), 'Mac': ('mac_support', 'sum'), 'Linux': ('linux_support', 'sum')})
+    return {
+        'yearly_releases': backend.aggregate(filters, ('release_year',), {'count': ('appid', 'count')}),  # 年度发布数量
+        'monthly_releases': backend.aggregate(filters, ('release_month',), {'game_count': ('appid', 'count')}),  # 月度发布数量
+        'genre_distribution': genres.head(top_n),  # 前top_n个类型
+        'top_publishers': publishers.sort_values(['game_count', 'publisher'], ascending=[False, True]).head(top_n).reset_index(drop=True),  # 前top_n个发行商
+        'platform_support': platforms.melt(var_name='platform', value_name='game_count'),  # 各平台支持游戏数
+        'free_vs_paid': backend.aggregate(filters, ('is_free',), {  # 免费与付费对比
+            'positive_ratio': ('positive_ratio', 'mean'), 'average_playtime': ('average_playtime', 'mean'),
+            'owners_median': ('owners_median', 'mean'), 'game_count': ('appid', 'count')}),
+        'platform_combinations': _label_platform_combinations(backend.aggregate(filters, ('platform_mask',), {  # 各平台组合统计
+            'game_count': ('appid', 'count'), 'positive_ratio': ('positive_ratio', 'mean'), 'owners_median': ('owners_median', 'mean')})),
+        'multi_platform': backend.aggregate(filters, ('multi_platform',), {  # 多平台与单平台对比
+            'positive_ratio': ('positive_ratio', 'mean'), 'owners_median': ('owners_median', 'mean'),
+            'average_playtime': ('average_playtime', 'mean'), 'game_count': ('appid', 'count')})
+    }
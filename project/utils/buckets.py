@@ -0,0 +1,104 @@
+import numpy as np  # 导入numpy用于二分查找分桶和bincount统计
+import pandas as pd  # 导入pandas用于结果整理
+import streamlit as st  # 导入streamlit用于区间边界输入控件
+from utils.memory import memory_budget  # 从utils.memory模块导入共享内存预算
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+
+BUCKET_SPECS = {  # 分桶维度 -> 数值列、默认边界、标签格式（前缀、数值格式、后缀）；zero_label不为None时值<=0单独成一档（如免费游戏）；scale为界面输入时的倍数
+    'price': {'column': 'price', 'edges': [5, 10, 20, 30, 50], 'prefix': '$', 'format': '{:g}', 'suffix': '', 'zero_label': 'Free', 'scale': 1, 'unit': 'USD'},
+    'playtime': {'column': 'average_playtime', 'edges': [100, 1000], 'prefix': '', 'format': '{:g}', 'suffix': ' min', 'zero_label': None, 'scale': 1, 'unit': 'minutes'},
+    'owners': {'column': 'owners_median', 'edges': [20000, 100000, 500000, 2000000], 'prefix': '', 'format': '{:,.0f}', 'suffix': '', 'zero_label': None, 'scale': 1, 'unit': 'owners'},
+    'rating': {'column': 'positive_ratio', 'edges': [0.4, 0.7, 0.8, 0.95], 'prefix': '', 'format': '{:g}', 'suffix': '%', 'zero_label': None, 'scale': 100, 'unit': '% positive'},
+}
+
+
+def bucket_labels(dim, edges=None):
+    """
+    生成分桶标签：第一档为"<下界"，中间为"a-b"，最后一档为"上界+"（如"$0-5"、"100-1000 min"、"$50+"）；有zero_label时第一档为该标签，第二档从0开始
+    返回标签列表
+    """
+    spec = BUCKET_SPECS[dim]
+    edges = spec['edges'] if edges is None else edges
+    fmt = lambda value: spec['format'].format(value * spec['scale'])  # 按界面单位格式化边界
+    prefix, suffix = spec['prefix'], spec['suffix']
+    if spec['zero_label'] is not None:  # 值<=0单独成一档，其余从0开始
+        edges = [0] + list(edges)
+        head = [spec['zero_label']]
+    else:
+        head = [f"<{prefix}{fmt(edges[0])}{suffix}"]
+    return head + [f"{prefix}{fmt(a)}-{fmt(b)}{suffix}" for a, b in zip(edges[:-1], edges[1:])] + [f"{prefix}{fmt(edges[-1])}+{suffix}"]
+
+
+def bucket_codes(values, dim, edges=None):
+    """
+    一次二分查找为每个值分配分桶编码（区间左闭右开：[a, b)），缺失值为-1
+    返回int8编码数组
+    """
+    spec = BUCKET_SPECS[dim]
+    edges = spec['edges'] if edges is None else edges
+    values = np.asarray(values, dtype=float)
+    codes = np.searchsorted(np.asarray(edges, dtype=float), values, side='right')  # 所在区间的下标
+    if spec['zero_label'] is not None:  # 值<=0归入单独的一档
+        codes = np.where(values <= 0, 0, codes + 1)
+    return np.where(np.isnan(values), -1, codes).astype(np.int8)
+
+
+def assign_buckets(df, edges_by_dim):
+    """
+    为edges_by_dim中的每个维度分配分桶编码（每个维度一次向量化的searchsorted）
+    返回 维度 -> int8编码数组
+    """
+    return {dim: bucket_codes(df[BUCKET_SPECS[dim]['column']], dim, edges) for dim, edges in edges_by_dim.items()}
+
+
+def cached_buckets(df, edges_by_dim, view_key):
+    """
+    返回当前视图的分桶编码，按视图（数据版本和过滤条件）与区间边界保存在内存预算中，切换标签页或重跑时不再重新分桶
+    """
+    key = ('buckets', view_key, tuple(sorted((dim, tuple(edges)) for dim, edges in edges_by_dim.items())))
+    return memory_budget.get_or_compute('views', key, assign_buckets, df, edges_by_dim)
+
+
+def bucket_stats(df, codes, dim, edges=None, means=()):
+    """
+    按分桶统计游戏数以及means中各列的平均值，每个指标一次bincount
+    返回按分桶顺序排列的DataFrame（列：bucket、game_count及各列均值；空分桶的均值为NaN）
+    """
+    labels = bucket_labels(dim, edges)
+    valid = codes >= 0  # 排除缺失值
+    valid_codes = codes[valid].astype(np.int64)
+    game_count = np.bincount(valid_codes, minlength=len(labels))  # 每个分桶的游戏数
+    table = pd.DataFrame({'bucket': pd.Categorical(labels, categories=labels, ordered=True), 'game_count': game_count})
+    with np.errstate(invalid='ignore', divide='ignore'):  # 空分桶的均值为NaN
+        for column in means:
+            table[column] = np.bincount(valid_codes, weights=df[column].to_numpy(dtype=float)[valid], minlength=len(labels)) / game_count
+    return table
+
+
+def parse_edges(text, dim):
+    """
+    解析逗号分隔的区间边界（界面单位），返回严格递增的边界列表；格式错误时返回None
+    """
+    scale = BUCKET_SPECS[dim]['scale']
+    try:
+        edges = [float(item) / scale for item in text.replace(';', ',').split(',') if item.strip()]
+    except ValueError:
+        return None
+    if not edges or any(b <= a for a, b in zip(edges[:-1], edges[1:])):
+        return None
+    return edges
+
+
+def edges_input(dim, label):
+    """
+    显示区间边界输入框（默认为该维度的默认边界），格式错误时提示并使用默认边界
+    返回边界列表
+    """
+    spec = BUCKET_SPECS[dim]
+    default = ', '.join(f"{edge * spec['scale']:g}" for edge in spec['edges'])
+    text = st.text_input(t("{label} ({unit}, comma-separated)", label=label, unit=t(spec['unit'])), value=default, key=f'bucket_edges_{dim}')
+    edges = parse_edges(text, dim)
+    if edges is None:
+        st.warning(t("Bucket edges must be increasing numbers, e.g. {default}; using the defaults.", default=default))
+        return list(spec['edges'])
+    return edges
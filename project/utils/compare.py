@@ -0,0 +1,174 @@
+import numpy as np  # 导入numpy用于按切片编号一次性分组计数
+import pandas as pd  # 导入pandas用于整理对比表
+import streamlit as st  # 导入streamlit用于保存固定的切片和缓存编码
+from utils.prep import filter_mask, filters_cache_key  # 从utils.prep模块导入过滤掩码和过滤条件规范化函数
+from utils.incremental import PLATFORM_COLUMNS, totals_metrics  # 从utils.incremental模块导入平台计数列和由累计统计计算指标的函数
+from utils.memory import memory_budget  # 从utils.memory模块导入共享内存预算
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+
+COMPARE_STATE_KEY = 'compare_slices'  # 会话状态中保存固定切片的键：[(名称, 过滤条件), ...]
+MAX_SLICES = 4  # 最多同时对比的切片数（含当前过滤条件）
+PLATFORM_NAMES = {'windows_support': 'Windows', 'mac_support': 'Mac', 'linux_support': 'Linux'}  # 平台计数列 -> 平台名
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)  # 编码每个数据版本只计算一次，并在会话之间共享
+def encode_columns(_df, version):
+    """
+    将对比用到的列编码为整数和数值数组，所有切片共用同一份编码
+    缓存只按数据版本区分（_df不参与哈希，避免每次调用都对整个数据集求哈希）
+    返回编码字典
+    """
+    df = _df
+    genre_codes, genres = pd.factorize(df['main_genre'])  # 主要类型编码（缺失值为-1）
+    year_min = int(df['release_year'].min()) if len(df) else 0  # 年份编码的起点
+    year_codes = df['release_year'].to_numpy(dtype=np.int64) - year_min
+    return {
+        'year_min': year_min,
+        'years': year_codes,
+        'n_years': int(year_codes.max()) + 1 if len(df) else 1,
+        'months': df['release_month'].to_numpy(dtype=np.int64),
+        'genres': genre_codes,
+        'genre_names': genres,
+        'price': df['price'].to_numpy(dtype=float),
+        'ratio': df['positive_ratio'].to_numpy(dtype=float),
+        'free': df['is_free'].to_numpy(dtype=bool),
+        'platforms': {col: df[col].to_numpy(dtype=bool) for col in PLATFORM_COLUMNS},
+    }
+
+
+def compare_slices(df, specs, search_index=None, version=None):
+    """
+    一次计算多个过滤条件（切片）的指标和图表聚合
+    所有切片共用一份列编码；选中的行按(切片编号, 行位置)展开后，每个分组统计只做一次以切片编号为额外分组键的bincount，
+    N个切片的代价接近一次扫描，而不是N次完整的过滤、指标和图表计算
+    specs为[(名称, 过滤条件), ...]；version为数据版本号（用于缓存列编码）
+    返回{'labels', 'metrics'（每个切片的指标字典，空切片为None）, 'yearly', 'genres', 'platforms'}
+    """
+    codes = encode_columns(df, version)
+    labels = [label for label, _ in specs]
+    k = len(specs)
+    masks = np.stack([filter_mask(df, filters, search_index) for _, filters in specs])  # 每个切片的行掩码
+    slice_ids, rows = np.nonzero(masks)  # 展开的(切片编号, 行位置)，同一切片内按行顺序排列
+
+    def grouped(values, size, weights=None):  # 以切片编号为额外分组键计数（或求和），返回k×size数组
+        return np.bincount(slice_ids * size + values, weights=weights, minlength=k * size).reshape(k, size)
+
+    counts = np.bincount(slice_ids, minlength=k)
+    price = codes['price'][rows]
+    paid = price > 0  # 付费游戏
+    genre_codes = codes['genres'][rows]
+    n_genres = len(codes['genre_names'])
+    totals = {
+        'count': counts,
+        'free': np.bincount(slice_ids, weights=codes['free'][rows], minlength=k),
+        'ratio': np.bincount(slice_ids, weights=codes['ratio'][rows], minlength=k),
+        'paid': np.bincount(slice_ids[paid], minlength=k),
+        'paid_price': np.bincount(slice_ids[paid], weights=price[paid], minlength=k),
+        'years': grouped(codes['years'][rows], codes['n_years']),
+        'months': grouped(codes['months'][rows], 13),
+        'genres': grouped(np.where(genre_codes >= 0, genre_codes, n_genres), n_genres + 1)[:, :n_genres],  # 缺失类型不计入
+        **{col: np.bincount(slice_ids, weights=values[rows], minlength=k).astype(np.int64) for col, values in codes['platforms'].items()},
+    }
+    paid_order = np.lexsort((price[paid], slice_ids[paid]))  # 付费游戏按(切片, 价格)排序
+    paid_slices, paid_prices = slice_ids[paid][paid_order], price[paid][paid_order]
+    bounds = np.searchsorted(slice_ids, np.arange(k + 1))  # 每个切片在展开数组中的起止位置
+    paid_bounds = np.searchsorted(paid_slices, np.arange(k + 1))
+
+    metrics = []
+    for i in range(k):
+        if counts[i] == 0:  # 空切片没有指标
+            metrics.append(None)
+            continue
+        slice_totals = {key: value[i] for key, value in totals.items()}  # 该切片的计数和求和
+        slice_totals.update({key: int(slice_totals[key]) for key in ('count', 'free', 'paid', *PLATFORM_COLUMNS)})  # 计数转为整数
+        metrics.append(totals_metrics(slice_totals, codes['year_min'], codes['genre_names'],
+                                      genre_codes[bounds[i]:bounds[i + 1]], paid_prices[paid_bounds[i]:paid_bounds[i + 1]]))
+
+    years = np.flatnonzero(totals['years'].sum(axis=0))  # 任一切片有游戏的年份
+    yearly = pd.DataFrame({
+        'slice': np.repeat(labels, len(years)),
+        'release_year': np.tile(years + codes['year_min'], k),
+        'count': totals['years'][:, years].ravel(),
+    })
+    shares = totals['genres'] / np.maximum(counts, 1)[:, None] * 100  # 各类型占切片游戏数的百分比
+    genres = pd.DataFrame({
+        'slice': np.repeat(labels, n_genres),
+        'genre': np.tile(np.asarray(codes['genre_names'], dtype=object), k),
+        'count': totals['genres'].ravel(),
+        'share': shares.ravel(),
+    })
+    platforms = pd.DataFrame([
+        {'slice': label, 'platform': name, 'game_count': int(totals[col][i]),
+         'share': totals[col][i] / counts[i] * 100 if counts[i] else np.nan}
+        for i, label in enumerate(labels) for col, name in PLATFORM_NAMES.items()
+    ])
+    return {'labels': labels, 'metrics': metrics, 'yearly': yearly, 'genres': genres, 'platforms': platforms}
+
+
+def describe_filters(filters, df):
+    """
+    生成过滤条件的简短说明，作为固定切片的默认名称（如"Indie · 2016–2016 · Linux"）
+    与侧边栏默认值相同的条件（全部类型、全部平台、完整价格范围）不写入名称
+    """
+    parts = []
+    if filters.get('search_query', '').strip():
+        parts.append(f"\"{filters['search_query'].strip()}\"")
+    genres = filters.get('linked_genres') or filters.get('selected_genres') or []  # 联动选择的类型优先（范围更小）
+    if genres and len(genres) < df['main_genre'].nunique():
+        parts.append(', '.join(genres) if len(genres) <= 3 else f"{len(genres)} genres")
+    year_range = filters.get('linked_year_range') or filters['year_range']
+    parts.append(f"{year_range[0]}–{year_range[1]}")
+    if filters.get('platform_options') and len(set(filters['platform_options'])) < 3:
+        parts.append('/'.join(filters['platform_options']))
+    low, high = filters['price_range']
+    if low > 0 or high < df['price'].max():
+        parts.append(f"${low:g}–{high:g}")
+    return ' · '.join(parts)
+
+
+def pinned_slices():
+    """
+    返回当前会话固定的切片列表
+    """
+    return st.session_state.get(COMPARE_STATE_KEY, [])
+
+
+def _pin_slice(filters, label):
+    """
+    将当前过滤条件固定为一个对比切片（相同的过滤条件只固定一次）
+    """
+    slices = st.session_state.setdefault(COMPARE_STATE_KEY, [])
+    if all(pinned != filters for _, pinned in slices) and len(slices) < MAX_SLICES - 1:
+        slices.append((label, filters))
+
+
+def _unpin_slice(position):
+    """
+    移除一个固定的切片
+    """
+    st.session_state.get(COMPARE_STATE_KEY, []).pop(position)
+
+
+def build_comparison(df, filters, search_index=None, version=None):
+    """
+    以当前过滤条件为基准，与固定的切片一起计算对比结果（结果按数据版本和所有切片的过滤条件保存在内存预算中）
+    没有固定的切片时返回None
+    """
+    slices = pinned_slices()
+    if not slices:
+        return None
+    specs = [("Current filters", filters)] + [(f"{chr(ord('A') + i)} · {label}", pinned) for i, (label, pinned) in enumerate(slices)]  # 名称加字母前缀，保证各切片名称不同
+    key = ('compare', version, tuple((label, filters_cache_key(spec)) for label, spec in specs))
+    return memory_budget.get_or_compute('views', key, compare_slices, df, specs, search_index, version)
+
+
+def show_compare_controls(filters, df):
+    """
+    在侧边栏显示对比模式控件：把当前过滤条件固定为切片、移除已固定的切片
+    """
+    slices = pinned_slices()
+    with st.sidebar.expander(t("⚖️ Compare"), expanded=bool(slices)):
+        st.button(t("📌 Pin current filters"), key='compare_pin', on_click=_pin_slice, args=(dict(filters), describe_filters(filters, df)),
+                  disabled=len(slices) >= MAX_SLICES - 1, use_container_width=True)
+        for position, (label, _) in enumerate(slices):
+            st.button(f"✕ {label}", key=f'compare_unpin_{position}', on_click=_unpin_slice, args=(position,))
@@ -0,0 +1,118 @@
+import numpy as np  # 导入numpy用于计算提升度和PMI
+import pandas as pd  # 导入pandas用于整理标签对表
+import scipy.sparse as sp  # 导入scipy稀疏矩阵用于共现矩阵乘积
+import streamlit as st  # 导入streamlit用于缓存关联矩阵
+from utils.similarity import build_tag_matrix  # 从utils.similarity模块导入标签稀疏矩阵构建函数
+from utils.memory import memory_budget  # 从utils.memory模块导入共享内存预算
+
+COOCCURRENCE_FIELDS = {'Genres': 'genres', 'Tags': 'steamspy_tags'}  # 共现分析的标签字段：显示名称 -> 列名
+COOCCURRENCE_METRICS = {'Count': 'count', 'Lift': 'lift', 'PMI': 'pmi'}  # 热力图指标：显示名称 -> 结果键
+MIN_PAIR_GAMES = 5  # 参与提升度排名的标签对最少游戏数，避免极小样本的偶然共现排到前面
+FUSION_METRICS = ('positive_ratio', 'owners_median')  # 类型融合洞察中按标签对统计平均值的列
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)  # 关联矩阵每个数据版本只构建一次，并在会话之间共享
+def build_cooccurrence_index(_df, version):
+    """
+    为每个标签字段构建一次游戏×标签关联矩阵（CSR，0/1取值），过滤后的共现统计只需按行切片
+    缓存只按数据版本区分（_df不参与哈希，避免每次调用都对整个数据集求哈希）
+    返回索引字典
+    """
+    df = _df
+    matrices, names = {}, {}
+    for field in COOCCURRENCE_FIELDS.values():
+        codes, uniques = pd.factorize(df[field], use_na_sentinel=False)  # 只切分不重复的标签字符串（缺失值也作为一种取值）
+        unique_matrix, tag_names = build_tag_matrix(pd.Series(uniques, dtype=object))  # 不重复字符串×标签矩阵
+        matrices[field] = unique_matrix[codes].astype(np.int32)  # 按编码展开到每一行；整数取值，乘积即为共现游戏数
+        names[field] = tag_names
+    return {
+        'matrices': matrices,  # 字段 -> 游戏×标签CSR矩阵
+        'names': names,  # 字段 -> 标签名称数组
+        'index': df.index,  # 行位置对应的DataFrame索引标签
+        'values': {col: df[col].to_numpy(dtype=float) for col in FUSION_METRICS},  # 标签对统计用的数值列
+    }
+
+
+def selection_rows(index, selected):
+    """
+    将过滤后的DataFrame转换为关联矩阵的行位置（selected为None时返回None，即全部行）
+    """
+    return None if selected is None else index['index'].get_indexer(selected.index)
+
+
+def compute_cooccurrence(index, field, rows=None, weights=FUSION_METRICS):
+    """
+    对选中的行计算标签×标签共现矩阵、提升度和PMI：先按行切片关联矩阵X，再做一次稀疏乘积XᵀX
+    提升度 = 共现数 × 游戏数 / (标签a游戏数 × 标签b游戏数)，PMI = log(提升度)；weights中的列再各做一次加权乘积，得到每个标签对的平均值
+    返回{'names', 'n_games', 'tag_counts', 'count'（稀疏共现矩阵）, 'sums'（列 -> 稀疏加权和矩阵）}
+    """
+    matrix = index['matrices'][field]
+    x = matrix if rows is None else matrix[rows]  # 按行切片得到当前选择的关联矩阵
+    xt = x.T.tocsr()
+    count = (xt @ x).tocsr()  # 标签×标签共现游戏数（对角线为每个标签的游戏数）
+    sums = {}
+    for col in weights:  # Xᵀ·diag(w)·X：每个标签对的列合计
+        values = index['values'][col] if rows is None else index['values'][col][rows]
+        sums[col] = (xt @ sp.diags(np.nan_to_num(values)) @ x).tocsr()
+    return {
+        'names': index['names'][field],
+        'n_games': x.shape[0],
+        'tag_counts': count.diagonal(),
+        'count': count,
+        'sums': sums,
+    }
+
+
+def view_cooccurrence(index, selected, field, view_key):
+    """
+    返回当前视图的共现结果，按视图（数据版本和过滤条件）与字段保存在内存预算中
+    """
+    return memory_budget.get_or_compute('views', ('cooccurrence', view_key, field), compute_cooccurrence,
+                                        index, field, selection_rows(index, selected))
+
+
+def pair_table(result, min_games=MIN_PAIR_GAMES):
+    """
+    将共现矩阵的上三角（每个标签对一次）整理为标签对表：共现数、支持度、提升度、PMI和标准化PMI，以及各加权列的平均值
+    返回按提升度降序排列的DataFrame（只包含共现游戏数不少于min_games的标签对）
+    """
+    upper = sp.triu(result['count'], k=1).tocoo()  # 不含对角线的上三角
+    keep = upper.data >= min_games
+    a, b, pair_count = upper.row[keep], upper.col[keep], upper.data[keep].astype(float)
+    n, tag_counts = max(result['n_games'], 1), result['tag_counts'].astype(float)
+    lift = pair_count * n / (tag_counts[a] * tag_counts[b])  # 实际共现数 / 独立时的期望共现数
+    pmi = np.log(lift)
+    with np.errstate(divide='ignore', invalid='ignore'):  # 标签对出现在所有游戏中时标准化PMI无定义（NaN）
+        npmi = pmi / -np.log(pair_count / n)  # 标准化PMI（-1到1，1表示两个标签总是同时出现）
+    table = pd.DataFrame({
+        'tag_a': result['names'][a],
+        'tag_b': result['names'][b],
+        'games': pair_count.astype(np.int64),  # 同时带有两个标签的游戏数
+        'support': pair_count / n,  # 占当前选择的比例
+        'lift': lift,
+        'pmi': pmi,
+        'npmi': npmi,
+    })
+    for col, sums in result['sums'].items():  # 每个标签对的平均值
+        table[f'avg_{col}'] = np.asarray(sums[a, b]).ravel() / pair_count
+    return table.sort_values(['lift', 'games'], ascending=False).reset_index(drop=True)
+
+
+def heatmap_frame(result, metric='lift', top_n=20):
+    """
+    取游戏数最多的top_n个标签，返回指标的标签×标签稠密矩阵（提升度和PMI的对角线及没有共现的格子为NaN）
+    """
+    top = np.argsort(-result['tag_counts'], kind='stable')[:top_n]  # 游戏数最多的标签
+    top = top[result['tag_counts'][top] > 0]
+    count = result['count'][top][:, top].toarray().astype(float)  # 只取出这些标签的子矩阵
+    if metric != 'count':
+        n, tag_counts = max(result['n_games'], 1), result['tag_counts'][top].astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = count * n / np.outer(tag_counts, tag_counts)  # 提升度
+            if metric == 'pmi':
+                values = np.log(values)
+        values[count == 0] = np.nan  # 没有共现的标签对
+        np.fill_diagonal(values, np.nan)  # 标签与自身的共现没有意义
+        count = values
+    names = result['names'][top]
+    return pd.DataFrame(count, index=names, columns=names)
@@ -0,0 +1,132 @@
+import numpy as np  # 导入numpy用于排序索引和分页
+import pandas as pd  # 导入pandas用于文本列处理
+import streamlit as st  # 导入streamlit用于显示数据浏览器和缓存索引
+from utils.memory import memory_budget  # 从utils.memory模块导入共享内存预算
+from utils.export import frame_batches, export_bytes  # 从utils.export模块导入分块导出函数
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+
+EXPLORER_COLUMNS = ['name', 'release_year', 'main_genre', 'developer', 'publisher', 'price',
+                    'positive_ratio', 'total_ratings', 'owners_median', 'average_playtime']  # 数据浏览器显示的列（均可排序和过滤）
+PAGE_SIZES = [25, 50, 100, 250]  # 每页行数选项
+
+
+@st.cache_resource(show_spinner=False)  # 排序索引每个数据版本只构建一次，并在会话之间共享
+def build_explorer_index(df):
+    """
+    为数据浏览器的每个列预先计算升序、降序两个排序索引（稳定排序，缺失值排在最后）和文本列的小写副本
+    排序、过滤和分页都在行位置上完成，只有当前页的行会被取出
+    返回包含数据、排序索引和文本列的索引字典
+    """
+    index = {'df': df, 'ascending': {}, 'descending': {}, 'sorted_values': {}, 'valid': {}, 'text': {}}
+    for col in EXPLORER_COLUMNS:
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values):  # 数值列：缺失值由argsort排在最后
+            keys = values.to_numpy(dtype=float)
+            descending_keys = -keys
+        else:  # 文本列：按排序后的编码排序，缺失值（编码-1）放到最后
+            codes, uniques = pd.factorize(values, sort=True)
+            keys = np.where(codes < 0, len(uniques), codes)
+            descending_keys = np.where(codes < 0, len(uniques), len(uniques) - 1 - codes)
+            index['text'][col] = values.fillna('').astype(str).str.lower().to_numpy(dtype=object)  # 文本过滤时不区分大小写
+        order = np.argsort(keys, kind='stable')
+        index['ascending'][col] = order
+        index['descending'][col] = np.argsort(descending_keys, kind='stable')  # 降序也用稳定排序，相同值保持原有顺序（与sort_values一致）
+        if col not in index['text']:
+            index['sorted_values'][col] = keys[order]  # 数值范围过滤时二分查找
+            index['valid'][col] = int((~np.isnan(keys)).sum())  # 非缺失值的个数
+    return index
+
+
+def sort_order(index, col, ascending=True):
+    """
+    返回按col排序的所有行位置
+    """
+    return index['ascending' if ascending else 'descending'][col]
+
+
+def column_filter_mask(index, column_filters):
+    """
+    计算列过滤条件的行掩码：数值列为(最小值, 最大值)范围（通过排序索引查找），文本列为不区分大小写的包含匹配
+    返回布尔数组，没有过滤条件时返回None
+    """
+    mask = None
+    for col, value in column_filters.items():
+        if value in (None, ''):  # 未设置的过滤条件
+            continue
+        if col in index['text']:  # 文本：包含匹配
+            col_mask = pd.Series(index['text'][col]).str.contains(str(value).lower(), regex=False).to_numpy()
+        else:  # 数值：排序索引中连续的一段
+            values = index['sorted_values'][col]
+            lo = np.searchsorted(values, value[0], side='left')
+            hi = np.searchsorted(values, value[1], side='right')
+            col_mask = np.zeros(len(values), dtype=bool)
+            col_mask[index['ascending'][col][lo:hi]] = True
+        mask = col_mask if mask is None else mask & col_mask
+    return mask
+
+
+def selection_positions(index, selected, sort_col, ascending=True, column_filters=None):
+    """
+    返回当前选择中满足列过滤条件的行位置，按sort_col排序
+    selected为已过滤的DataFrame（其索引是完整数据的行标签）
+    """
+    df = index['df']
+    mask = np.zeros(len(df), dtype=bool)
+    mask[df.index.get_indexer(selected.index)] = True  # 当前选择的行
+    extra = column_filter_mask(index, column_filters or {})
+    if extra is not None:
+        mask &= extra
+    order = sort_order(index, sort_col, ascending)
+    return order[mask[order]]  # 保持排序顺序，只保留选中的行
+
+
+def page_frame(index, positions, page, page_size):
+    """
+    取出第page页（从1开始）的行
+    """
+    start = (page - 1) * page_size
+    return index['df'].iloc[positions[start:start + page_size]][EXPLORER_COLUMNS]
+
+
+def show_data_explorer(selected, index, view_key):
+    """
+    显示数据浏览器：对当前过滤结果进行服务端排序、按列过滤和分页，只把当前页发送到浏览器，并可导出整个选择
+    排序后的行位置按view_key（当前过滤条件）、排序和列过滤条件保存在内存预算中，翻页时只取出新的一页
+    """
+    st.subheader(t("📄 Data Explorer"))
+    col1, col2, col3 = st.columns([2, 1, 1])
+    sort_col = col1.selectbox(t("Sort by"), EXPLORER_COLUMNS, index=EXPLORER_COLUMNS.index('owners_median'), key='explorer_sort')  # 排序列
+    ascending = col2.radio(t("Order"), [t("Descending"), t("Ascending")], horizontal=True, key='explorer_order') == t("Ascending")  # 排序方向
+    page_size = col3.selectbox(t("Rows per page"), PAGE_SIZES, key='explorer_page_size')  # 每页行数
+
+    column_filters = {}  # 列 -> 过滤条件
+    with st.expander(t("Column filters")):
+        for col in st.multiselect(t("Filter columns"), EXPLORER_COLUMNS, key='explorer_filter_columns'):
+            if col in index['text']:  # 文本列：包含匹配
+                column_filters[col] = st.text_input(t("{column} contains", column=col), key=f'explorer_filter_{col}')
+            else:  # 数值列：范围滑块（范围为完整数据的取值范围）
+                values = index['sorted_values'][col][:index['valid'][col]]
+                low, high = (float(values[0]), float(values[-1])) if len(values) else (0.0, 0.0)
+                if low < high:
+                    column_filters[col] = st.slider(t("{column} range", column=col), low, high, (low, high), key=f'explorer_filter_{col}')
+
+    positions_key = ('explorer', view_key, sort_col, ascending, tuple(sorted(column_filters.items())))
+    positions = memory_budget.get_or_compute('views', positions_key, selection_positions,  # 排序后的选中行位置
+                                             index, selected, sort_col, ascending, column_filters)
+    n_pages = max(1, -(-len(positions) // page_size))  # 总页数
+    if st.session_state.get('explorer_page', 1) > n_pages:  # 过滤后页数变少时回到最后一页
+        st.session_state['explorer_page'] = n_pages
+    page = st.number_input(t("Page (of {count:,})", count=n_pages), min_value=1, max_value=n_pages, step=1, key='explorer_page')
+    start = (page - 1) * page_size
+    st.dataframe(page_frame(index, positions, page, page_size), use_container_width=True, hide_index=True)  # 只发送当前页
+    st.caption(t("Rows {first:,}–{last:,} of {total:,}", first=min(start + 1, len(positions)),
+                 last=min(start + page_size, len(positions)), total=len(positions)))
+
+    st.download_button(
+        t("⬇️ Download selection (CSV)"),
+        data=lambda: export_bytes(frame_batches(index['df'], positions, EXPLORER_COLUMNS), 'csv'),  # 点击时才按块生成
+        file_name='steam_games_selection.csv',
+        mime='text/csv',
+        on_click='ignore',
+        key='explorer_download'
+    )
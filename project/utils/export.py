@@ -0,0 +1,224 @@
+import argparse  # 导入argparse用于命令行导出
+import math  # 导入math用于不限范围的默认值
+import os  # 导入os用于判断输出格式
+import sys  # 导入sys用于写入标准输出
+
+import numpy as np  # 导入numpy用于按位置分块
+import pandas as pd  # 导入pandas用于数据处理
+import pyarrow as pa  # 导入pyarrow用于转换Arrow表
+import pyarrow.parquet as pq  # 导入pyarrow.parquet用于分块写入Parquet
+import streamlit as st  # 导入streamlit用于显示导出面板
+from utils.backend import STREAM_BATCH_ROWS, PandasBackend, create_backend, compute_aggregates  # 从utils.backend模块导入查询后端和聚合表
+from utils.prep import filter_mask  # 从utils.prep模块导入过滤掩码函数
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+
+EXPORT_FORMATS = {  # 导出格式 -> (MIME类型, 文件扩展名)
+    'csv': ('text/csv', '.csv'),
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+    'jsonl': ('application/x-ndjson', '.jsonl'),
+}
+AGGREGATE_TABLES = ['yearly_releases', 'monthly_releases', 'genre_distribution', 'top_publishers',  # compute_aggregates返回的表名
+                    'platform_support', 'free_vs_paid', 'platform_combinations', 'multi_platform']
+
+
+def frame_batches(df, positions=None, columns=None, batch_rows=STREAM_BATCH_ROWS):
+    """
+    按位置分块取出行（positions为None时取全部行），每次只复制一块
+    没有行时返回一个只有列名的空块，保证导出文件仍有表头和结构
+    返回DataFrame批次的生成器
+    """
+    positions = np.arange(len(df)) if positions is None else np.asarray(positions)
+    columns = list(columns) if columns else list(df.columns)
+    for start in range(0, max(len(positions), 1), batch_rows):
+        yield df.iloc[positions[start:start + batch_rows]][columns]
+
+
+def selection_batches(df, filters, search_index=None, columns=None, batch_rows=STREAM_BATCH_ROWS):
+    """
+    分块返回apply_filters的选择（只计算掩码，不构建完整的过滤结果）
+    """
+    positions = np.flatnonzero(filter_mask(df, filters, search_index)) if filters else None  # 选中行的位置
+    return frame_batches(df, positions, columns, batch_rows)
+
+
+class _ChunkSink:
+    """
+    可写的文件对象：收集ParquetWriter写出的字节，每写完一个行组取出一次，内存中不保留已输出的部分
+    """
+
+    def __init__(self):
+        self.parts = []  # 尚未取出的字节块
+        self.position = 0  # 已写入的总字节数
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self):
+        return True
+
+    def drain(self):
+        """
+        取出并清空已写入的字节
+        """
+        data, self.parts = b''.join(self.parts), []
+        return data
+
+
+def export_chunks(batches, fmt):
+    """
+    将DataFrame批次逐块编码为导出格式（csv、parquet、jsonl），每块编码后立即返回，内存只与批次大小有关
+    返回bytes的生成器
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == 'parquet':  # Parquet：每批写为一个行组，写完即取出
+        sink, writer = _ChunkSink(), None
+        for batch in batches:
+            if writer is None:  # 以第一批的结构作为文件结构
+                table = pa.Table.from_pandas(batch, preserve_index=False)
+                writer = pq.ParquetWriter(sink, table.schema, compression='zstd')
+            else:
+                table = pa.Table.from_pandas(batch, schema=writer.schema, preserve_index=False)
+            if table.num_rows:
+                writer.write_table(table)
+            yield sink.drain()
+        if writer is not None:
+            writer.close()  # 写入文件尾（元数据）
+        yield sink.drain()
+        return
+    header = True  # CSV只在第一块写表头
+    for batch in batches:
+        if fmt == 'csv':
+            yield batch.to_csv(index=False, header=header).encode('utf-8')
+            header = False
+        elif len(batch):  # JSON Lines：每行一个JSON对象
+            yield batch.to_json(orient='records', lines=True, date_format='iso', force_ascii=False).encode('utf-8')
+
+
+def export_bytes(batches, fmt):
+    """
+    编码为完整的导出文件内容（用于下载按钮；编码仍按块进行）
+    """
+    return b''.join(export_chunks(batches, fmt))
+
+
+def write_export(batches, fmt, output):
+    """
+    将批次逐块写入文件（output为路径或可写的二进制文件对象）
+    返回写入的字节数
+    """
+    handle = open(output, 'wb') if isinstance(output, (str, os.PathLike)) else output
+    written = 0
+    try:
+        for chunk in export_chunks(batches, fmt):
+            handle.write(chunk)
+            written += len(chunk)
+    finally:
+        if handle is not output:
+            handle.close()
+    return written
+
+
+def show_export_panel(filtered_df):
+    """
+    在侧边栏显示导出面板：下载当前过滤结果或任一标签页的聚合表（CSV、Parquet或JSON Lines）
+    文件在点击下载时才按块生成
+    """
+    with st.sidebar.expander(t("⬇️ Export")):
+        fmt = st.selectbox(t("Format"), list(EXPORT_FORMATS), format_func=str.upper, key='export_format')  # 导出格式
+        mime, extension = EXPORT_FORMATS[fmt]
+        st.download_button(
+            t("Filtered games"),
+            data=lambda: export_bytes(frame_batches(filtered_df), fmt),  # 点击时才按块编码
+            file_name=f'steam_games_filtered{extension}',
+            mime=mime,
+            on_click='ignore',
+            key='export_selection'
+        )
+        table = st.selectbox(t("Aggregate table"), AGGREGATE_TABLES, key='export_table')  # 各标签页图表背后的聚合表
+        st.download_button(
+            t("Download table"),
+            data=lambda: export_bytes(frame_batches(compute_aggregates(PandasBackend(filtered_df))[table]), fmt),
+            file_name=f'steam_{table}{extension}',
+            mime=mime,
+            on_click='ignore',
+            key='export_aggregate'
+        )
+
+
+def _cli_filters(args):
+    """
+    将命令行参数转换为与create_sidebar_filters相同结构的过滤条件字典；未指定任何过滤条件时返回None
+    """
+    if not (args.year or args.price or args.genres or args.platforms or args.search):
+        return None
+    return {
+        'year_range': tuple(args.year) if args.year else (0, 9999),  # 年份范围
+        'price_range': tuple(args.price) if args.price else (0.0, math.inf),  # 价格范围
+        'selected_genres': args.genres or [],  # 类型
+        'platform_options': args.platforms or [],  # 平台
+        'search_query': args.search or '',  # 搜索关键词
+    }
+
+
+def main():
+    """
+    命令行入口：python -m utils.export OUTPUT [--csv steam.csv | --parquet steam.parquet] [过滤条件] [--table NAME]
+    逐批读取、编码并写出，内存只与批次大小有关（Parquet输入经DuckDB流式读取，不把数据集加载到内存）
+    """
+    parser = argparse.ArgumentParser(description="Export the filtered selection or an aggregate table as CSV, Parquet or JSON Lines")
+    parser.add_argument('output', help="Output file, or - for standard output")
+    parser.add_argument('--format', choices=list(EXPORT_FORMATS), help="Export format (default: from the output extension, else csv)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--csv', help="Raw Steam CSV (default: STEAM_CSV or the dashboard's data path)")
+    source.add_argument('--parquet', help="Parquet file written by write_columnar_file, streamed through DuckDB")
+    parser.add_argument('--year', nargs=2, type=int, metavar=('MIN', 'MAX'))
+    parser.add_argument('--price', nargs=2, type=float, metavar=('MIN', 'MAX'))
+    parser.add_argument('--genres', nargs='*')
+    parser.add_argument('--platforms', nargs='*', choices=['Windows', 'Mac', 'Linux'])
+    parser.add_argument('--search', help="Name, developer or publisher (CSV source only)")
+    parser.add_argument('--columns', nargs='*', help="Columns to export (default: all)")
+    parser.add_argument('--table', choices=AGGREGATE_TABLES, help="Export this aggregate table instead of the games")
+    parser.add_argument('--batch-rows', type=int, default=STREAM_BATCH_ROWS)
+    args = parser.parse_args()
+
+    fmt = args.format or next((name for name, (_, extension) in EXPORT_FORMATS.items() if args.output.endswith(extension)), 'csv')
+    filters = _cli_filters(args)
+    if args.parquet:  # SQL后端：过滤下推到DuckDB，以Arrow批次流式读取
+        if args.search:
+            parser.error("--search needs a CSV source")
+        backend = create_backend('duckdb', args.parquet)
+        if args.table:
+            batches = frame_batches(compute_aggregates(backend, filters)[args.table])
+        else:
+            batches = backend.fetch_batches(filters, args.columns, batch_rows=args.batch_rows)
+    else:  # pandas后端：读取CSV并与应用使用相同的预处理和过滤
+        from utils.io import DATA_PATH, preprocess_data
+        from utils.search import build_search_index
+        df = preprocess_data(pd.read_csv(args.csv or DATA_PATH))
+        search_index = build_search_index(df) if args.search else None
+        if args.table:
+            selection = df[filter_mask(df, filters, search_index)] if filters else df
+            batches = frame_batches(compute_aggregates(PandasBackend(selection))[args.table])
+        else:
+            batches = selection_batches(df, filters, search_index, args.columns, args.batch_rows)
+    written = write_export(batches, fmt, sys.stdout.buffer if args.output == '-' else args.output)
+    if args.output != '-':
+        print(f"{args.output}: {written:,} bytes ({fmt})")
+
+
+if __name__ == "__main__":
+    main()
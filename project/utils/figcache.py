@@ -0,0 +1,222 @@
+import base64  # 导入base64用于二进制数组编码
+import json  # 导入json用于序列化图表
+import re  # 导入re用于改写悬停模板
+import time  # 导入time用于记录构建耗时
+from collections.abc import Mapping  # 导入Mapping用于实现按需构建的图表字典
+
+import numpy as np  # 导入numpy用于数组类型转换
+import plotly.graph_objects as go  # 导入plotly.graph_objects用于还原图表对象
+import plotly.io as pio  # 导入plotly.io用于从JSON还原图表
+from plotly.utils import PlotlyJSONEncoder  # 导入plotly的JSON编码器处理剩余的numpy对象
+from utils.memory import memory_budget  # 导入共享内存预算
+from utils.singleflight import single_flight, FlightTimeout  # 导入单飞去重函数，多个会话同时未命中时只构建一次
+
+MIN_ARRAY_LENGTH = 16  # 长度不小于此值的数值列表才编码为二进制数组
+FLOAT32_RTOL = 1e-6  # 转为float32时允许的最大相对误差（展示精度约6位有效数字）
+INT_DTYPES = [('i1', np.int8), ('u1', np.uint8), ('i2', np.int16), ('u2', np.uint16), ('i4', np.int32), ('u4', np.uint32)]  # plotly.js支持的整数类型（从小到大）
+TYPED_DTYPES = {'i1': np.int8, 'u1': np.uint8, 'i2': np.int16, 'u2': np.uint16, 'i4': np.int32, 'u4': np.uint32, 'f4': np.float32, 'f8': np.float64}  # 类型代码到numpy类型的映射
+CUSTOMDATA_FIELD = re.compile(r'%\{customdata\[(\d+)\](:[^}]*)?\}')  # 悬停模板中的customdata引用
+
+
+def _decode_typed_array(spec):
+    """
+    将plotly.js二进制数组描述还原为numpy数组
+    """
+    values = np.frombuffer(base64.b64decode(spec['bdata']), dtype=TYPED_DTYPES[spec['dtype']])
+    if 'shape' in spec:  # 二维数组
+        values = values.reshape([int(n) for n in str(spec['shape']).split(',')])
+    return values
+
+
+def _as_numeric_array(value):
+    """
+    将二进制数组描述、数值numpy数组或较长的数值列表转为numpy数组
+    不是数值数组时返回None
+    """
+    if isinstance(value, dict) and 'bdata' in value and value.get('dtype') in TYPED_DTYPES:
+        return _decode_typed_array(value)
+    if isinstance(value, np.ndarray) and value.dtype.kind in 'iuf' and value.size > 0:
+        return value
+    if (isinstance(value, (list, tuple)) and len(value) >= MIN_ARRAY_LENGTH
+            and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value)):
+        return np.asarray(value, dtype=float)
+    return None
+
+
+def encode_typed_array(values):
+    """
+    将数值数组编码为最紧凑的plotly.js二进制数组（base64）
+    整数（含整数值的浮点数）选用能容纳取值范围的最小整数类型；浮点数在误差允许时降为float32
+    返回二进制数组描述字典；含NaN的浮点数组保持float类型
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == 'f' and np.isfinite(values).all() and (values == np.round(values)).all():  # 整数值的浮点数
+        values = values.astype(np.int64)
+    if values.dtype.kind in 'iu':  # 整数：选择最小的类型
+        low, high = values.min(), values.max()
+        for code, dtype in INT_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                values = values.astype(dtype)
+                break
+        else:  # 超出32位整数范围
+            values, code = values.astype(np.float64), 'f8'
+    else:  # 浮点数：精度足够时使用float32
+        values = values.astype(np.float64)
+        single = values.astype(np.float32)
+        close = np.allclose(single, values, rtol=FLOAT32_RTOL, atol=0, equal_nan=True)
+        values, code = (single, 'f4') if close else (values, 'f8')
+    spec = {'dtype': code, 'bdata': base64.b64encode(np.ascontiguousarray(values).tobytes()).decode('ascii')}
+    if values.ndim > 1:  # 二维数组记录形状
+        spec['shape'] = ','.join(str(n) for n in values.shape)
+    return spec
+
+
+def _compact_customdata(trace):
+    """
+    去重悬停信息：整条轨迹取值相同的customdata列直接写入悬停模板，
+    唯一的文本列移到hovertext（一维数组），其余数值列编码为二进制数组
+    """
+    customdata = trace.get('customdata')
+    template = trace.get('hovertemplate')
+    if customdata is None or not isinstance(template, str):
+        return
+    numeric = _as_numeric_array(customdata)  # 纯数值customdata
+    table = numeric if numeric is not None else np.asarray(customdata, dtype=object)
+    if table.ndim != 2 or len(table) == 0:  # 只处理 点数×列数 的二维customdata
+        return
+
+    columns = {}  # 原列号 -> 新位置（或替换内容）
+    numeric_columns, text_columns = [], []  # 保留的数值列和文本列
+    for j in range(table.shape[1]):
+        column = table[:, j]
+        if np.all(column == column[0]):  # 整列相同：写入模板
+            columns[j] = ('literal', column[0])
+        elif numeric is not None or all(isinstance(v, (int, float, np.number)) and not isinstance(v, bool) for v in column):
+            columns[j] = ('numeric', len(numeric_columns))
+            numeric_columns.append(column.astype(float))
+        else:
+            text_columns.append(j)
+    if len(text_columns) > 1 or ('hovertext' in trace and text_columns):  # 多个文本列时保持原样
+        return
+    for j in text_columns:  # 唯一的文本列放到hovertext
+        columns[j] = ('text', None)
+        trace['hovertext'] = [str(v) for v in table[:, j]]
+
+    def replace(match):
+        kind, value = columns[int(match.group(1))]
+        if kind == 'literal':  # 常量直接写入模板（格式说明符对常量不适用）
+            return str(value)
+        if kind == 'text':
+            return '%{hovertext}'
+        return f"%{{customdata[{value}]{match.group(2) or ''}}}"
+
+    trace['hovertemplate'] = CUSTOMDATA_FIELD.sub(replace, template)  # 改写模板中的列引用
+    if numeric_columns:  # 剩余的数值列
+        trace['customdata'] = encode_typed_array(np.column_stack(numeric_columns))
+    else:
+        trace.pop('customdata')
+
+
+def _compact_value(value):
+    """
+    递归地将轨迹属性中的数值数组编码为紧凑的二进制数组
+    """
+    array = _as_numeric_array(value)
+    if array is not None:
+        return encode_typed_array(array)
+    if isinstance(value, dict):
+        return {key: _compact_value(item) for key, item in value.items()}
+    if isinstance(value, list) and value and isinstance(value[0], dict):  # 如注释、形状列表
+        return [_compact_value(item) for item in value]
+    return value
+
+
+def _is_repeated_text(value):
+    """
+    判断是否为所有元素相同的文本数组
+    """
+    return (isinstance(value, (list, tuple, np.ndarray)) and len(value) > 1 and isinstance(value[0], str)
+            and all(v == value[0] for v in value[1:]))
+
+
+def encode_figure(fig):
+    """
+    将图表序列化为紧凑JSON：数值列使用最小类型的base64二进制数组，悬停文本去重
+    返回JSON字符串
+    """
+    spec = fig.to_plotly_json()  # 图表的字典表示（plotly会把numpy数组转为二进制数组描述）
+    for trace in spec.get('data', []):
+        _compact_customdata(trace)  # 悬停信息去重
+        for key in list(trace):
+            if key in ('text', 'hovertext') and _is_repeated_text(trace[key]):  # 完全重复的悬停文本合并为单个值
+                trace[key] = trace[key][0]
+            elif key not in ('hovertemplate', 'type', 'name'):
+                trace[key] = _compact_value(trace[key])  # 数值数组紧凑编码
+    return json.dumps(spec, cls=PlotlyJSONEncoder, separators=(',', ':'), ensure_ascii=False)
+
+
+def decode_figure(spec):
+    """
+    将encode_figure生成的JSON还原为图表对象（每次返回新对象，会话之间互不影响）
+    """
+    return pio.from_json(spec)
+
+
+def _build_entry(key, builder, *args):
+    """
+    构建并编码图表，存入内存预算
+    返回{图表名: (类型, 图表JSON或其他值)}
+    """
+    start = time.perf_counter()  # 记录构建耗时作为淘汰代价
+    result = builder(*args)
+    items = result if isinstance(result, dict) else {None: result}  # 单个图表或单个值
+    entry = {name: ('figure', encode_figure(value)) if isinstance(value, go.Figure) else ('value', value)
+             for name, value in items.items()}
+    return memory_budget.put('figures', key, entry, cost=time.perf_counter() - start)
+
+
+def cached_figures(key, builder, *args):
+    """
+    按键缓存构建函数生成的图表：图表以紧凑JSON形式保存在进程内共享的内存预算中（按成本感知LRU淘汰），所有会话共用
+    builder返回图表字典（非图表值原样缓存）、单个图表或单个值；key应包含数据版本和过滤条件
+    返回与builder相同结构的结果，其中图表为从缓存JSON还原的新对象
+    """
+    entry = memory_budget.get('figures', key)  # {图表名: (类型, 图表JSON或其他值)}
+    if entry is None:  # 未命中：构建并编码（多个会话同时未命中时只构建一次）
+        try:
+            entry = single_flight(('figures', key), _build_entry, key, builder, *args)
+        except FlightTimeout:  # 等待其他会话超时，改为在本会话中构建
+            entry = _build_entry(key, builder, *args)
+    figures = {name: decode_figure(value) if kind == 'figure' else value for name, (kind, value) in entry.items()}
+    return figures[None] if None in figures else figures
+
+
+class LazyFigures(Mapping):
+    """
+    按需构建的图表字典：只有被访问的图表才会构建（或从缓存还原），每个图表按(key, 图表名)单独缓存
+    侧边栏变化后，只重新构建当前标签页用到的图表
+    overrides为 图表名 -> (缓存键, 构建函数, 参数元组)，用于数据来源不同的图表（如联动图表）
+    """
+
+    def __init__(self, key, builders, *args, overrides=None):
+        self.key = key  # 缓存键前缀（包含数据版本和过滤条件）
+        self.builders = builders  # 图表名 -> 构建函数
+        self.args = args  # 构建函数的参数
+        self.overrides = overrides or {}  # 单独指定缓存键和参数的图表
+        self._loaded = {}  # 本次运行中已还原的图表
+
+    def __getitem__(self, name):
+        if name not in self._loaded:
+            if name in self.overrides:
+                key, builder, args = self.overrides[name]
+            else:
+                key, builder, args = tuple(self.key) + (name,), self.builders[name], self.args
+            self._loaded[name] = cached_figures(key, builder, *args)
+        return self._loaded[name]
+
+    def __iter__(self):
+        return iter(self.builders)
+
+    def __len__(self):
+        return len(self.builders)
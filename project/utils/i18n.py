@@ -0,0 +1,529 @@
+import streamlit as st  # 导入streamlit用于在会话状态中保存界面语言
+
+DEFAULT_LOCALE = 'en'  # 默认界面语言（app.py）
+TRANSLATIONS = {  # 界面文本翻译表：语言 -> {英文原文: 译文}，未收录的文本保持英文
+    'zh': {
+        # 页面框架
+        "Steam Game Data Analysis Platform": "Steam游戏数据分析平台",
+        "🎮 Steam Game Data Analysis Platform": "🎮 Steam游戏数据分析平台",
+        "🚀 Loading data and generating visualizations...": "🚀 正在加载数据并生成图表...",
+        "*Steam Game Data Analysis Platform: Interactive analysis tool based on real Steam data*": "*Steam游戏数据分析平台：基于真实Steam数据的交互式分析工具*",
+        "*Data Source: Steam Game Database*": "*数据来源：Steam游戏数据库*",
+        "*Analysis Tools: Python + Streamlit*": "*分析工具：Python + Streamlit*",
+        # 标签页
+        "📋 Dataset Overview": "📋 数据集概览",
+        "📈 Time Trend Analysis": "📈 时间趋势分析",
+        "📅 Monthly Release Analysis": "📅 月度发布分析",
+        "💰 Price vs Sales Analysis": "💰 价格销量分析",
+        "⏱️ Rating & Engagement Analysis": "⏱️ 评价参与度分析",
+        "🎮 Game Genre Analysis": "🎮 游戏类型分析",
+        "🏢 Publisher Analysis": "🏢 开发商分析",
+        "💻 Platform Support Analysis": "💻 平台支持分析",
+        "🆓 Free vs Paid Analysis": "🆓 免费付费分析",
+        "📊 Multi-dimensional Analysis": "📊 多维度分析",
+        "✅ Data Quality Report": "✅ 数据质量报告",
+        "💡 Business Insights": "💡 业务洞察",
+        "🔗 Similar Games": "🔗 相似游戏",
+        "⚖️ Compare Slices": "⚖️ 切片对比",
+        "🧩 Tag Co-occurrence": "🧩 标签共现",
+        # 侧边栏过滤器
+        "🔧 Data Filters": "🔧 数据过滤器",
+        "🔍 Search Games": "🔍 搜索游戏",
+        "Name, developer or publisher": "游戏名、开发商或发行商",
+        "Select Release Year Range": "选择发布年份范围",
+        "Select Price Range (USD)": "选择价格范围 (美元)",
+        "Select Game Genres": "选择游戏类型",
+        "Select Supported Platforms": "选择支持平台",
+        "**🔗 Linked Selection**": "**🔗 图表联动选择**",
+        "⬇️ Export": "⬇️ 导出",
+        "Format": "格式",
+        "Filtered games": "过滤后的游戏",
+        "Aggregate table": "聚合表",
+        "Download table": "下载聚合表",
+        "⚖️ Compare": "⚖️ 对比",
+        "📌 Pin current filters": "📌 固定当前过滤条件",
+        # 各标签页标题
+        "📈 Game Release Trend Analysis": "📈 游戏发布趋势分析",
+        "📅 Monthly Game Release Trend Analysis": "📅 游戏发布月度趋势分析",
+        "⏱️ Game Rating & Player Engagement Analysis": "⏱️ 游戏评价与玩家参与度分析",
+        "🎮 Game Genre Market Analysis": "🎮 游戏类型市场分析",
+        "🏢 Game Developer & Publisher Analysis": "🏢 游戏开发商与发行商分析",
+        "💻 Cross-platform Support Analysis": "💻 跨平台支持分析",
+        "🆓 Free vs Paid Games Business Model Analysis": "🆓 免费 vs 付费游戏商业模式分析",
+        "📊 Multi-dimensional Comparative Analysis": "📊 多维度对比分析",
+        "📊 Data Quality Report": "📊 数据质量报告",
+        "💡 Business Insights & Strategic Recommendations": "💡 业务洞察与策略建议",
+        "⚖️ Filter Slice Comparison": "⚖️ 过滤切片对比",
+        "🔗 Similar Games Finder": "🔗 相似游戏查找",
+        "🧩 Genre & Tag Co-occurrence": "🧩 类型与标签共现分析",
+        # 数据集概览和数据质量
+        "Total Games": "游戏总数",
+        "Free Games Percentage": "免费游戏比例",
+        "Average Positive Rating": "平均好评率",
+        "Data Time Range": "数据时间范围",
+        "ℹ️ Dataset Basic Information": "ℹ️ 数据集基本信息",
+        "- **Total Records**: {count:,}": "- **总记录数**: {count:,}",
+        "- **Number of Columns**: {count}": "- **数据列数**: {count}",
+        "- **Number of Game Genres**: {count}": "- **游戏类型数量**: {count}",
+        "- **Windows Games**: {count:,}": "- **Windows游戏**: {count:,}",
+        "- **Mac Games**: {count:,}": "- **Mac游戏**: {count:,}",
+        "- **Linux Games**: {count:,}": "- **Linux游戏**: {count:,}",
+        "🧠 Cache Memory Diagnostics": "🧠 缓存内存诊断",
+        "Memory Used": "已用内存",
+        "Memory Budget": "内存预算",
+        "Evictions": "淘汰次数",
+        "Datasets and indexes are counted but never evicted; filtered views, figures and API responses are evicted least-recently-used first, keeping results that are expensive to recompute per byte for longer. Set STEAM_MEMORY_BUDGET_MB to change the budget.": "数据集和索引计入用量但不会被淘汰；过滤视图、图表和API响应按最近最少使用的顺序淘汰，每字节重新计算代价高的结果保留更久。设置STEAM_MEMORY_BUDGET_MB可调整预算。",
+        # 数据浏览器
+        "📄 Data Explorer": "📄 数据浏览器",
+        "Sort by": "排序依据",
+        "Order": "排序方向",
+        "Descending": "降序",
+        "Ascending": "升序",
+        "Rows per page": "每页行数",
+        "Column filters": "列过滤",
+        "Filter columns": "过滤列",
+        "{column} contains": "{column} 包含",
+        "{column} range": "{column} 范围",
+        "Page (of {count:,})": "页码（共{count:,}页）",
+        "Rows {first:,}–{last:,} of {total:,}": "第{first:,}–{last:,}行，共{total:,}行",
+        "⬇️ Download selection (CSV)": "⬇️ 下载选中数据 (CSV)",
+        # 业务结论和建议
+        "🎯 Key Findings Summary": "🎯 关键发现总结",
+        "Total Market Size": "市场总规模",
+        "Paid Games Dominance": "付费游戏占比",
+        "Player Satisfaction": "玩家满意度",
+        "Release Peak": "发布高峰年份",
+        "Multi-platform Trend": "多平台趋势",
+        "Genre Diversity": "类型多样性",
+        "📈 Market Trend Analysis": "📈 市场趋势分析",
+        """
+        **Annual Release Trend**: Steam platform game releases show continuous growth, especially peaking in {peak_year}, indicating the prosperity of the digital distribution market.
+        **Monthly Release Pattern**: Month {peak_month} is the peak period for game releases, possibly related to holiday seasons and business strategies, with developers tending to release games before important sales seasons.
+        """: """
+        **年度发布趋势**: Steam平台游戏发布数量持续增长，在{peak_year}年达到高峰，体现了数字发行市场的繁荣。
+        **月度发布规律**: {peak_month}月是游戏发布的高峰期，可能与假期和商业策略有关，开发者倾向于在重要促销季之前发布游戏。
+        """,
+        "💰 Pricing Strategy Insights": "💰 定价策略洞察",
+        "Games in the {sales_range} price range have the highest average sales ({owners:,.0f} owners), while the {rating_range} range has the highest average positive rating ({rating:.1%}).":
+            "{sales_range}价格区间的游戏平均销量最高（{owners:,.0f}名拥有者），而{rating_range}区间的平均好评率最高（{rating:.1%}）。",
+        "Not enough games in the current selection to compare price ranges.": "当前选择中的游戏数量不足，无法比较价格区间。",
+        """
+        **Price Sensitivity**: {price_sensitivity}
+        **Free Game Effect**: Although free games account for {free_percentage:.1f}% of the total, they have unique advantages in user acquisition and player engagement.
+        **Value Perception**: High-priced games need to provide corresponding high-quality content to justify their value, otherwise they may face sales challenges.
+        """: """
+        **价格敏感性**: {price_sensitivity}
+        **免费游戏效应**: 免费游戏虽然只占总数的{free_percentage:.1f}%，但在用户获取和玩家参与方面具有独特优势。
+        **价值感知**: 高价游戏需要提供相应的高品质内容来体现其价值，否则可能面临销售挑战。
+        """,
+        "🔧 Platform Strategy Recommendations": "🔧 平台战略建议",
+        """
+        **Windows Dominance**: Windows platform supports nearly 100% of games and is the essential base platform for ensuring compatibility.
+        **Cross-platform Opportunities**: Multi-platform games have obvious advantages in user coverage and business performance, supporting Mac and Linux can additionally cover about 30% of potential users.
+        **Technical Investment**: Cross-platform development requires upfront technical investment but can significantly expand market coverage in the long term.
+        """: """
+        **Windows主导**: Windows平台支持几乎100%的游戏，是保证兼容性的必备基础平台。
+        **跨平台机会**: 多平台游戏在用户覆盖和商业表现上优势明显，支持Mac和Linux可以额外覆盖约30%的潜在用户。
+        **技术投入**: 跨平台开发需要前期技术投入，但长期来看可以显著扩大市场覆盖。
+        """,
+        "🎮 Genre Market Opportunities": "🎮 类型市场机会",
+        "{genre} at {price_range} on {platforms}": "{platforms}平台上{price_range}的{genre}",
+        "not enough data in the current selection": "当前选择中的数据不足",
+        "{tag_a} + {tag_b} games average {owners:.2f}× the typical owners but appear together only {lift:.2f}× as often as chance":
+            "{tag_a} + {tag_b}游戏的平均销量是平均水平的{owners:.2f}倍，但共同出现的频率只有随机水平的{lift:.2f}倍",
+        """
+        **Mainstream Genres**: {genres} and other genres dominate in quantity, with intense competition but large user bases.
+        **Niche Opportunities**: {niches} combine high demand and satisfaction with low supply.
+        **Innovation Space**: Genre fusion and innovation may bring new market growth points{fusion_gaps}.
+        """: """
+        **主流类型**: {genres}等类型在数量上占主导地位，竞争激烈但用户基数大。
+        **细分机会**: {niches}兼具高需求、高满意度和低供给。
+        **创新空间**: 类型融合和创新可能带来新的市场增长点{fusion_gaps}。
+        """,
+        "🧬 Genre Fusion Insights": "🧬 类型融合洞察",
+        "**Established Fusions** (most over-represented pairs)": "**成熟的类型融合**（最常见的组合）",
+        "**Under-explored Fusions** (rarer than chance, highest owners)": "**待开发的类型融合**（比随机更少见、销量最高）",
+        "No genre pair has at least {count} games in the current selection": "当前选择中没有游戏数量达到{count}款的类型组合",
+        "🌊 Blue-Ocean Opportunity Ranking": "🌊 蓝海市场机会排名",
+        "🌊 Market Cells: Supply vs Demand (color = satisfaction)": "🌊 细分市场：供给与需求（颜色 = 满意度）",
+        "Supply (Games)": "供给（游戏数）",
+        "Demand (Average Owners)": "需求（平均拥有者数）",
+        "No genre × price × platform cell has at least {count} games in the current selection": "当前选择中没有游戏数量达到{count}款的类型 × 价格 × 平台细分市场",
+        "🏢 Developer Strategy Recommendations": "🏢 开发者策略建议",
+        "**Independent Developers**:": "**独立开发者**:",
+        """
+        - Focus on niche genres and unique gameplay
+        - Use free or low-price strategies to acquire initial users
+        - Emphasize community building and player feedback
+        - Consider multi-platform releases to expand influence
+        """: """
+        - 专注于细分类型和独特玩法
+        - 使用免费或低价策略获取初始用户
+        - 重视社区建设和玩家反馈
+        - 考虑多平台发布以扩大影响力
+        """,
+        "**Large Developers**:": "**大型开发商**:",
+        """
+        - Invest in high-quality, high-price point flagship products
+        - Establish genre brands and serialized products
+        - Deploy multi-platform and cross-platform experiences
+        - Explore free + in-app purchase hybrid business models
+        """: """
+        - 投资高品质、高价位的旗舰产品
+        - 建立类型品牌和系列化产品
+        - 布局多平台和跨平台体验
+        - 探索免费 + 内购的混合商业模式
+        """,
+        "🔮 Future Development Trends": "🔮 未来发展趋势",
+        """
+        **Technology Driven**: Cloud gaming, AI-generated content and other new technologies will reshape game development and distribution models.
+        **Business Model Evolution**: Subscription models, games as a service and other new models will continue to develop and grow.
+        **Globalization Opportunities**: Growth in emerging markets provides new growth momentum for game globalization.
+        **Community Operations**: Player communities will become key factors in long-term game success.
+        """: """
+        **技术驱动**: 云游戏、AI生成内容等新技术将重塑游戏开发和发行模式。
+        **商业模式演进**: 订阅制、游戏即服务等新模式将持续发展壮大。
+        **全球化机遇**: 新兴市场的增长为游戏全球化提供了新的增长动力。
+        **社区运营**: 玩家社区将成为游戏长期成功的关键因素。
+        """,
+        "🚀 Immediate Action Recommendations": "🚀 立即行动建议",
+        "mainstream": "主流",
+        """
+        1. **Market Entry**: New developers are advised to enter with ${entry_price}-$20 price range {genre} genres
+        2. **Platform Strategy**: Ensure Windows compatibility, actively consider Mac/Linux support
+        3. **Quality First**: Invest in game quality and player experience, positive ratings are key to long-term success
+        4. **Data Driven**: Continuously monitor market data and player feedback, adjust strategies promptly
+        """: """
+        1. **市场进入**: 建议新开发者以${entry_price}-$20价格区间的{genre}类型进入市场
+        2. **平台策略**: 确保Windows兼容性，积极考虑Mac/Linux支持
+        3. **质量优先**: 投入游戏质量和玩家体验，好评率是长期成功的关键
+        4. **数据驱动**: 持续关注市场数据和玩家反馈，及时调整策略
+        """,
+        "📝 Analysis Limitations": "📝 分析局限性",
+        """
+        - **Data Timeliness**: This analysis is based on historical data, market conditions may have changed
+        - **Data Coverage**: The dataset may not include all Steam games, especially recently released works
+        - **Estimated Data**: Sales data are range estimates and may have certain errors
+        - **Causality**: Correlation analysis cannot directly prove causality, requires further verification
+        - **Cultural Factors**: Analysis is mainly based on quantitative data, qualitative factors like culture and region are not considered
+        """: """
+        - **数据时效性**: 本分析基于历史数据，市场情况可能已经发生变化
+        - **数据覆盖**: 数据集可能未包含所有Steam游戏，特别是最近发布的作品
+        - **估算数据**: 销量数据为区间估算，可能存在一定误差
+        - **因果关系**: 相关性分析不能直接证明因果关系，需要进一步验证
+        - **文化因素**: 分析主要基于定量数据，未考虑文化、地区等定性因素
+        """,
+        "Positive Rating": "好评率",
+        # 时间趋势和月度发布分析
+        "📝 Analysis Conclusions": "📝 分析结论",
+        "🎯 **Peak Release Year**: {year}, released {count} games": "🎯 **发布高峰年份**: {year}年，发布了 {count} 款游戏",
+        "🚀 **Popular Game Genres**: {genres}": "🚀 **热门游戏类型**: {genres}",
+        "📉 Monthly Release Trend & Forecast": "📉 月度发布趋势与预测",
+        "No dated releases in the current selection": "当前选择中没有带发布日期的游戏",
+        "95% Interval": "95%区间",
+        "Monthly Releases": "月度发布数量",
+        "12-Month Rolling Mean": "12个月滚动平均",
+        "Trend": "趋势",
+        "Forecast": "预测",
+        "📉 Monthly Releases with Rolling Mean, Trend and Forecast": "📉 月度发布数量：滚动平均、趋势与预测",
+        "Release Month": "发布月份",
+        "Number of Games": "游戏数量",
+        "🔮 Genre Release Forecast (next {count} months)": "🔮 各类型发布预测（未来{count}个月）",
+        "Genres to plot": "绘制的类型",
+        "🔮 Genre Rolling Mean and Forecast": "🔮 各类型滚动平均与预测",
+        "Games per Month": "每月游戏数",
+        "📊 Monthly Release Statistics": "📊 月度发布统计分析",
+        "Peak Release Month": "发布高峰月份",
+        "Peak Month Release Count": "高峰月发布数量",
+        "Lowest Release Month": "发布低谷月份",
+        "Lowest Month Release Count": "低谷月发布数量",
+        "Maximum Monthly Difference": "月间最大差异",
+        "Average Monthly Release": "月平均发布量",
+        "🔍 Monthly Release Pattern Analysis": "🔍 月度发布规律分析",
+        "🎯 **Annual Release Peak**: Month {month} is the most concentrated month for game releases, with {count} games released":
+            "🎯 **年度发布高峰**: {month}月是游戏发布最集中的月份，共发布了 {count} 款游戏",
+        "📉 **Annual Release Low**: Month {month} is the month with the fewest game releases, with only {count} games released":
+            "📉 **年度发布低谷**: {month}月是游戏发布最少的月份，仅发布了 {count} 款游戏",
+        "🌀 Seasonality Index": "🌀 季节指数",
+        "🌀 Seasonal Deviation from Trend (games per month)": "🌀 相对趋势的季节偏离（每月游戏数）",
+        "Month": "月份",
+        "Deviation from Trend": "相对趋势的偏离",
+        "Unlike the raw monthly counts above, the seasonal index removes the long-term growth trend, so it isolates the calendar effect.":
+            "与上面的原始月度计数不同，季节指数去除了长期增长趋势，因此只反映日历效应。",
+        # 价格销量和评价参与度分析
+        "💰 Price Range Sales Analysis": "💰 价格区间销量分析",
+        "Price range edges": "价格区间边界",
+        "💰 Average Sales by Price Range": "💰 各价格区间平均销量",
+        "Price Range": "价格区间",
+        "Average Sales": "平均销量",
+        "📊 Game Count by Price Range": "📊 各价格区间游戏数量",
+        "💡 Key Price Metrics": "💡 关键价格指标",
+        "Average Price": "平均价格",
+        "Median Price": "价格中位数",
+        "Free Games Count": "免费游戏数量",
+        "Best-selling Price Range": "最畅销价格区间",
+        "💵 Revenue Estimates": "💵 收入估计",
+        "Group by": "汇总维度",
+        "Price range": "价格区间",
+        "Genre": "类型",
+        "Release year": "发布年份",
+        "Revenue (Low)": "收入（低）",
+        "Revenue (Mid)": "收入（中）",
+        "Revenue (High)": "收入（高）",
+        "Owners are only published as ranges, so each game's revenue is an interval: price × the low, middle and high end of its owners range.":
+            "销量只以区间形式公布，因此每款游戏的收入也是一个区间：价格 × 销量区间的下界、中值和上界。",
+        "🎯 Player Engagement Analysis": "🎯 玩家参与度分析",
+        "Playtime bucket edges": "游戏时长区间边界",
+        "Owner and rating bucket edges": "销量和好评率区间边界",
+        "Owner tier edges": "销量档位边界",
+        "Rating bucket edges": "好评率区间边界",
+        "{bucket} Positive Rating": "{bucket}好评率",
+        "{count:,} games": "{count:,} 款游戏",
+        """  # 参与度分析结论
+        **Analysis Conclusions:**
+        - Game playtime shows positive correlation with positive ratings
+        - The more time players invest, the more positive their evaluations tend to be
+        - Game depth and content quality are key factors in maintaining long-term player engagement
+        """: """
+        **分析结论:**
+        - 游戏时长与好评率呈现正相关关系
+        - 玩家投入时间越多，对游戏的评价往往越正面
+        - 游戏深度和内容质量是维持玩家长期参与的关键因素
+        """,
+        # 类型、发行商、平台和商业模式分析
+        "⭐ Genre Ratings": "⭐ 类型评分",
+        "weighted_ratio pools all reviews in the genre, so a game with 3 reviews counts far less than one with 300k; mean_ratio weights every game equally.":
+            "weighted_ratio汇总该类型的所有评价，因此只有3条评价的游戏权重远小于有30万条评价的游戏；mean_ratio对每款游戏同等加权。",
+        """  # 市场洞察分析
+        **Market Insights:**
+        - Action and Adventure genres dominate the market in terms of quantity
+        - Different genres show significant differences in pricing strategies and player acceptance
+        - Niche genres may perform exceptionally well in specific market segments
+        """: """
+        **市场洞察:**
+        - Action和Adventure类型在数量上占据市场主导
+        - 不同类型在定价策略和玩家接受度上存在显著差异
+        - 小众类型可能在某些细分市场表现突出
+        """,
+        "⭐ Top-rated Publishers": "⭐ 高分发行商",
+        "Rating basis": "评分口径",
+        "Review-weighted": "按评价数加权",
+        "Bayesian": "贝叶斯",
+        "Mean ratio": "简单平均",
+        "Minimum games": "最少游戏数",
+        "💵 Publisher Revenue Estimates": "💵 发行商收入估计",
+        "⭐ Valve Special Analysis": "⭐ Valve专门分析",
+        "Valve Games Count": "Valve游戏数量",
+        "Valve Average Positive Rating": "Valve平均好评率",
+        "Valve Average Sales": "Valve平均销量",
+        """  # Valve表现分析结论
+        **Valve Performance Analysis:**
+        - As the platform owner, Valve excels in both game quality and quantity
+        - Valve games typically have high production standards and player recognition
+        - Platform ecosystem and first-party games form a virtuous cycle
+        """: """
+        **Valve表现分析:**
+        - 作为平台方，Valve在游戏质量和数量上都表现优异
+        - Valve游戏通常具有较高的制作标准和玩家认可度
+        - 平台生态与第一方游戏形成良性循环
+        """,
+        "🔧 Multi-platform Support Value Analysis": "🔧 多平台支持价值分析",
+        "Multi-platform Games": "多平台游戏",
+        "Single-platform Games": "单平台游戏",
+        "- Game Count: {count:,} games ({share:.1f}%)": "- 游戏数量: {count:,} 款 ({share:.1f}%)",
+        "- Average Positive Rating: {rating:.2%}": "- 平均好评率: {rating:.2%}",
+        "- Average Sales: {owners:,.0f}": "- 平均销量: {owners:,.0f}",
+        "- Average Playtime: {minutes:.0f} minutes": "- 平均游戏时长: {minutes:.0f} 分钟",
+        "🧩 Platform Combinations": "🧩 平台组合分析",
+        "📐 Statistical Significance": "📐 显著性检验",
+        "Multi-platform": "多平台",
+        "Single-platform": "单平台",
+        "📐 Multi-platform vs Single-platform (95% bootstrap CI)": "📐 多平台 vs 单平台（95%自助法置信区间）",
+        "- Not enough data to compare multi-platform and single-platform games": "- 数据不足，无法比较多平台和单平台游戏",
+        """  # 平台策略建议
+        **Platform Strategy Recommendations:**
+        {findings}
+        - Windows is the essential base platform that must be supported
+        - Supporting Mac and Linux can reach a wider player base
+        - Cross-platform development requires consideration of technical costs and target users
+        """: """
+        **平台策略建议:**
+        {findings}
+        - Windows是必须支持的基础平台
+        - 支持Mac和Linux可以触及更广泛的玩家群体
+        - 跨平台开发需要考虑技术成本和目标用户
+        """,
+        "💼 Business Model Deep Analysis": "💼 商业模式深度分析",
+        "Free Games": "免费游戏",
+        "Paid Games": "付费游戏",
+        "Game Count": "游戏数量",
+        "Average Playtime": "平均游戏时长",
+        "Both free and paid games are needed in the current selection to test the difference": "当前选择中需要同时包含免费和付费游戏才能检验差异",
+        """  # 商业模式选择建议
+        **Business Model Selection Recommendations:**
+        - **Free Games**: Suitable for products pursuing user scale and network effects
+        - **Paid Games**: Suitable for products focusing on core experience and single sales
+        - **Hybrid Model**: Free base version + paid content hybrid model is increasingly popular
+        - **Subscription Model**: Suitable for service-type games providing continuous content updates
+        """: """
+        **商业模式选择建议:**
+        - **免费游戏**: 适合追求用户规模和网络效应的产品
+        - **付费游戏**: 适合专注核心体验和单次销售的产品
+        - **混合模式**: 免费基础版 + 付费内容的混合模式越来越流行
+        - **订阅模式**: 适合持续提供内容更新的服务型游戏
+        """,
+        "🔍 Analysis Guide": "🔍 分析说明",
+        """  # 小倍数图解读指南
+        **Small Multiples Interpretation Guide:**
+        - Each subplot represents the relationship between price and positive rating for a game genre
+        - Point positions show the pricing strategy and market acceptance of that genre
+        - Colors distinguish different game genres for easy comparison
+        - Top-right genres indicate high-price, high-rating premium games
+        - Bottom-left genres may represent low-price, low-rating entry-level games
+        """: """
+        **小倍数图解读指南:**
+        - 每个子图代表一个游戏类型的价格与好评率关系
+        - 点的位置显示该类型游戏的定价策略和市场接受度
+        - 点的颜色区分不同游戏类型，便于对比分析
+        - 右上角的类型表示高价格高评价的优质游戏
+        - 左下角的类型可能表示低价格低评价的入门级游戏
+        """,
+        # 显著性检验结论
+        "Positive rating": "好评率",
+        "Average playtime": "平均游戏时长",
+        "Sales": "销量",
+        "multi-platform games": "多平台游戏",
+        "single-platform games": "单平台游戏",
+        "free games": "免费游戏",
+        "paid games": "付费游戏",
+        "{metric}: not enough data to compare {group} and {baseline}": "{metric}：数据不足，无法比较{group}和{baseline}",
+        "{metric}: no significant difference between {group} and {baseline} (d = {d:.2f})": "{metric}：{group}与{baseline}之间没有显著差异 (d = {d:.2f})",
+        "{metric}: {group} are significantly {direction} than {baseline} ({size} effect, d = {d:.2f})": "{metric}：{group}显著{direction}{baseline}（{size}效应，d = {d:.2f}）",
+        "higher": "高于",
+        "lower": "低于",
+        "negligible": "可忽略的",
+        "small": "小",
+        "medium": "中等",
+        "large": "大",
+        "n/a": "无法计算的",
+        # 数据质量报告
+        "Total Missing Values": "缺失值比例",
+        "Duplicate Records": "重复记录数",
+        "Complete Records": "完整记录比例",
+        "Detailed Data Quality Metrics": "详细数据质量指标",
+        "**Missing Values by Column:**": "**各列缺失值统计:**",
+        "✅ No missing values found": "✅ 未发现缺失值",
+        "Data Validation Checks": "数据验证检查",
+        "Prices are non-negative": "价格均为非负数",
+        "Positive ratings between 0-1": "好评率在0-1之间",
+        "Playtime is non-negative": "游戏时长均为非负数",
+        "Release dates are reasonable": "发布日期合理",
+        "All release dates parsed": "所有发布日期均已解析",
+        "**Quarantined Rows ({count} with missing or unparseable release dates, excluded from the analysis):**":
+            "**隔离的记录（{count}行发布日期缺失或无法解析，未参与分析）:**",
+        # 相似游戏
+        "Not enough games in the current selection to find similar games": "当前选择中的游戏数量不足，无法查找相似游戏",
+        "Find a game": "查找游戏",
+        "Type a game name, developer or publisher": "输入游戏名、开发商或发行商",
+        "No games match your search in the current selection": "当前选择中没有匹配搜索的游戏",
+        "Select a game": "选择游戏",
+        "Number of similar games": "相似游戏数量",
+        "🎯 Games similar to {name}": "🎯 与{name}相似的游戏",
+        "Genres: {genres} | Tags: {tags} | Price: ${price:.2f}": "类型: {genres} | 标签: {tags} | 价格: ${price:.2f}",
+        "🔗 Similarity Score": "🔗 相似度得分",
+        "Cosine Similarity": "余弦相似度",
+        "Game": "游戏",
+        "📦 Batch Similar-Games Lists": "📦 批量相似游戏列表",
+        "Compute the top similar games for every title in the full catalogue and download them as CSV.": "为完整目录中的每款游戏计算最相似的游戏，并下载为CSV。",
+        "Compute similar-games lists for all titles": "计算所有游戏的相似游戏列表",
+        "Computing similar games for every title...": "正在为每款游戏计算相似游戏...",
+        "Download CSV": "下载CSV",
+        # 切片对比
+        "Set the sidebar filters to a slice you want to compare (e.g. Indie, 2016) and click 📌 Pin current filters in the ⚖️ Compare panel, then change the filters. The current filters are compared against every pinned slice.":
+            "在侧边栏中把过滤条件设置为要对比的切片（例如Indie、2016年），在⚖️ 对比面板中点击📌 固定当前过滤条件，然后修改过滤条件。当前过滤条件会与每个已固定的切片进行对比。",
+        "No games match this slice": "没有游戏符合该切片",
+        "Free Games (%)": "免费游戏比例 (%)",
+        "Average Positive Rating (%)": "平均好评率 (%)",
+        "Average Price (USD)": "平均价格 (美元)",
+        "Median Price (USD)": "价格中位数 (美元)",
+        "Peak Release Year": "发布高峰年份",
+        "Number of Genres": "游戏类型数量",
+        "📋 Metrics by Slice": "📋 各切片指标对比",
+        "Genre shares": "类型占比",
+        "Side by side": "并排对比",
+        "Difference from current filters": "相对当前过滤条件的差值",
+        "All slices are evaluated in one pass over the data: each count is a single grouped count keyed by slice.": "所有切片在一次数据遍历中计算：每个计数都是按切片分组的一次计数。",
+        # 标签共现
+        "No games in the current selection": "当前选择中没有游戏",
+        "Field": "字段",
+        "Genres": "类型",
+        "Tags": "标签",
+        "Metric": "指标",
+        "Count": "计数",
+        "Lift": "提升度",
+        "Tags in heatmap": "热力图中的标签数",
+        "Minimum games per pair": "每对标签最少游戏数",
+        "Lift above 1 (PMI above 0) means two tags appear together more often than if they were independent; below 1, less often.":
+            "提升度大于1（PMI大于0）表示两个标签共同出现的频率高于相互独立时的预期；小于1则表示更少共同出现。",
+        "🤝 Strongest Pairs": "🤝 关联最强的标签对",
+        "↔️ Weakest Pairs": "↔️ 关联最弱的标签对",
+        "{pairs:,} pairs with at least {min_games} games, out of {games:,} games in the current selection": "共{pairs:,}个至少包含{min_games}款游戏的标签对，当前选择共{games:,}款游戏",
+        # 通用控件和提示
+        "No games match the current filters. Clear the search or widen the filters in the sidebar.": "没有游戏符合当前过滤条件。请清空搜索或在侧边栏中放宽过滤条件。",
+        "🏆 Top-rated Games": "🏆 高分游戏排行榜",
+        "Games to show": "显示游戏数",
+        "Minimum reviews": "最少评价数",
+        "Ranked by the Wilson 95% lower bound of the positive ratio; rating_rank is the rank in the full catalogue. The Bayesian rating adds {weight:,.0f} reviews at the catalogue average ({mean:.1f}%) to every game.":
+            "按好评率的Wilson 95%下界排名；rating_rank为在完整目录中的排名。贝叶斯评分为每款游戏加入{weight:,.0f}条按目录平均好评率（{mean:.1f}%）计算的评价。",
+        "{label} ({unit}, comma-separated)": "{label}（{unit}，逗号分隔）",
+        "USD": "美元",
+        "minutes": "分钟",
+        "owners": "拥有者",
+        "% positive": "% 好评",
+        "Bucket edges must be increasing numbers, e.g. {default}; using the defaults.": "区间边界必须是递增的数字，例如{default}；已使用默认边界。",
+        "Realized share of list price": "实际到手价格比例",
+        "Net revenue after the platform fee and discounts, as a share of the list price. Widen the range to carry that uncertainty into the estimates.":
+            "扣除平台分成和折扣后的净收入占标价的比例。扩大范围可以把这一不确定性带入收入估计。",
+        "Showing all {total:,} games in this range at full detail.": "以完整明细显示该范围内的全部{total:,}款游戏。",
+        "Overview: {total:,} games aggregated into {cells:,} cells (marker size = number of games). Drag a box to zoom in; ranges with at most {max_points:,} games are shown point by point.":
+            "概览：{total:,}款游戏聚合为{cells:,}个单元格（点大小 = 游戏数量）。拖动框选可放大；不超过{max_points:,}款游戏的范围会逐点显示。",
+        "Reset view": "重置视图",
+        "Click or drag on this chart to filter every other chart and metric; clear the selection in the sidebar.": "在此图表上点击或拖动可以过滤其他所有图表和指标；在侧边栏中清除选择。",
+        "✕ Years {start}–{end}": "✕ 年份 {start}–{end}",
+        "✕ Genres: {genres}": "✕ 类型: {genres}",
+        "❌ Icon files not found, please check file paths": "❌ 未找到图标文件，请检查文件路径",
+        "❌ Error loading images: {error}": "❌ 加载图片时出错: {error}",
+        "*Professor:Mano Mathew*": "*指导教师：Mano Mathew*",
+        "*Student name:Yueteng Zhang*": "*学生姓名：Yueteng Zhang*",
+        "*github Url:https://github.com/junmohan1/Steam-Game-Data-Analysis-Platform.git*": "*GitHub地址：https://github.com/junmohan1/Steam-Game-Data-Analysis-Platform.git*",
+    }
+}
+
+
+def set_locale(locale):
+    """
+    设置当前会话的界面语言
+    """
+    st.session_state['locale'] = locale if locale in TRANSLATIONS else DEFAULT_LOCALE
+
+
+def _normalize(text):
+    """
+    译文表的查找键：去掉每行的首尾空白（三引号文本在代码中的缩进不影响查找，Markdown段落的渲染结果不变）
+    """
+    return '\n'.join(line.strip() for line in text.strip().splitlines())
+
+
+_LOOKUP = {locale: {_normalize(source): _normalize(target) for source, target in table.items()}  # 规范化后的译文表（导入时构建一次）
+           for locale, table in TRANSLATIONS.items()}
+
+
+def t(text, **values):
+    """
+    将界面文本翻译为当前会话的语言，没有译文时返回（规范化后的）原文
+    values非空时用str.format填入文本中的{name}占位符（译文可以调整占位符的位置和语序）
+    """
+    locale = st.session_state.get('locale', DEFAULT_LOCALE)  # 当前会话的界面语言
+    key = _normalize(text)
+    translated = _LOOKUP.get(locale, {}).get(key, key)
+    return translated.format(**values) if values else translated
@@ -0,0 +1,228 @@
+import numpy as np  # 导入numpy用于掩码和增量统计
+import pandas as pd  # 导入pandas用于类型编码
+import streamlit as st  # 导入streamlit用于在会话状态中保存过滤引擎
+from utils.prep import platform_selection_bits, calculate_key_metrics  # 从utils.prep模块导入平台位组合函数和完整指标计算函数
+from utils.progressive import sorted_index  # 从utils.progressive模块导入排序索引函数
+from utils.search import search_games  # 从utils.search模块导入游戏搜索函数
+
+DIMENSIONS = ('search_query', 'year_range', 'price_range', 'selected_genres', 'platform_options', 'linked_year_range', 'linked_genres')  # 过滤维度（侧边栏控件和图表联动选择）
+RANGE_COLUMNS = {'year_range': 'release_year', 'price_range': 'price', 'linked_year_range': 'release_year'}  # 范围维度对应的数值列
+GENRE_DIMENSIONS = ('selected_genres', 'linked_genres')  # 按主要类型过滤的维度
+PLATFORM_COLUMNS = ('windows_support', 'mac_support', 'linux_support', 'multi_platform')  # 需要累计的平台计数列
+
+
+class IncrementalFilter:
+    """
+    增量过滤引擎：记住上一次的过滤条件和每个维度的掩码，以及每行未通过的维度数
+    只有一个维度变化时只重算该维度（滑块通过排序索引只取新旧范围之差的行），
+    并只对进入或离开选择的行增减计数和求和，得到与apply_filters、calculate_key_metrics相同的结果
+    """
+
+    def __init__(self, df, search_index=None):
+        self.df = df  # 基础数据
+        self.search_index = search_index  # 搜索索引（未提供时不应用搜索过滤）
+        self.filters = None  # 上一次的过滤条件
+        self._masks = {}  # 维度 -> 每行是否通过该维度
+        self._failed = np.zeros(len(df), dtype=np.int8)  # 每行未通过的维度数（为0即被选中）
+        self._totals = None  # 选中行的累计计数和求和
+
+        column_index = {col: sorted_index(df[col]) for col in set(RANGE_COLUMNS.values())}  # 每个数值列只排序一次
+        self._range_index = {dim: column_index[col] for dim, col in RANGE_COLUMNS.items()}  # 范围维度的排序索引
+        self._genre_codes, self._genres = pd.factorize(df['main_genre'])  # 主要类型编码（缺失值为-1）
+        self._year_min = int(df['release_year'].min()) if len(df) else 0  # 年份编码的起点
+        self._year_codes = df['release_year'].to_numpy(dtype=np.int64) - self._year_min  # 年份编码
+        self._month_codes = df['release_month'].to_numpy(dtype=np.int64)  # 月份（1-12）
+        self._price = df['price'].to_numpy(dtype=float)  # 价格
+        self._ratio = df['positive_ratio'].to_numpy(dtype=float)  # 好评率
+        self._free = df['is_free'].to_numpy(dtype=bool)  # 是否免费
+        self._platforms = {col: df[col].to_numpy(dtype=bool) for col in PLATFORM_COLUMNS}  # 平台支持
+        self._platform_mask = df['platform_mask'].to_numpy()  # 平台位掩码
+
+    def _range_bounds(self, dim, value_range):
+        """
+        返回范围在排序索引中的起止位置；范围为None（未选择）时包含所有行
+        """
+        _, values = self._range_index[dim]
+        if value_range is None:
+            return 0, len(values)
+        return (np.searchsorted(values, value_range[0], side='left'),
+                np.searchsorted(values, value_range[1], side='right'))
+
+    def _dimension_mask(self, dim, filters):
+        """
+        完整计算一个维度的掩码（首次构建或非滑块维度变化时使用）
+        """
+        n_rows = len(self.df)
+        if dim in RANGE_COLUMNS:  # 滑块：排序索引中连续的一段
+            order, _ = self._range_index[dim]
+            lo, hi = self._range_bounds(dim, filters.get(dim))
+            mask = np.zeros(n_rows, dtype=bool)
+            mask[order[lo:hi]] = True
+            return mask
+        if dim == 'search_query':  # 搜索：查询倒排索引
+            query = filters.get('search_query', '')
+            if self.search_index is None or not query.strip():
+                return np.ones(n_rows, dtype=bool)
+            return self.df.index.isin(search_games(self.search_index, query))
+        if dim in GENRE_DIMENSIONS:  # 类型：按编码查表
+            if not filters.get(dim):
+                return np.ones(n_rows, dtype=bool)
+            allowed = np.zeros(len(self._genres) + 1, dtype=bool)  # 末尾对应缺失值（编码-1）
+            allowed[:-1] = self._genres.isin(filters[dim])
+            return allowed[self._genre_codes]
+        selected_bits = platform_selection_bits(filters['platform_options'])  # 平台：按位与
+        if not selected_bits:
+            return np.ones(n_rows, dtype=bool)
+        return (self._platform_mask & selected_bits) != 0
+
+    def _flipped_rows(self, dim, filters):
+        """
+        返回该维度掩码发生变化的行位置
+        滑块维度只查找新旧范围在排序索引中的差集，不扫描其余行
+        """
+        if dim in RANGE_COLUMNS:
+            order, _ = self._range_index[dim]
+            lo0, hi0 = self._range_bounds(dim, self.filters.get(dim))  # 旧范围
+            lo1, hi1 = self._range_bounds(dim, filters.get(dim))  # 新范围
+            if hi0 <= lo1 or hi1 <= lo0 or lo0 >= hi0 or lo1 >= hi1:  # 两段不重叠：两段都发生变化
+                return np.concatenate([order[lo0:hi0], order[lo1:hi1]])
+            return np.concatenate([order[min(lo0, lo1):max(lo0, lo1)], order[min(hi0, hi1):max(hi0, hi1)]])  # 只有两端变化
+        return np.flatnonzero(self._dimension_mask(dim, filters) != self._masks[dim])
+
+    def _accumulate(self, rows, sign):
+        """
+        将rows对应的行加入（sign=1）或移出（sign=-1）累计统计
+        """
+        totals = self._totals
+        paid = rows[self._price[rows] > 0]  # 付费游戏
+        genres = self._genre_codes[rows]
+        totals['count'] += sign * len(rows)
+        totals['free'] += sign * int(self._free[rows].sum())
+        totals['ratio'] += sign * self._ratio[rows].sum()
+        totals['paid'] += sign * len(paid)
+        totals['paid_price'] += sign * self._price[paid].sum()
+        for col, values in self._platforms.items():
+            totals[col] += sign * int(values[rows].sum())
+        totals['years'] += sign * np.bincount(self._year_codes[rows], minlength=len(totals['years']))
+        totals['months'] += sign * np.bincount(self._month_codes[rows], minlength=13)
+        totals['genres'] += sign * np.bincount(genres[genres >= 0], minlength=len(self._genres))
+
+    def _rebuild_totals(self):
+        """
+        从当前选择重新计算累计统计
+        """
+        n_years = int(self._year_codes.max()) + 1 if len(self.df) else 1  # 年份编码的个数
+        self._totals = {'count': 0, 'free': 0, 'ratio': 0.0, 'paid': 0, 'paid_price': 0.0,
+                        'years': np.zeros(n_years, dtype=np.int64), 'months': np.zeros(13, dtype=np.int64),
+                        'genres': np.zeros(len(self._genres), dtype=np.int64), **{col: 0 for col in PLATFORM_COLUMNS}}
+        self._accumulate(np.flatnonzero(self._failed == 0), 1)
+
+    def sync(self, filters):
+        """
+        将引擎状态更新到新的过滤条件：只重算变化的维度，并按进入、离开选择的行增量更新统计
+        """
+        if self.filters is None:  # 首次：完整构建所有维度
+            self._masks = {dim: self._dimension_mask(dim, filters) for dim in DIMENSIONS}
+            self._failed = sum((~mask).astype(np.int8) for mask in self._masks.values())
+            self.filters = dict(filters)
+            self._rebuild_totals()
+            return
+
+        for dim in DIMENSIONS:
+            if filters.get(dim) == self.filters.get(dim):  # 未变化的维度
+                continue
+            rows = self._flipped_rows(dim, filters)  # 该维度掩码翻转的行
+            was_selected = self._failed[rows] == 0
+            passes = ~self._masks[dim][rows]  # 翻转后是否通过该维度
+            self._masks[dim][rows] = passes
+            self._failed[rows] += np.where(passes, -1, 1).astype(np.int8)
+            now_selected = self._failed[rows] == 0
+            entered, left = rows[now_selected & ~was_selected], rows[was_selected & ~now_selected]  # 进入和离开选择的行
+            self.filters[dim] = filters.get(dim)
+            if len(entered) + len(left) > self._totals['count'] + len(entered) - len(left):  # 变化的行比新选择还多时重新汇总更快
+                self._rebuild_totals()
+            else:
+                self._accumulate(entered, 1)
+                self._accumulate(left, -1)
+
+    def update(self, filters):
+        """
+        应用新的过滤条件
+        返回(过滤后的DataFrame, 指标字典)
+        """
+        self.sync(filters)
+        return self.frame(), self.metrics()
+
+    def frame(self):
+        """
+        返回当前选择的行（与apply_filters的结果相同）
+        """
+        return self.df[self._failed == 0]
+
+    def frame_excluding(self, filters, dim):
+        """
+        返回除dim外满足其余所有过滤条件的行（联动图表用它显示自身选择之外的上下文）
+        """
+        self.sync(filters)
+        return self.df[self._failed - (~self._masks[dim]) == 0]
+
+    def metrics(self):
+        """
+        由累计统计得到与calculate_key_metrics相同的指标
+        """
+        if self._totals['count'] == 0:  # 没有选中的行：与完整计算的行为保持一致
+            return calculate_key_metrics(self.frame())
+        order, values = self._range_index['price_range']  # 按价格排序的索引
+        paid_prices = values[(self._failed[order] == 0) & (values > 0)]  # 已排序的选中付费游戏价格
+        selected_genres = self._genre_codes[self._failed == 0]  # 选中行的类型编码（按行顺序）
+        return totals_metrics(self._totals, self._year_min, self._genres, selected_genres, paid_prices)
+
+
+def totals_metrics(totals, year_min, genres, genre_codes, paid_prices):
+    """
+    由累计计数和求和得到与calculate_key_metrics相同的指标（选择不能为空）
+    totals为计数、求和以及年份、月份、类型的计数数组；genre_codes为选中行按行顺序的类型编码，用于数量相同时按首次出现排序；
+    paid_prices为已排序的付费游戏价格
+    返回指标字典
+    """
+    count = totals['count']
+    years = np.flatnonzero(totals['years'])  # 有游戏的年份编码
+    months = np.flatnonzero(totals['months'])  # 有游戏的月份
+    present, first_seen = np.unique(genre_codes[genre_codes >= 0], return_index=True)  # 出现的类型及其首次出现位置
+    genre_rank = np.lexsort((first_seen, -totals['genres'][present]))  # 按数量降序，数量相同时按首次出现顺序（与value_counts一致）
+    n_paid = len(paid_prices)
+
+    metrics = {}
+    metrics['total_games'] = count
+    metrics['free_game_percentage'] = totals['free'] / count * 100
+    metrics['avg_rating'] = totals['ratio'] / count * 100
+    metrics['year_range'] = f"{years[0] + year_min}-{years[-1] + year_min}"
+    peak_year = int(np.argmax(totals['years']))  # 发布数量最多的年份编码
+    metrics['peak_year'] = peak_year + year_min
+    metrics['peak_year_count'] = int(totals['years'][peak_year])
+    metrics['avg_price'] = totals['paid_price'] / totals['paid'] if totals['paid'] else np.nan
+    metrics['median_price'] = (paid_prices[(n_paid - 1) // 2] + paid_prices[n_paid // 2]) / 2 if n_paid else np.nan
+    metrics['windows_games'] = totals['windows_support']
+    metrics['mac_games'] = totals['mac_support']
+    metrics['linux_games'] = totals['linux_support']
+    metrics['multi_platform_games'] = totals['multi_platform']
+    metrics['top_genres'] = genres[present[genre_rank[:5]]].tolist()
+    metrics['unique_genres'] = len(present)
+    month_counts = totals['months'][months]
+    metrics['peak_month'] = int(months[np.argmax(month_counts)])
+    metrics['peak_month_count'] = int(month_counts.max())
+    metrics['slow_month'] = int(months[np.argmin(month_counts)])
+    metrics['slow_month_count'] = int(month_counts.min())
+    return metrics
+
+
+def session_filter(df, search_index, version):
+    """
+    返回当前会话的增量过滤引擎（保存在会话状态中，数据版本变化时重建）
+    """
+    engine = st.session_state.get('incremental_filter')
+    if engine is None or st.session_state.get('incremental_filter_version') != version:
+        engine = IncrementalFilter(df, search_index)
+        st.session_state['incremental_filter'] = engine
+        st.session_state['incremental_filter_version'] = version
+    return engine
@@ -1,4 +1,25 @@
 # 此文件标识utils目录为一个Python包，允许其他模块导入utils下的模块
-from .io import load_and_preprocess_data
-from .prep import create_sidebar_filters, apply_filters, calculate_key_metrics
-from .viz import create_all_visualizations, create_small_multiples, create_data_quality_section
\ No newline at end of file
+from .io import load_and_preprocess_data, dataset_details, preprocess_data, data_version, parse_release_dates, normalize_release_dates, parse_platform_mask, parse_owners, parse_owner_bounds
+from .prep import create_sidebar_filters, filter_mask, apply_filters, calculate_key_metrics, filters_cache_key, empty_metrics, require_games
+from .viz import create_all_visualizations, VISUAL_BUILDERS, create_small_multiples, create_data_quality_section, create_group_comparison_chart, compute_data_quality, create_price_sales_chart, create_rating_playtime_chart
+from .search import build_search_index, search_games
+from .similarity import build_similarity_index, find_similar_games, batch_similar_games
+from .opportunity import score_market_opportunities, summarize_price_ranges, summarize_platform_combinations
+from .trends import compute_release_trends, build_release_matrix, seasonal_decompose, forecast_releases
+from .stats import bootstrap_means, compare_groups, cohens_d
+from .snapshots import ingest_snapshot, snapshot_as_of, diff_snapshots, metric_history, list_snapshots
+from .backend import PandasBackend, DuckDBBackend, create_backend, write_columnar_file, compute_key_metrics, compute_aggregates
+from .singleflight import SingleFlight, single_flight, FlightTimeout, FlightCancelled
+from .figcache import encode_figure, decode_figure, cached_figures, encode_typed_array, LazyFigures
+from .progressive import sorted_index, view_sorted_index, rows_in_range, bin_points, progressive_frame, show_progressive_chart, rerun_current
+from .memory import MemoryBudget, memory_budget, estimate_size
+from .i18n import set_locale, t
+from .incremental import IncrementalFilter, session_filter, totals_metrics
+from .linked import linked_filters, linked_figure_overrides, show_linked_chart, show_linked_selection
+from .explorer import build_explorer_index, selection_positions, page_frame, show_data_explorer
+from .export import frame_batches, selection_batches, export_chunks, export_bytes, write_export, show_export_panel
+from .compare import compare_slices, build_comparison, describe_filters, show_compare_controls
+from .buckets import BUCKET_SPECS, bucket_labels, bucket_codes, assign_buckets, cached_buckets, bucket_stats, parse_edges, edges_input
+from .ratings import wilson_lower_bound, bayesian_ratings, add_rating_quality, top_rated, group_ratings, show_rating_leaderboard
+from .revenue import estimate_revenue, revenue_by, view_revenue, revenue_totals, price_share_input
+from .cooccurrence import build_cooccurrence_index, compute_cooccurrence, view_cooccurrence, pair_table, heatmap_frame
\ No newline at end of file
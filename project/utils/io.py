@@ -1,54 +1,193 @@
+import hashlib  # 导入hashlib用于生成数据版本号
+import os  # 导入os用于读取文件信息
+import warnings  # 导入warnings用于提示被隔离的日期
+import numpy as np  # 导入numpy用于向量化日期拆分和平台位运算
 import pandas as pd  # 导入pandas用于数据处理
 import streamlit as st  # 导入streamlit用于缓存装饰器
+from utils.ratings import add_rating_quality  # 从utils.ratings模块导入加载时评分计算函数
 
-@st.cache_data  # 使用streamlit缓存装饰器，避免重复加载数据，提升应用性能
-def load_and_preprocess_data():
+DATA_PATH = os.environ.get('STEAM_CSV', 'C:/Users/ASUS/unit/project/steam.csv')  # 默认数据文件的绝对路径（可通过环境变量STEAM_CSV指定）
+DATE_FORMATS = ['%Y-%m-%d', '%b %d, %Y', '%d %b, %Y', '%d %b %Y', '%Y/%m/%d', '%d/%m/%Y', '%b %Y', '%Y']  # 按顺序尝试的日期格式（ISO格式最常见，放在最前）
+MIN_RELEASE_YEAR = 1970  # 合理发布年份的下限
+MAX_FUTURE_YEARS = 5  # 合理发布年份最多比当前年份晚几年（预告的游戏）
+DATE_CACHE_SIZE = 200_000  # 日期解析缓存的最大条目数
+_date_cache = {}  # 日期字符串 -> 解析结果（跨多次加载复用，如历史快照入库）
+PLATFORM_BITS = {'Windows': 1, 'Mac': 2, 'Linux': 4}  # 平台对应的位（platform_mask按位组合）
+PLATFORM_BIT_COUNTS = np.array([bin(mask).count('1') for mask in range(8)], dtype=np.int8)  # 每种组合支持的平台数
+DETAILS_VERSIONS = 2  # 最多保留几个数据版本的加载附带信息（与加载缓存的条目数一致）
+_dataset_details = {}  # 数据版本 -> 加载时的附带信息（不放在DataFrame.attrs中：attrs会被深拷贝到每个派生的DataFrame）
+
+@st.cache_data(max_entries=2)  # 使用streamlit缓存装饰器，避免重复加载数据，提升应用性能（最多保留2个数据文件的结果，避免无限增长）
+def load_and_preprocess_data(csv_path=DATA_PATH):
     """
     加载CSV数据并进行预处理
     返回处理后的DataFrame
     """
     # 使用绝对路径直接读取数据文件
-    df = pd.read_csv('C:/Users/ASUS/unit/project/steam.csv')  # 使用绝对路径读取steam.csv数据文件
+    df = pd.read_csv(csv_path)  # 使用绝对路径读取steam.csv数据文件
     
+    df, details = preprocess_data(df, return_details=True)  # 预处理，同时得到日期隔离表和评分先验
+    _dataset_details[data_version(csv_path)] = details  # 按数据版本保存附带信息
+    while len(_dataset_details) > DETAILS_VERSIONS:  # 只保留最近几个版本
+        _dataset_details.pop(next(iter(_dataset_details)))
+    return df  # 返回处理后的DataFrame
+
+def dataset_details(csv_path=DATA_PATH):
+    """
+    返回数据文件加载时的附带信息 {'date_quarantine': 被隔离的行DataFrame, 'rating_prior': 评分先验参数字典}
+    按数据版本保存；尚未加载（或已被移除）时重新加载一次
+    """
+    version = data_version(csv_path)
+    if version not in _dataset_details:
+        load_and_preprocess_data(csv_path)  # 加载时登记附带信息
+    if version not in _dataset_details:  # 加载结果来自缓存，没有重新登记
+        _dataset_details[version] = preprocess_data(pd.read_csv(csv_path), return_details=True)[1]
+    return _dataset_details[version]
+
+def data_version(csv_path=DATA_PATH):
+    """
+    根据数据文件的路径、大小和修改时间生成数据版本号
+    数据文件更新后版本号改变，用作跨会话共享结果的键
+    """
+    try:
+        stat = os.stat(csv_path)  # 文件信息
+        signature = f"{os.path.abspath(csv_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    except OSError:  # 文件不可访问时只使用路径
+        signature = str(csv_path)
+    return hashlib.sha1(signature.encode()).hexdigest()[:12]
+
+def _unreasonable_years(dates):
+    """
+    年份不合理（早于MIN_RELEASE_YEAR或晚于当前年份MAX_FUTURE_YEARS年以上）的日期掩码
+    """
+    latest = pd.Timestamp.now().year + MAX_FUTURE_YEARS  # 合理年份上限
+    return (dates.dt.year < MIN_RELEASE_YEAR) | (dates.dt.year > latest)
+
+def parse_release_dates(values):
+    """
+    按DATE_FORMATS依次对日期字符串做显式格式的向量化解析
+    只解析不重复的字符串，且解析结果缓存在进程内；已经是日期类型的列不再解析；无法解析或年份不合理的值为NaT
+    返回与输入等长的datetime64 Series
+    """
+    if pd.api.types.is_datetime64_dtype(values):  # 已经是日期类型（如重新处理已预处理的数据），不转为字符串重新解析
+        dates = pd.Series(values).astype('datetime64[ns]')
+        dates[_unreasonable_years(dates)] = pd.NaT  # 与字符串解析一样排除年份不合理的日期
+        return dates
+    text = pd.Series(values).astype('string').str.strip()  # 统一为字符串并去掉首尾空格
+    codes, uniques = pd.factorize(text)  # 不重复的日期字符串（缺失值编码为-1）
+    uniques = pd.Index(uniques, dtype=object)
+    parsed = pd.Series([_date_cache.get(u, pd.NaT) for u in uniques], dtype='datetime64[ns]')  # 先查缓存
+    pending = np.flatnonzero(~uniques.isin(_date_cache.keys()))  # 缓存中没有的字符串
+    results = pd.Series(pd.NaT, index=pending, dtype='datetime64[ns]')  # 新解析的结果
+    for fmt in DATE_FORMATS:  # 每种格式只对尚未解析的字符串尝试一次
+        todo = results.index[results.isna()]
+        if len(todo) == 0:
+            break
+        results[todo] = pd.to_datetime(pd.Series(uniques[todo], index=todo), format=fmt, errors='coerce')
+    results[_unreasonable_years(results)] = pd.NaT  # 年份不合理的日期视为无法解析
+    parsed[pending] = results.to_numpy()
+    if len(_date_cache) + len(pending) > DATE_CACHE_SIZE:  # 缓存过大时清空
+        _date_cache.clear()
+    _date_cache.update(zip(uniques[pending], results.to_numpy()))  # 记录新解析的结果（含无法解析的值）
+
+    dates = parsed.to_numpy()[codes]  # 按编码展开到每一行
+    dates[codes < 0] = np.datetime64('NaT')  # 缺失的日期
+    return pd.Series(dates, index=text.index, dtype='datetime64[ns]')
+
+def normalize_release_dates(df):
+    """
+    日期规范化：解析release_date，日期缺失或无法解析的行移入隔离列表（不再导致整个应用报错），
+    并生成紧凑的整数列 release_year(int16)、release_month(int8)、release_year_month(int32, 如201508)
+    不修改传入的DataFrame（总是在副本上添加列）
+    返回(规范化后的DataFrame, 被隔离的原始行DataFrame)
+    """
+    dates = parse_release_dates(df['release_date'])  # 多格式解析
+    bad = dates.isna().to_numpy()  # 无法解析的行
+    quarantine = df.loc[bad, [c for c in ('appid', 'name', 'release_date') if c in df.columns]].copy()  # 隔离的原始记录
+    df = df.loc[~bad].copy() if bad.any() else df.copy()  # 只保留日期有效的行（没有隔离的行时也复制一次，不在调用方的DataFrame上写入）
+    dates = dates[~bad]
+
+    days = dates.to_numpy().astype('datetime64[D]')  # 按天截断
+    years = days.astype('datetime64[Y]').astype(np.int64) + 1970  # 年份（向量化，无需逐个取属性）
+    months = days.astype('datetime64[M]').astype(np.int64) % 12 + 1  # 月份
+    df['release_date'] = dates.to_numpy()  # datetime格式的发布日期
+    df['release_year'] = years.astype(np.int16)  # 发布年份
+    df['release_month'] = months.astype(np.int8)  # 发布月份
+    df['release_year_month'] = (years * 100 + months).astype(np.int32)  # 发布年月（整数编码，分组比Period快）
+    return df, quarantine
+
+def parse_platform_mask(platforms):
+    """
+    将分号分隔的平台字符串（如"windows;mac"）解析为平台位掩码
+    只解析不重复的字符串（通常不超过7种组合），再按编码展开到每一行
+    返回int8数组
+    """
+    codes, uniques = pd.factorize(platforms)  # 不重复的平台字符串（缺失值编码为-1）
+    masks = np.array([sum(PLATFORM_BITS.get(token.strip().capitalize(), 0) for token in set(str(value).split(';')))  # 每种字符串的位掩码
+                      for value in uniques] + [0], dtype=np.int8)  # 末尾的0对应缺失值（编码-1）
+    return masks[codes]
+
+def parse_owners(owners_str):
+    """
+    处理owners字段,将范围字符串转换为(下界, 上界)
+    例如: "1000000-2000000" -> (1000000, 2000000)；单个数字的上下界相同，无法解析时为(0, 0)
+    """
+    try:
+        if '-' in str(owners_str):  # 检查是否为范围格式（包含连字符）
+            low, high = owners_str.split('-')  # 分割字符串，获取下限和上限
+            return float(int(low)), float(int(high))
+        else:
+            value = float(owners_str)  # 直接转换数字格式的销量
+            return value, value
+    except:
+        return 0.0, 0.0  # 异常情况返回0
+
+def parse_owner_bounds(owners):
+    """
+    将销量区间字符串解析为上下界数组
+    只解析不重复的字符串（通常只有十几种区间），再按编码展开到每一行
+    返回(下界数组, 上界数组)
+    """
+    codes, uniques = pd.factorize(owners, use_na_sentinel=False)  # 不重复的区间字符串（缺失值也作为一种取值，与逐行解析的结果一致）
+    bounds = np.array([parse_owners(value) for value in uniques], dtype=float).reshape(-1, 2)  # 每种字符串的上下界
+    return bounds[codes, 0], bounds[codes, 1]
+
+def preprocess_data(df, return_details=False):
+    """
+    对原始steam数据做预处理（日期、评价、销量、类型、平台）
+    供加载函数和历史快照入库共用；不修改传入的原始DataFrame
+    返回处理后的DataFrame；return_details为True时返回(DataFrame, {'date_quarantine': 被隔离的行, 'rating_prior': 评分先验参数})
+    """
     # 数据预处理 - 日期处理
-    df['release_date'] = pd.to_datetime(df['release_date'])  # 将release_date列转换为datetime格式
-    df['release_year'] = df['release_date'].dt.year  # 从日期中提取发布年份，创建新列
-    df['release_month'] = df['release_date'].dt.month  # 从日期中提取发布月份，创建新列
-    df['release_year_month'] = df['release_date'].dt.to_period('M')  # 从日期中提取年月周期，创建新列
+    df, quarantine = normalize_release_dates(df)  # 多格式解析日期并生成整数年、月、年月列，无法解析的行被隔离
+    if len(quarantine):  # 提示被隔离的行数
+        warnings.warn(f"{len(quarantine)} rows with missing or unparseable release dates were quarantined")
     
     # 数据预处理 - 评价相关计算
     df['total_ratings'] = df['positive_ratings'] + df['negative_ratings']  # 计算总评价数（好评+差评）
     df['positive_ratio'] = df['positive_ratings'] / df['total_ratings']  # 计算好评率（好评数/总评价数）
     df['positive_ratio'] = df['positive_ratio'].fillna(0)  # 处理空值，将NaN好评率填充为0
+    df, rating_prior = add_rating_quality(df)  # 一次向量化计算Wilson下界、贝叶斯收缩好评率和全局评分排名（评价少的游戏不再与评价多的游戏直接比较）
     
-    # 数据预处理 - 销量数据处理函数
-    def parse_owners(owners_str):
-        """
-        处理owners字段,将范围字符串转换为中值
-        例如: "1000000-2000000" -> 1500000
-        """
-        try:
-            if '-' in str(owners_str):  # 检查是否为范围格式（包含连字符）
-                low, high = owners_str.split('-')  # 分割字符串，获取下限和上限
-                return (int(low) + int(high)) / 2  # 返回范围中值作为估计销量
-            else:
-                return float(owners_str)  # 直接转换数字格式的销量
-        except:
-            return 0  # 异常情况返回0
-    
-    df['owners_median'] = df['owners'].apply(parse_owners)  # 应用销量处理函数，创建销量中值列
+    # 数据预处理 - 销量数据处理
+    owners_low, owners_high = parse_owner_bounds(df['owners'])  # 只解析不重复的销量区间字符串，保留区间上下界
+    df['owners_low'] = owners_low  # 销量区间下界
+    df['owners_high'] = owners_high  # 销量区间上界
+    df['owners_median'] = (owners_low + owners_high) / 2  # 销量区间中值作为估计销量
     
     # 数据预处理 - 游戏类型处理
     df['main_genre'] = df['genres'].str.split(';').str[0]  # 提取第一个类型作为主要游戏类型
     
     # 数据预处理 - 平台支持分析
-    df['windows_support'] = df['platforms'].str.contains('windows')  # 检查是否支持Windows平台
-    df['mac_support'] = df['platforms'].str.contains('mac')  # 检查是否支持Mac平台
-    df['linux_support'] = df['platforms'].str.contains('linux')  # 检查是否支持Linux平台
-    df['multi_platform'] = (df['windows_support'].astype(int) +  # 判断是否为多平台游戏（支持2个及以上平台）
-                           df['mac_support'].astype(int) + 
-                           df['linux_support'].astype(int)) >= 2
+    mask = parse_platform_mask(df['platforms'])  # 一次解析得到平台位掩码
+    df['platform_mask'] = mask  # 平台位掩码（Windows=1、Mac=2、Linux=4）
+    df['windows_support'] = (mask & PLATFORM_BITS['Windows']) != 0  # 是否支持Windows平台
+    df['mac_support'] = (mask & PLATFORM_BITS['Mac']) != 0  # 是否支持Mac平台
+    df['linux_support'] = (mask & PLATFORM_BITS['Linux']) != 0  # 是否支持Linux平台
+    df['multi_platform'] = PLATFORM_BIT_COUNTS[mask] >= 2  # 判断是否为多平台游戏（支持2个及以上平台）
     
     df['is_free'] = df['price'] == 0  # 价格为0的游戏标记为免费游戏
     
+    if return_details:  # 隔离记录和评分先验单独返回，不随DataFrame传递
+        return df, {'date_quarantine': quarantine, 'rating_prior': rating_prior}
     return df  # 返回处理后的DataFrame
\ No newline at end of file
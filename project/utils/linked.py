@@ -0,0 +1,121 @@
+import math  # 导入math用于年份取整
+import streamlit as st  # 导入streamlit用于显示联动图表和保存选择
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+from utils.prep import filters_cache_key  # 从utils.prep模块导入过滤条件规范化函数
+from utils.viz import create_time_trend_chart, create_genre_distribution_chart  # 从utils.viz模块导入可联动的图表
+
+LINKED_STATE_KEY = 'linked_selection'  # 会话状态中保存联动选择的键：过滤维度 -> 选择
+LINKED_CHARTS = {'time_trend': 'linked_year_range', 'genre_distribution': 'linked_genres'}  # 可联动的图表 -> 对应的过滤维度
+LINKED_DIMENSIONS = tuple(LINKED_CHARTS.values())  # 联动选择的过滤维度
+
+
+def linked_filters():
+    """
+    返回当前会话的联动选择，作为额外的过滤维度合并到侧边栏过滤条件中
+    """
+    selection = st.session_state.get(LINKED_STATE_KEY, {})
+    return {dim: selection.get(dim) for dim in LINKED_DIMENSIONS}
+
+
+def year_selection(event):
+    """
+    从年度趋势图的选择事件中提取年份范围（框选取x范围，点选取所选年份的最小、最大值）
+    返回(起始年, 结束年)，没有选择时返回None
+    """
+    selection = (event or {}).get('selection', {})
+    boxes = selection.get('box', [])
+    if boxes:  # 框选
+        x0, x1 = sorted(boxes[-1]['x'])
+        if math.ceil(x0) <= math.floor(x1):
+            return math.ceil(x0), math.floor(x1)
+    years = [int(point['x']) for point in selection.get('points', []) if 'x' in point]  # 点选
+    return (min(years), max(years)) if years else None
+
+
+def genre_selection(event):
+    """
+    从类型分布图（水平条形图）的选择事件中提取所选类型
+    返回排序后的类型列表，没有选择时返回None
+    """
+    genres = {point['y'] for point in (event or {}).get('selection', {}).get('points', []) if 'y' in point}
+    return sorted(genres) if genres else None
+
+
+SELECTION_PARSERS = {'linked_year_range': year_selection, 'linked_genres': genre_selection}  # 过滤维度 -> 选择事件解析函数
+
+
+def build_linked_time_trend(engine, filters):
+    """
+    构建联动的年度趋势图：数据只应用除年份选择外的过滤条件，选中的年份范围用阴影标出
+    """
+    fig = create_time_trend_chart(engine.frame_excluding(filters, 'linked_year_range'))
+    selected = filters.get('linked_year_range')
+    if selected:
+        fig.add_vrect(x0=selected[0] - 0.5, x1=selected[1] + 0.5, fillcolor='orange', opacity=0.2, line_width=0)  # 标出选中的年份
+    return fig
+
+
+def build_linked_genre_distribution(engine, filters):
+    """
+    构建联动的类型分布图：数据只应用除类型选择外的过滤条件，未选中的类型变淡
+    """
+    fig = create_genre_distribution_chart(engine.frame_excluding(filters, 'linked_genres'))
+    selected = filters.get('linked_genres')
+    if selected:
+        fig.update_traces(selectedpoints=[i for i, genre in enumerate(fig.data[0].y) if genre in selected])  # 只突出选中的类型
+    return fig
+
+
+LINKED_BUILDERS = {'time_trend': build_linked_time_trend, 'genre_distribution': build_linked_genre_distribution}  # 图表名 -> 联动图表构建函数
+
+
+def linked_figure_overrides(version, filters, engine):
+    """
+    生成LazyFigures的联动图表设置：每个联动图表的缓存键只包含除自身维度外的过滤条件和自身的选择
+    返回 图表名 -> (缓存键, 构建函数, 参数元组)
+    """
+    overrides = {}
+    for name, dim in LINKED_CHARTS.items():
+        context = {key: value for key, value in filters.items() if key != dim}  # 除自身维度外的过滤条件
+        key = ('linked', version, filters_cache_key(context), name, filters_cache_key({dim: filters.get(dim)}))
+        overrides[name] = (key, LINKED_BUILDERS[name], (engine, filters))
+    return overrides
+
+
+def show_linked_chart(fig, name):
+    """
+    显示可联动的图表：点选或框选后把选择保存为过滤维度，并重新运行整个应用使其他图表和指标随之更新
+    """
+    dim = LINKED_CHARTS[name]
+    event = st.plotly_chart(fig, use_container_width=True, on_select='rerun', selection_mode=('points', 'box'), key=f'linked_{name}_chart')  # 显示图表并接收选择事件
+    selected = SELECTION_PARSERS[dim](event)  # 用户的选择
+    current = st.session_state.get(LINKED_STATE_KEY, {}).get(dim)  # 已保存的选择
+    if selected is not None and selected != current:  # 新的选择：作为过滤维度应用到所有图表
+        st.session_state.setdefault(LINKED_STATE_KEY, {})[dim] = selected
+        st.rerun(scope='app')
+    st.caption(t("Click or drag on this chart to filter every other chart and metric; clear the selection in the sidebar."))
+
+
+def _clear_selection(dim):
+    """
+    清除一个联动选择（同时重置对应图表的选择状态，避免旧选择被再次应用）
+    """
+    st.session_state.get(LINKED_STATE_KEY, {}).pop(dim, None)
+    for name, chart_dim in LINKED_CHARTS.items():
+        if chart_dim == dim:
+            st.session_state.pop(f'linked_{name}_chart', None)
+
+
+def show_linked_selection():
+    """
+    在侧边栏显示当前的联动选择，每个选择可单独清除
+    """
+    filters = linked_filters()
+    if not any(filters.values()):
+        return
+    st.sidebar.markdown(t("**🔗 Linked Selection**"))
+    if filters['linked_year_range']:
+        start, end = filters['linked_year_range']
+        st.sidebar.button(t("✕ Years {start}–{end}", start=start, end=end), key='clear_linked_year_range', on_click=_clear_selection, args=('linked_year_range',))
+    if filters['linked_genres']:
+        st.sidebar.button(t("✕ Genres: {genres}", genres=', '.join(filters['linked_genres'])), key='clear_linked_genres', on_click=_clear_selection, args=('linked_genres',))
@@ -0,0 +1,184 @@
+import os  # 导入os用于读取内存预算配置
+import sys  # 导入sys用于估算普通对象大小
+import threading  # 导入threading用于保护跨会话共享的缓存
+import time  # 导入time用于记录计算耗时
+
+import numpy as np  # 导入numpy用于估算数组大小
+import pandas as pd  # 导入pandas用于估算DataFrame大小和整理统计结果
+
+MEMORY_BUDGET_MB = int(os.environ.get('STEAM_MEMORY_BUDGET_MB', 1024))  # 缓存总内存上限（MB），可通过环境变量配置
+MIN_COST = 1e-3  # 计算耗时的下限（秒），耗时可忽略的条目按纯LRU淘汰
+_MISSING = object()  # 未命中标记（缓存值本身可能为None）
+
+
+def estimate_size(value):
+    """
+    估算缓存对象占用的字节数（DataFrame含对象列的实际字符串大小）
+    返回字节数
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum()) if isinstance(value, pd.DataFrame) else int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if hasattr(value, 'data') and hasattr(value, 'indices') and hasattr(value, 'indptr'):  # scipy稀疏矩阵
+        return int(value.data.nbytes + value.indices.nbytes + value.indptr.nbytes)
+    return sys.getsizeof(value)
+
+
+class MemoryBudget:
+    """
+    进程内共享的内存预算：所有缓存产物（过滤结果、聚合结果、图表JSON、API响应）按命名空间存放，
+    总大小超过上限时按成本感知的LRU（GreedyDual-Size）淘汰：
+    优先级 = 全局时钟 + 计算耗时/字节数；访问时刷新优先级，淘汰优先级最低的条目并把时钟推进到该值，
+    因此长期未访问的条目先被淘汰，而单位字节重新计算代价高的条目保留更久
+    固定（pinned）条目只计入用量、不会被淘汰（如加载的数据集）
+    """
+
+    def __init__(self, capacity_bytes):
+        self.capacity = capacity_bytes  # 容量上限（字节）
+        self._lock = threading.RLock()  # 保护条目和统计
+        self._entries = {}  # (命名空间, 键) -> 条目字典
+        self._clock = 0.0  # GreedyDual时钟
+        self._usage = 0  # 当前总字节数
+        self._tick = 0  # 访问序号（优先级相同时先淘汰较早访问的条目）
+        self._stats = {}  # 命名空间 -> 命中、未命中、淘汰次数
+
+    def _counter(self, namespace):
+        """
+        返回命名空间的统计计数
+        """
+        return self._stats.setdefault(namespace, {'hits': 0, 'misses': 0, 'evictions': 0, 'rejected': 0})
+
+    def get(self, namespace, key, default=None):
+        """
+        读取缓存条目并刷新其优先级；未命中时返回default
+        """
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                self._counter(namespace)['misses'] += 1
+                return default
+            self._counter(namespace)['hits'] += 1
+            self._tick += 1
+            entry['priority'] = self._clock + entry['cost'] / entry['size']  # 访问后优先级回到时钟之上
+            entry['used'] = self._tick
+            return entry['value']
+
+    def put(self, namespace, key, value, cost=0.0, size=None, pinned=False):
+        """
+        存入缓存条目；cost为重新计算所需的秒数，size未提供时自动估算
+        超过总容量的非固定条目不会被缓存
+        返回value
+        """
+        size = max(int(size if size is not None else estimate_size(value)), 1)  # 条目大小
+        cost = max(float(cost), MIN_COST)  # 计算代价
+        with self._lock:
+            if not pinned and size > self.capacity:  # 单个条目就超过容量
+                self._counter(namespace)['rejected'] += 1
+                return value
+            self._remove((namespace, key))  # 替换旧条目
+            self._tick += 1
+            self._entries[(namespace, key)] = {'value': value, 'size': size, 'cost': cost, 'pinned': pinned,
+                                               'priority': self._clock + cost / size, 'used': self._tick}
+            self._usage += size
+            self._counter(namespace)  # 确保命名空间出现在统计中
+            self._evict()
+        return value
+
+    def get_or_compute(self, namespace, key, func, *args, **kwargs):
+        """
+        命中时返回缓存值，否则计算并按实际耗时作为代价存入
+        """
+        value = self.get(namespace, key, _MISSING)
+        if value is not _MISSING:
+            return value
+        start = time.perf_counter()  # 记录计算耗时
+        value = func(*args, **kwargs)
+        return self.put(namespace, key, value, cost=time.perf_counter() - start)
+
+    def contains(self, namespace, key):
+        """
+        判断条目是否存在（不影响统计和优先级）
+        """
+        with self._lock:
+            return (namespace, key) in self._entries
+
+    def discard(self, namespace, key):
+        """
+        删除条目
+        """
+        with self._lock:
+            self._remove((namespace, key))
+
+    def clear(self, namespace=None, pinned=False):
+        """
+        清空某个命名空间（或全部）的非固定条目；pinned=True时固定条目也一并删除
+        """
+        with self._lock:
+            for entry_key in [k for k, e in self._entries.items() if (pinned or not e['pinned']) and namespace in (None, k[0])]:
+                self._remove(entry_key)
+
+    def reset_stats(self):
+        """
+        清零各命名空间的命中、未命中和淘汰统计
+        """
+        with self._lock:
+            self._stats.clear()
+
+    def _remove(self, entry_key):
+        """
+        删除条目并更新用量（调用方持有锁）
+        """
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            self._usage -= entry['size']
+
+    def _evict(self):
+        """
+        总用量超过容量时依次淘汰优先级最低的非固定条目（调用方持有锁）
+        """
+        while self._usage > self.capacity:
+            candidates = [(e['priority'], e['used'], k) for k, e in self._entries.items() if not e['pinned']]  # 可淘汰的条目
+            if not candidates:  # 只剩固定条目
+                break
+            priority, _, victim = min(candidates)  # 优先级最低的条目（相同时取最久未访问的）
+            self._clock = priority  # 推进时钟，使其余条目的相对优先级随时间下降
+            self._remove(victim)
+            self._counter(victim[0])['evictions'] += 1
+
+    @property
+    def usage(self):
+        """
+        当前总字节数
+        """
+        return self._usage
+
+    def stats(self):
+        """
+        按命名空间汇总条目数、字节数和命中/淘汰统计
+        返回DataFrame
+        """
+        with self._lock:
+            rows = {}
+            for (namespace, _), entry in self._entries.items():
+                row = rows.setdefault(namespace, {'entries': 0, 'bytes': 0, 'pinned_bytes': 0})
+                row['entries'] += 1
+                row['bytes'] += entry['size']
+                if entry['pinned']:
+                    row['pinned_bytes'] += entry['size']
+            namespaces = sorted(set(rows) | set(self._stats))
+            table = pd.DataFrame([{'namespace': ns, **rows.get(ns, {'entries': 0, 'bytes': 0, 'pinned_bytes': 0}),
+                                   **self._counter(ns)} for ns in namespaces],
+                                 columns=['namespace', 'entries', 'bytes', 'pinned_bytes', 'hits', 'misses', 'evictions', 'rejected'])
+        lookups = table['hits'] + table['misses']  # 总查找次数
+        table['hit_rate'] = np.where(lookups > 0, table['hits'] / lookups.where(lookups > 0, 1), np.nan)  # 命中率
+        return table
+
+
+memory_budget = MemoryBudget(MEMORY_BUDGET_MB * 1024 * 1024)  # 进程内共享的内存预算（所有会话共用）
@@ -0,0 +1,111 @@
+import numpy as np  # 导入numpy用于向量化分组统计
+import pandas as pd  # 导入pandas用于结果整理
+from utils.buckets import BUCKET_SPECS, bucket_labels, bucket_codes, bucket_stats  # 从utils.buckets模块导入分桶函数
+
+PRICE_EDGES = BUCKET_SPECS['price']['edges']  # 付费游戏的价格区间边界（免费游戏单独成一档）
+PRICE_LABELS = bucket_labels('price')  # 价格区间标签
+PLATFORM_COMBINATIONS = ['None', 'Windows', 'Mac', 'Windows+Mac', 'Linux', 'Windows+Linux', 'Mac+Linux', 'Windows+Mac+Linux']  # 平台组合标签，下标为Windows=1、Mac=2、Linux=4的位组合
+MIN_CELL_GAMES = 5  # 参与排名的单元格最少游戏数，避免极小样本排到前面
+
+
+def price_bucket_codes(price):
+    """
+    将价格映射为价格区间编码（0为免费，其余按PRICE_EDGES划分，缺失价格为-1）
+    返回整数编码数组（分组前需排除-1）
+    """
+    return bucket_codes(price, 'price').astype(np.int64)  # 付费游戏按边界二分查找区间，价格为0的游戏归入免费档
+
+
+def platform_combination_codes(df):
+    """
+    返回平台组合编码（即预处理生成的platform_mask：Windows=1、Mac=2、Linux=4）
+    返回整数编码数组
+    """
+    return df['platform_mask'].to_numpy(dtype=np.int64)
+
+
+def summarize_platform_combinations(df):
+    """
+    按平台组合（如仅Windows、Windows+Linux）统计游戏数、占比、平均销量、平均好评率和平均游戏时长
+    所有组合一次bincount完成；不支持任何平台的组合只在有游戏时列出
+    返回按游戏数降序排列的DataFrame
+    """
+    codes = platform_combination_codes(df)  # 平台组合编码
+    n_combinations = len(PLATFORM_COMBINATIONS)  # 组合个数（含None）
+    game_count = np.bincount(codes, minlength=n_combinations)  # 每种组合的游戏数
+    with np.errstate(invalid='ignore', divide='ignore'):  # 没有游戏的组合均值为NaN
+        averages = {column: np.bincount(codes, weights=df[column].to_numpy(dtype=float), minlength=n_combinations) / game_count
+                    for column in ('owners_median', 'positive_ratio', 'average_playtime')}  # 各指标的组合均值
+    combos = pd.DataFrame({
+        'platforms': PLATFORM_COMBINATIONS,  # 组合标签
+        'game_count': game_count,  # 游戏数
+        'share': game_count / max(len(codes), 1),  # 占比
+        'avg_owners': averages['owners_median'],  # 平均销量
+        'avg_rating': averages['positive_ratio'],  # 平均好评率
+        'avg_playtime': averages['average_playtime']  # 平均游戏时长
+    })
+    combos = combos[(combos.index > 0) | (combos['game_count'] > 0)]  # 去掉空的None组合
+    return combos.sort_values('game_count', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def _rank_pct(values):
+    """
+    计算数值在所有单元格中的百分位排名（0-1）
+    返回百分位数组
+    """
+    return pd.Series(values).rank(pct=True).to_numpy()  # 平均法处理并列
+
+
+def score_market_opportunities(df, min_games=MIN_CELL_GAMES):
+    """
+    评估每个 类型×价格区间×平台组合 单元格的供给、需求和满意度
+    供给为游戏数，需求为平均销量，满意度为平均好评率；所有统计通过一次bincount完成
+    蓝海得分 = 需求百分位 + 满意度百分位 + (1 - 供给百分位)，取平均
+    返回按蓝海得分降序排列的DataFrame（只包含游戏数不少于min_games的单元格）
+    """
+    genre_codes, genres = pd.factorize(df['main_genre'])  # 类型编码
+    price_codes = price_bucket_codes(df['price'])  # 价格区间编码
+    platform_codes = platform_combination_codes(df)  # 平台组合编码
+
+    n_price, n_platform = len(PRICE_LABELS), len(PLATFORM_COMBINATIONS)  # 各维度的取值个数
+    valid = (genre_codes >= 0) & (price_codes >= 0)  # 排除类型或价格缺失的游戏（编码-1）
+    cell_ids = (genre_codes * n_price + price_codes) * n_platform + platform_codes  # 三维单元格的扁平编号
+    cell_ids = cell_ids[valid]
+    n_cells = len(genres) * n_price * n_platform  # 单元格总数
+
+    game_count = np.bincount(cell_ids, minlength=n_cells)  # 供给：每个单元格的游戏数
+    total_owners = np.bincount(cell_ids, weights=df['owners_median'].to_numpy(dtype=float)[valid], minlength=n_cells)  # 每个单元格的总销量
+    rating_sum = np.bincount(cell_ids, weights=df['positive_ratio'].to_numpy(dtype=float)[valid], minlength=n_cells)  # 每个单元格的好评率之和
+
+    occupied = np.flatnonzero(game_count >= max(min_games, 1))  # 只保留样本量足够的单元格
+    cells = pd.DataFrame({
+        'main_genre': np.asarray(genres)[occupied // (n_price * n_platform)],  # 还原类型
+        'price_range': np.asarray(PRICE_LABELS)[(occupied // n_platform) % n_price],  # 还原价格区间
+        'platforms': np.asarray(PLATFORM_COMBINATIONS)[occupied % n_platform],  # 还原平台组合
+        'game_count': game_count[occupied],  # 供给
+        'total_owners': total_owners[occupied],  # 总需求
+        'avg_owners': total_owners[occupied] / game_count[occupied],  # 平均每款游戏的需求
+        'avg_rating': rating_sum[occupied] / game_count[occupied]  # 满意度
+    })
+    if cells.empty:  # 没有满足条件的单元格
+        cells['opportunity_score'] = pd.Series(dtype=float)
+        return cells
+
+    cells['opportunity_score'] = (_rank_pct(cells['avg_owners'])  # 需求越高越好
+                                  + _rank_pct(cells['avg_rating'])  # 满意度越高越好
+                                  + (1 - _rank_pct(cells['game_count']))) / 3  # 供给越少竞争越小
+    return cells.sort_values('opportunity_score', ascending=False).reset_index(drop=True)
+
+
+def summarize_price_ranges(df):
+    """
+    按价格区间统计游戏数、平均销量和平均好评率（bincount实现）
+    返回按价格区间顺序排列的DataFrame
+    """
+    table = bucket_stats(df, bucket_codes(df['price'], 'price'), 'price', means=('owners_median', 'positive_ratio'))  # 每个指标一次bincount
+    return pd.DataFrame({
+        'price_range': PRICE_LABELS,  # 价格区间标签
+        'game_count': table['game_count'],  # 游戏数
+        'avg_owners': table['owners_median'],  # 平均销量
+        'avg_rating': table['positive_ratio']  # 平均好评率
+    })
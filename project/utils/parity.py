@@ -0,0 +1,228 @@
+import argparse  # 导入argparse用于命令行参数解析
+import os  # 导入os用于设置数据路径环境变量
+import subprocess  # 导入subprocess用于每个数据集在独立进程中检查
+import sys  # 导入sys用于获取解释器路径和退出码
+import tempfile  # 导入tempfile用于临时Parquet文件
+
+import numpy as np  # 导入numpy用于比较指标数值
+import pandas as pd  # 导入pandas用于比较表格
+
+ENTRY_POINTS = ('app.py', 'steam-analysis.py')  # 需要保持一致的入口脚本（英文界面和中文界面）
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # 入口脚本所在的project目录
+APP_TIMEOUT = 600  # 单次运行应用的超时时间（秒）
+VOLATILE_BLOCKS = {'memory_diagnostics'}  # 不参与比较的容器键：其中的数值来自进程内共享的缓存状态，同一进程中每次运行都不同
+
+
+def filter_scenarios(df):
+    """
+    根据数据集生成一组侧边栏过滤场景（控件在侧边栏中的顺序：搜索框、年份、价格、类型、平台）和图表联动选择
+    返回 场景名 -> {控件: 取值} 的字典
+    """
+    max_year = int(df['release_year'].max())  # 最新发布年份
+    genres = df['main_genre'].value_counts().index[:3].tolist()  # 最常见的3个类型
+    publisher = str(df['publisher'].value_counts().index[0])  # 游戏最多的发行商（保证搜索有结果）
+    return {
+        'default': {},  # 默认（不过滤）
+        'recent_cheap': {'year': (max(int(df['release_year'].min()), max_year - 5), max_year), 'price': (0.0, 20.0)},  # 近几年的低价游戏
+        'top_genres_mac': {'genres': genres, 'platforms': ['Mac']},  # 热门类型且支持Mac
+        'search': {'search': publisher},  # 关键词搜索
+        'linked': {'linked': {'linked_genres': genres[:2], 'linked_year_range': (max(int(df['release_year'].min()), max_year - 10), max_year)}},  # 图表联动选择的类型和年份
+    }
+
+
+def _apply_scenario(at, scenario):
+    """
+    在AppTest中设置侧边栏过滤控件
+    """
+    if 'linked' in scenario:  # 联动选择保存在会话状态中（与在图表中选择的效果相同）
+        at.session_state['linked_selection'] = dict(scenario['linked'])
+    if 'search' in scenario:
+        at.sidebar.text_input[0].set_value(scenario['search'])
+    if 'year' in scenario:
+        at.sidebar.slider[0].set_value(scenario['year'])
+    if 'price' in scenario:
+        at.sidebar.slider[1].set_value(scenario['price'])
+    if 'genres' in scenario:
+        at.sidebar.multiselect[0].set_value(scenario['genres'])
+    if 'platforms' in scenario:
+        at.sidebar.multiselect[1].set_value(scenario['platforms'])
+
+
+def stable_elements(node, kind):
+    """
+    按页面顺序收集某类元素（metric、dataframe），跳过VOLATILE_BLOCKS容器中的元素
+    返回元素列表
+    """
+    if getattr(node, 'key', None) in VOLATILE_BLOCKS and hasattr(node, 'children'):  # 随缓存状态变化的容器
+        return []
+    if getattr(node, 'type', None) == kind:
+        return [node]
+    return [element for child in getattr(node, 'children', {}).values() for element in stable_elements(child, kind)]
+
+
+def capture_outputs(script, scenario):
+    """
+    以无界面方式运行入口脚本并记录所有指标卡片的数值和所有表格（标签文字随界面语言不同，不参与比较；缓存诊断等随进程状态变化的输出除外）
+    返回{'metrics': 数值列表, 'tables': DataFrame列表, 'exceptions': 异常信息列表}
+    """
+    import streamlit as st  # 清空缓存，保证每个入口独立计算
+    from streamlit.testing.v1 import AppTest
+    from utils.memory import memory_budget
+
+    st.cache_data.clear()
+    memory_budget.clear(pinned=True)
+    memory_budget.reset_stats()  # 缓存诊断表中的命中统计也要从零开始
+    at = AppTest.from_file(os.path.join(SCRIPT_DIR, script), default_timeout=APP_TIMEOUT)
+    at.run()
+    if scenario and not at.exception:  # 设置过滤条件后重新运行
+        _apply_scenario(at, scenario)
+        at.run()
+    outputs = {'metrics': [], 'tables': [], 'exceptions': [e.message for e in at.exception]}
+    for label in [tab.label for tab in at.tabs]:  # 只有选中的标签页会运行，逐个切换标签页收集输出
+        at.session_state['active_tab'] = label
+        at.run()
+        outputs['metrics'] += [m.value for m in stable_elements(at._tree, 'metric')]
+        outputs['tables'] += [d.value for d in stable_elements(at._tree, 'dataframe')]
+        outputs['exceptions'] += [e.message for e in at.exception]
+    return outputs
+
+
+def compare_outputs(reference, candidate):
+    """
+    比较两个入口的输出
+    返回差异描述列表（为空表示一致）
+    """
+    problems = [f"exception: {message}" for message in reference['exceptions'] + candidate['exceptions']]
+    if reference['metrics'] != candidate['metrics']:
+        diffs = [(i, a, b) for i, (a, b) in enumerate(zip(reference['metrics'], candidate['metrics'])) if a != b]
+        problems.append(f"metrics differ ({len(reference['metrics'])} vs {len(candidate['metrics'])} cards): {diffs[:5]}")
+    if len(reference['tables']) != len(candidate['tables']):
+        problems.append(f"table count differs: {len(reference['tables'])} vs {len(candidate['tables'])}")
+    for i, (a, b) in enumerate(zip(reference['tables'], candidate['tables'])):
+        try:
+            pd.testing.assert_frame_equal(a, b)
+        except AssertionError as error:
+            problems.append(f"table {i} differs: {str(error).splitlines()[0]}")
+    return problems
+
+
+def scenario_filters(df, scenario):
+    """
+    将过滤场景转换为与create_sidebar_filters结构相同的过滤条件字典（包括联动选择），供查询后端使用
+    """
+    filters = {
+        'search_query': scenario.get('search', ''),
+        'year_range': scenario.get('year', (int(df['release_year'].min()), int(df['release_year'].max()))),
+        'price_range': scenario.get('price', (0.0, float(df['price'].max()))),
+        'selected_genres': scenario.get('genres', []),
+        'platform_options': scenario.get('platforms', []),
+    }
+    filters.update(scenario.get('linked', {}))
+    return filters
+
+
+def compare_metrics(reference, candidate):
+    """
+    比较两组关键指标（浮点数按相对误差比较，NaN视为相等）
+    返回不一致的指标名列表
+    """
+    differ = []
+    for key, value in reference.items():
+        other = candidate.get(key)
+        if isinstance(value, (float, np.floating)) and isinstance(other, (float, np.floating)):
+            same = np.isclose(value, other, equal_nan=True)
+        else:
+            same = value == other
+        if not same:
+            differ.append(key)
+    return differ
+
+
+def check_backends(df, scenarios):
+    """
+    对每个过滤场景比较查询后端（pandas，以及安装了duckdb时的DuckDB）的关键指标与应用计算的结果
+    DuckDB后端不支持搜索，带搜索词的场景必须明确报错而不是忽略搜索词
+    返回差异描述列表（为空表示一致）
+    """
+    from utils.backend import create_backend, compute_key_metrics, write_columnar_file
+    from utils.prep import apply_filters, calculate_key_metrics
+    from utils.search import build_search_index
+
+    search_index = build_search_index(df)
+    problems = []
+    with tempfile.TemporaryDirectory() as directory:
+        backends = {'pandas': create_backend('pandas', df, search_index=search_index)}
+        try:
+            import duckdb  # noqa: F401  可选依赖
+            path = os.path.join(directory, 'games.parquet')
+            write_columnar_file(df, path)
+            backends['duckdb'] = create_backend('duckdb', path)
+        except ImportError:
+            pass
+        for name, scenario in scenarios.items():
+            filters = scenario_filters(df, scenario)
+            reference = calculate_key_metrics(apply_filters(df, filters, search_index))  # 应用的计算结果
+            for kind, backend in backends.items():
+                if kind == 'duckdb' and filters['search_query'].strip():  # 搜索必须被拒绝
+                    try:
+                        compute_key_metrics(backend, filters)
+                        problems.append(f"[{name}] {kind}: search_query was ignored")
+                    except ValueError:
+                        pass
+                    continue
+                differ = compare_metrics(reference, compute_key_metrics(backend, filters))
+                if differ:
+                    problems.append(f"[{name}] {kind}: metrics differ: {differ}")
+    return problems
+
+
+def check_dataset(csv_path):
+    """
+    在当前进程中对一个数据集的所有过滤场景比较各入口的输出
+    返回是否全部一致
+    """
+    from utils.io import load_and_preprocess_data  # 数据路径已由环境变量STEAM_CSV指定
+
+    df = load_and_preprocess_data(csv_path)
+    ok = True
+    for name, scenario in filter_scenarios(df).items():
+        reference = capture_outputs(ENTRY_POINTS[0], scenario)  # 以app.py的输出为基准
+        for script in ENTRY_POINTS[1:]:
+            problems = compare_outputs(reference, capture_outputs(script, scenario))
+            status = "OK" if not problems else "MISMATCH"
+            print(f"{csv_path} [{name}] {script}: {status} "
+                  f"({len(reference['metrics'])} metrics, {len(reference['tables'])} tables)")
+            for problem in problems:
+                print(f"    {problem}")
+            ok = ok and not problems
+    problems = check_backends(df, filter_scenarios(df))  # 查询后端与应用的关键指标
+    print(f"{csv_path} backends: {'OK' if not problems else 'MISMATCH'}")
+    for problem in problems:
+        print(f"    {problem}")
+    return ok and not problems
+
+
+def main():
+    """
+    命令行入口：python -m utils.parity steam.csv [other.csv ...]
+    每个数据集在独立进程中运行（数据路径在模块导入时确定），任一数据集不一致时返回非零退出码
+    """
+    parser = argparse.ArgumentParser(description="Check that all dashboard entry points produce identical metrics and tables")
+    parser.add_argument('csv_paths', nargs='+', help="Fixed CSV datasets to compare on")
+    parser.add_argument('--single', action='store_true', help=argparse.SUPPRESS)  # 内部使用：在当前进程中检查单个数据集
+    args = parser.parse_args()
+
+    if args.single:
+        sys.exit(0 if check_dataset(args.csv_paths[0]) else 1)
+    failed = 0  # 不一致的数据集数
+    for csv_path in args.csv_paths:
+        csv_path = os.path.abspath(csv_path)
+        env = dict(os.environ, STEAM_CSV=csv_path)  # 让入口脚本读取该数据集
+        result = subprocess.run([sys.executable, '-m', 'utils.parity', '--single', csv_path], cwd=SCRIPT_DIR, env=env)
+        failed += result.returncode != 0
+    print(f"{len(args.csv_paths) - failed}/{len(args.csv_paths)} datasets consistent across {', '.join(ENTRY_POINTS)}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
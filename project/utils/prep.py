@@ -1,36 +1,44 @@
 import pandas as pd  # 导入pandas用于数据处理
 import numpy as np  # 导入numpy用于数值计算
 import streamlit as st  # 导入streamlit用于创建交互控件
+from utils.search import search_games  # 从utils.search模块导入游戏搜索函数
+from utils.io import PLATFORM_BITS  # 从utils.io模块导入平台位定义
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
 
 def create_sidebar_filters(df):
     """
     创建侧边栏过滤器控件
     返回包含用户选择过滤条件的字典 
     """
-    st.sidebar.header("🔧 Data Filters")  # 在侧边栏创建过滤器区域标题
+    st.sidebar.header(t("🔧 Data Filters"))  # 在侧边栏创建过滤器区域标题
+    
+    search_query = st.sidebar.text_input(
+        t("🔍 Search Games"),  # 搜索框标签文本
+        placeholder=t("Name, developer or publisher")  # 搜索框提示文本
+    )
     
     min_year = int(df['release_year'].min())  # 获取数据中最小的发布年份
     max_year = int(df['release_year'].max())  # 获取数据中最大的发布年份
     year_range = st.sidebar.slider(
-        "Select Release Year Range",  # 滑块标签文本
+        t("Select Release Year Range"),  # 滑块标签文本
         min_year, max_year, (min_year, max_year)  # 最小值, 最大值, 默认范围(全选)
     )
     
     max_price = float(df['price'].max())  # 获取数据中最高价格
     price_range = st.sidebar.slider(
-        "Select Price Range (USD)",  # 滑块标签文本
+        t("Select Price Range (USD)"),  # 滑块标签文本
         0.0, max_price, (0.0, max_price)  # 最小值, 最大值, 默认范围(0-最高价格)
     )
     
     all_genres = sorted(df['main_genre'].unique())  # 获取所有唯一的游戏类型并排序
     selected_genres = st.sidebar.multiselect(
-        "Select Game Genres",  # 多选框标签文本
+        t("Select Game Genres"),  # 多选框标签文本
         all_genres,  # 所有可选的游戏类型列表
         default=all_genres  # 默认选择所有类型
     )
     
     platform_options = st.sidebar.multiselect(
-        "Select Supported Platforms",  # 多选框标签文本
+        t("Select Supported Platforms"),  # 多选框标签文本
         ['Windows', 'Mac', 'Linux'],  # 所有可选的平台列表
         default=['Windows','Mac', 'Linux']  # 默认全选所有平台
     )
@@ -39,55 +47,107 @@ def create_sidebar_filters(df):
         'year_range': year_range,  # 用户选择的年份范围
         'price_range': price_range,  # 用户选择的价格范围
         'selected_genres': selected_genres,  # 用户选择的游戏类型列表
-        'platform_options': platform_options  # 用户选择的平台列表
+        'platform_options': platform_options,  # 用户选择的平台列表
+        'search_query': search_query  # 用户输入的搜索关键词
     }
 
 
-def apply_filters(df, filters):
+def filters_cache_key(filters):
     """
-    根据侧边栏选择的过滤条件筛选数据
-    返回过滤后的DataFrame
+    将过滤条件字典规范化为可哈希的键（列表转为排序后的元组），用于跨会话共享计算结果
+    返回元组；filters为None时返回None
+    """
+    if filters is None:
+        return None
+    return tuple(sorted(
+        (name, tuple(sorted(value)) if isinstance(value, list) else tuple(value) if isinstance(value, tuple) else value)
+        for name, value in filters.items()
+    ))
+
+
+def platform_selection_bits(platform_options):
     """
-    filtered_df = df.copy()  # 创建数据副本，避免修改原始数据
+    将所选平台列表转换为位组合（如['Windows', 'Linux'] -> 5）
+    """
+    return sum(PLATFORM_BITS[p] for p in set(platform_options) if p in PLATFORM_BITS)
+
+
+def filter_mask(df, filters, search_index=None):
+    """
+    根据侧边栏选择的过滤条件计算行掩码（不复制数据，导出时按块取出选中的行）
+    search_index为build_search_index构建的索引，提供时才应用搜索过滤
+    返回布尔数组
+    """
+    mask = np.ones(len(df), dtype=bool)  # 初始选中所有行
+    
+    # 应用搜索过滤 - 通过倒排索引查找匹配的游戏，避免逐行字符串扫描
+    if search_index is not None and filters.get('search_query', '').strip():  # 提供了索引且搜索框非空
+        matched_labels = search_games(search_index, filters['search_query'])  # 查询索引获取匹配游戏的索引标签
+        mask &= df.index.isin(matched_labels)  # 只保留匹配的游戏
     
     # 应用年份过滤 - 只保留在用户选择年份范围内的游戏
-    filtered_df = filtered_df[
-        (filtered_df['release_year'] >= filters['year_range'][0]) &  # 年份大于等于选择的最小值
-        (filtered_df['release_year'] <= filters['year_range'][1])  # 年份小于等于选择的最大值
-    ]
+    years = df['release_year'].to_numpy()
+    mask &= (years >= filters['year_range'][0]) & (years <= filters['year_range'][1])  # 年份在选择的范围内
     
     # 应用价格过滤 - 只保留在用户选择价格范围内的游戏
-    filtered_df = filtered_df[
-        (filtered_df['price'] >= filters['price_range'][0]) &  # 价格大于等于选择的最小值
-        (filtered_df['price'] <= filters['price_range'][1])  # 价格小于等于选择的最大值
-    ]
+    prices = df['price'].to_numpy()
+    mask &= (prices >= filters['price_range'][0]) & (prices <= filters['price_range'][1])  # 价格在选择的范围内
     
     # 应用游戏类型过滤 - 如果用户选择了特定类型，只保留这些类型
     if filters['selected_genres']:  # 检查用户是否选择了游戏类型
-        filtered_df = filtered_df[filtered_df['main_genre'].isin(filters['selected_genres'])]  # 筛选指定类型的游戏
+        mask &= df['main_genre'].isin(filters['selected_genres']).to_numpy()  # 筛选指定类型的游戏
     
     # 应用平台过滤 - 根据用户选择的平台进行筛选
-    platform_filters = []  # 存储平台过滤条件的列表
-    if 'Windows' in filters['platform_options']:  # 如果用户选择了Windows平台
-        platform_filters.append(filtered_df['windows_support'] == True)  # 添加Windows支持条件
-    if 'Mac' in filters['platform_options']:  # 如果用户选择了Mac平台
-        platform_filters.append(filtered_df['mac_support'] == True)  # 添加Mac支持条件
-    if 'Linux' in filters['platform_options']:  # 如果用户选择了Linux平台
-        platform_filters.append(filtered_df['linux_support'] == True)  # 添加Linux支持条件
-    
-    if platform_filters:  # 如果有平台过滤条件
-        platform_filter = platform_filters[0]  # 第一个过滤条件
-        for pf in platform_filters[1:]:  # 遍历剩余过滤条件
-            platform_filter = platform_filter | pf  # 使用OR逻辑组合条件（支持任一平台即可）
-        filtered_df = filtered_df[platform_filter]  # 应用组合过滤条件
-    
-    return filtered_df  # 返回过滤后的数据
+    selected_bits = platform_selection_bits(filters['platform_options'])  # 所选平台的位组合
+    if selected_bits:  # 如果有平台过滤条件
+        mask &= (df['platform_mask'].to_numpy() & selected_bits) != 0  # 一次按位与：支持任一所选平台即可
+    
+    # 应用图表联动选择 - 在年度趋势图中选择的年份范围、在类型分布图中选择的类型
+    if filters.get('linked_year_range'):  # 联动选择的年份范围
+        mask &= (years >= filters['linked_year_range'][0]) & (years <= filters['linked_year_range'][1])
+    if filters.get('linked_genres'):  # 联动选择的类型
+        mask &= df['main_genre'].isin(filters['linked_genres']).to_numpy()
+    
+    return mask
+
+def apply_filters(df, filters, search_index=None):
+    """
+    根据侧边栏选择的过滤条件筛选数据
+    search_index为build_search_index构建的索引，提供时才应用搜索过滤
+    返回过滤后的DataFrame
+    """
+    return df[filter_mask(df, filters, search_index)]  # 按掩码一次取出选中的行（返回新的DataFrame，不修改原始数据）
+
+def empty_metrics():
+    """
+    空选择（如没有命中的搜索）的关键指标：计数为0，均值和极值为NaN或None
+    返回与calculate_key_metrics键相同的指标字典
+    """
+    return {
+        'total_games': 0, 'free_game_percentage': np.nan, 'avg_rating': np.nan, 'year_range': "N/A",
+        'peak_year': None, 'peak_year_count': 0, 'avg_price': np.nan, 'median_price': np.nan,
+        'windows_games': 0, 'mac_games': 0, 'linux_games': 0, 'multi_platform_games': 0,
+        'top_genres': [], 'unique_genres': 0,
+        'peak_month': None, 'peak_month_count': 0, 'slow_month': None, 'slow_month_count': 0,
+    }
+
+def require_games(df):
+    """
+    当前选择为空时显示提示并返回False，标签页不再用空数据构建图表
+    """
+    if len(df) == 0:
+        st.info(t("No games match the current filters. Clear the search or widen the filters in the sidebar."))
+        return False
+    return True
 
 def calculate_key_metrics(df):
     """
-    计算关键指标和统计数据
+    计算关键指标和统计数据（空选择返回empty_metrics）
     返回包含各种指标的字典
     """
+    if len(df) == 0:  # 没有选中的游戏（如搜索没有命中）：没有峰值年份和月份
+        return empty_metrics()
+    
     metrics = {}  # 存储指标的字典
     
     # 基础统计指标
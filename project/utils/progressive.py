@@ -0,0 +1,150 @@
+import numpy as np  # 导入numpy用于向量化分箱和二分查找
+import pandas as pd  # 导入pandas用于数据处理
+import streamlit as st  # 导入streamlit用于渲染图表和保存选择范围
+from streamlit.runtime.scriptrunner import get_script_run_ctx  # 导入运行上下文，判断当前是否为局部重跑
+from utils.memory import memory_budget  # 从utils.memory模块导入共享内存预算
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+
+MAX_DETAIL_POINTS = 3000  # 范围内游戏数不超过此值时显示全部明细点
+OVERVIEW_BINS = 60  # 概览图每个坐标轴的分箱数
+
+
+def sorted_index(values):
+    """
+    构建按数值排序的索引，用于按范围快速查找行
+    返回(排序后的行位置, 排序后的数值)
+    """
+    values = np.asarray(values, dtype=float)  # 转为浮点数组
+    order = np.argsort(values, kind='stable')  # 稳定排序，相同数值保持原有顺序
+    return order, values[order]
+
+
+def view_sorted_index(df, name, x_col, view_key=None):
+    """
+    返回图表数据x列的排序索引，按视图（数据版本和过滤条件）和图表保存在内存预算中，框选缩放等重跑时不再重新排序
+    view_key为None时现场构建
+    """
+    if view_key is None:
+        return sorted_index(df[x_col])
+    return memory_budget.get_or_compute('views', ('sorted_index', view_key, name, x_col), sorted_index, df[x_col])
+
+
+def rows_in_range(df, x_col, y_col, x_range=None, y_range=None, index=None):
+    """
+    通过排序索引二分查找x范围内的行，再按y范围过滤
+    index为sorted_index(df[x_col])的结果，未提供时现场构建
+    返回范围内行的位置数组（按x排序）
+    """
+    order, sorted_x = index if index is not None else sorted_index(df[x_col])  # 排序索引
+    if x_range is None:  # 不限x范围
+        positions = order
+    else:
+        lo = np.searchsorted(sorted_x, x_range[0], side='left')  # 范围起点
+        hi = np.searchsorted(sorted_x, x_range[1], side='right')  # 范围终点
+        positions = order[lo:hi]  # 只取范围内的行，不扫描其余数据
+    if y_range is not None:  # 按y范围过滤
+        y = df[y_col].to_numpy(dtype=float)[positions]
+        positions = positions[(y >= y_range[0]) & (y <= y_range[1])]
+    return positions
+
+
+def bin_points(df, x_col, y_col, bins=OVERVIEW_BINS, group_col=None):
+    """
+    将散点聚合为 (分组×)x分箱×y分箱 的单元格，所有统计一次bincount完成
+    每个单元格用点的质心代表，count为单元格内的游戏数
+    返回DataFrame（列：x_col、y_col、count，以及分组列）
+    """
+    x = df[x_col].to_numpy(dtype=float)  # x坐标
+    y = df[y_col].to_numpy(dtype=float)  # y坐标
+    if len(x) == 0:  # 没有数据
+        return pd.DataFrame(columns=[x_col, y_col, 'count'] + ([group_col] if group_col else []))
+
+    def bin_codes(values):
+        low, high = values.min(), values.max()  # 当前数据的范围
+        width = (high - low) or 1.0  # 所有值相同时避免除以0
+        return np.clip(((values - low) / width * bins).astype(np.int64), 0, bins - 1)
+
+    if group_col:  # 分组（如小倍数图的分面）
+        group_codes, groups = pd.factorize(df[group_col])
+        bins = max(10, int(bins / np.sqrt(len(groups))))  # 每个分面的图更小，分箱相应减少，保持单元格总数与不分组时相近
+    else:
+        group_codes, groups = np.zeros(len(x), dtype=np.int64), np.array([None])
+    cells = (group_codes * bins + bin_codes(x)) * bins + bin_codes(y)  # 单元格的扁平编号
+    n_cells = len(groups) * bins * bins  # 单元格总数
+    count = np.bincount(cells, minlength=n_cells)  # 每个单元格的点数
+    occupied = np.flatnonzero(count)  # 只保留有点的单元格
+    frame = pd.DataFrame({
+        x_col: np.bincount(cells, weights=x, minlength=n_cells)[occupied] / count[occupied],  # 质心x
+        y_col: np.bincount(cells, weights=y, minlength=n_cells)[occupied] / count[occupied],  # 质心y
+        'count': count[occupied]  # 游戏数
+    })
+    if group_col:
+        frame[group_col] = np.asarray(groups)[occupied // (bins * bins)]  # 还原分组
+    return frame
+
+
+def progressive_frame(df, x_col, y_col, x_range=None, y_range=None, group_col=None, max_points=MAX_DETAIL_POINTS, bins=OVERVIEW_BINS, index=None):
+    """
+    按当前查看范围选择分辨率：范围内游戏数不超过max_points时返回明细行，
+    否则返回范围内的分箱概览（范围越小，分箱越细）
+    index为sorted_index(df[x_col])的结果，未提供时现场构建
+    返回(数据DataFrame, 是否为明细, 范围内游戏数)
+    """
+    positions = rows_in_range(df, x_col, y_col, x_range, y_range, index)  # 范围内的行
+    subset = df.iloc[positions]  # 范围内的数据
+    if len(subset) <= max_points:  # 数量足够少，发送全部明细
+        return subset, True, len(subset)
+    return bin_points(subset, x_col, y_col, bins, group_col), False, len(subset)
+
+
+def selection_range(event):
+    """
+    从st.plotly_chart的选择事件中提取最近一次框选的x、y范围
+    返回((x0, x1), (y0, y1))，没有框选时返回None
+    """
+    if not event:
+        return None
+    boxes = event.get('selection', {}).get('box', [])  # 框选区域列表
+    if not boxes:
+        return None
+    box = boxes[-1]  # 最近一次框选
+    x, y = sorted(box['x']), sorted(box['y'])  # 拖拽方向不同时坐标可能颠倒
+    return (float(x[0]), float(x[1])), (float(y[0]), float(y[1]))
+
+
+def rerun_current():
+    """
+    重新运行当前范围：在标签页局部重跑（st.fragment）中只重跑该片段，否则重跑整个应用
+    """
+    ctx = get_script_run_ctx()  # 当前运行上下文
+    st.rerun(scope='fragment' if ctx is not None and ctx.fragment_ids_this_run else 'app')
+
+
+def show_progressive_chart(df, name, x_col, y_col, make_figure, group_col=None, max_points=MAX_DETAIL_POINTS, view_key=None):
+    """
+    渐进式渲染散点图：首次显示分箱概览，用户框选后只取范围内的行并提高分辨率，
+    范围内游戏数足够少时显示全部明细；选择范围保存在会话状态中
+    make_figure(数据, 是否明细)返回图表对象；view_key为当前视图的缓存键（排序索引按视图只构建一次）
+    """
+    state_key = f'progressive_{name}_range'  # 会话状态中保存查看范围的键
+    x_range, y_range = st.session_state.get(state_key, (None, None))  # 当前查看范围
+    index = view_sorted_index(df, name, x_col, view_key)  # x列的排序索引
+    points, detail, total = progressive_frame(df, x_col, y_col, x_range, y_range, group_col, max_points, index=index)  # 按范围选择分辨率
+
+    fig = make_figure(points, detail)  # 生成图表
+    fig.update_layout(dragmode='select')  # 默认拖拽即框选
+    event = st.plotly_chart(fig, use_container_width=True, on_select='rerun', selection_mode='box', key=f'progressive_{name}_chart')  # 显示图表并接收框选事件
+    selected = selection_range(event)  # 用户框选的范围
+    if selected is not None and selected != (x_range, y_range):  # 新的框选：保存范围并以更高分辨率重新渲染
+        st.session_state[state_key] = selected
+        rerun_current()
+
+    if detail:  # 明细模式
+        st.caption(t("Showing all {total:,} games in this range at full detail.", total=total))
+    else:  # 概览模式
+        st.caption(t("Overview: {total:,} games aggregated into {cells:,} cells (marker size = number of games). "
+                     "Drag a box to zoom in; ranges with at most {max_points:,} games are shown point by point.",
+                     total=total, cells=len(points), max_points=max_points))
+    if x_range is not None and st.button(t("Reset view"), key=f'progressive_{name}_reset'):  # 恢复完整范围
+        st.session_state.pop(state_key, None)
+        rerun_current()
@@ -0,0 +1,119 @@
+import numpy as np  # 导入numpy用于向量化计算评分和分组统计
+import pandas as pd  # 导入pandas用于结果整理
+import streamlit as st  # 导入streamlit用于显示高分排行榜
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+
+RATING_Z = 1.96  # Wilson下界的z值（95%置信水平）
+PRIOR_WEIGHT_QUANTILE = 0.5  # 贝叶斯收缩的先验权重：有评价游戏的评价数中位数（相当于先加入这么多条平均水平的评价）
+RATING_COLUMNS = ['wilson_score', 'bayes_rating', 'rating_rank']  # 加载时预先计算的评分列（依赖整个目录，可重新推导）
+RATING_BASES = {'Review-weighted': 'weighted_ratio', 'Bayesian': 'bayes_rating', 'Mean ratio': 'mean_ratio'}  # 分组评分口径 -> 列名
+LEADERBOARD_COLUMNS = ['rating_rank', 'name', 'main_genre', 'publisher', 'total_ratings', 'positive_ratio', 'wilson_score', 'bayes_rating']  # 排行榜显示的列
+
+
+def wilson_lower_bound(positive, total, z=RATING_Z):
+    """
+    计算好评率的Wilson置信区间下界（向量化）：评价越少，下界离观测好评率越远
+    没有评价的游戏为0
+    返回float数组
+    """
+    positive = np.asarray(positive, dtype=float)
+    total = np.asarray(total, dtype=float)
+    n = np.maximum(total, 1)  # 避免除以0（没有评价的游戏最后置为0）
+    p = positive / n  # 观测好评率
+    z2 = z * z
+    bound = (p + z2 / (2 * n) - z * np.sqrt(p * (1 - p) / n + z2 / (4 * n * n))) / (1 + z2 / n)
+    return np.where(total > 0, bound, 0.0)
+
+
+def bayesian_ratings(positive, total, prior_mean=None, prior_weight=None):
+    """
+    计算贝叶斯收缩后的好评率：(好评数 + 先验权重 × 先验均值) / (评价数 + 先验权重)
+    先验均值默认为整个目录的总好评率，先验权重默认为有评价游戏的评价数中位数；没有评价的游戏等于先验均值
+    返回(评分数组, 先验均值, 先验权重)
+    """
+    positive = np.asarray(positive, dtype=float)
+    total = np.asarray(total, dtype=float)
+    if prior_mean is None:  # 目录的总好评率（按评价数加权）
+        prior_mean = positive.sum() / total.sum() if total.sum() > 0 else 0.0
+    if prior_weight is None:  # 有评价游戏的评价数中位数
+        reviewed = total[total > 0]
+        prior_weight = float(np.quantile(reviewed, PRIOR_WEIGHT_QUANTILE)) if len(reviewed) else 1.0
+    return (positive + prior_weight * prior_mean) / (total + prior_weight), float(prior_mean), float(prior_weight)
+
+
+def add_rating_quality(df):
+    """
+    为整个目录一次性计算评分列：Wilson下界、贝叶斯收缩好评率和按Wilson下界的全局排名（1为最好，相同时评价数多的在前）
+    排名是预先计算的列，过滤后的视图按排名取前k个即可，不需要每次重跑时重新排序
+    返回(添加了评分列的DataFrame, 先验参数字典{'mean', 'weight'})
+    """
+    positive = df['positive_ratings'].to_numpy(dtype=float)
+    total = df['total_ratings'].to_numpy(dtype=float)
+    wilson = wilson_lower_bound(positive, total)
+    bayes, prior_mean, prior_weight = bayesian_ratings(positive, total)
+    order = np.lexsort((-total, -wilson))  # 按Wilson下界降序，相同时按评价数降序（稳定排序）
+    rank = np.empty(len(df), dtype=np.int32)
+    rank[order] = np.arange(1, len(df) + 1, dtype=np.int32)  # 每行的全局排名
+    df['wilson_score'] = wilson  # Wilson置信区间下界
+    df['bayes_rating'] = bayes  # 贝叶斯收缩后的好评率
+    df['rating_rank'] = rank  # 全局排名
+    return df, {'mean': prior_mean, 'weight': prior_weight}
+
+
+def top_rated(df, k=25, min_reviews=0):
+    """
+    按预先计算的全局排名取前k个游戏：argpartition只做一次部分选择，再对这k行排序
+    返回按排名排序的DataFrame
+    """
+    ranks = df['rating_rank'].to_numpy()
+    positions = np.flatnonzero(df['total_ratings'].to_numpy() >= min_reviews) if min_reviews else np.arange(len(df))  # 满足最少评价数的行
+    k = min(k, len(positions))
+    if k == 0:  # 没有满足条件的游戏
+        return df.iloc[[]]
+    top = positions[np.argpartition(ranks[positions], k - 1)[:k]]  # 排名最靠前的k行（无序）
+    return df.iloc[top[np.argsort(ranks[top])]]
+
+
+def group_ratings(df, by):
+    """
+    按by分组统计评分（每个指标一次bincount）：
+    mean_ratio为好评率的简单平均；weighted_ratio为按评价数加权的好评率（总好评数/总评价数）；bayes_rating为贝叶斯收缩好评率的平均
+    返回按游戏数降序排列的DataFrame
+    """
+    codes, groups = pd.factorize(df[by])  # 分组编码（缺失值为-1）
+    valid = codes >= 0
+    codes = codes[valid]
+    n = len(groups)
+    game_count = np.bincount(codes, minlength=n)  # 每组游戏数
+
+    def total_of(column):  # 每组的列合计
+        return np.bincount(codes, weights=df[column].to_numpy(dtype=float)[valid], minlength=n)
+
+    positive, reviews = total_of('positive_ratings'), total_of('total_ratings')
+    with np.errstate(invalid='ignore', divide='ignore'):  # 没有评价的分组加权好评率为NaN
+        table = pd.DataFrame({
+            by: np.asarray(groups, dtype=object),
+            'game_count': game_count,  # 游戏数
+            'review_count': reviews.astype(np.int64),  # 评价总数
+            'mean_ratio': total_of('positive_ratio') / game_count,  # 简单平均好评率
+            'weighted_ratio': positive / reviews,  # 按评价数加权的好评率
+            'bayes_rating': total_of('bayes_rating') / game_count,  # 贝叶斯收缩好评率的平均
+        })
+    return table.sort_values(['game_count', by], ascending=[False, True]).reset_index(drop=True)
+
+
+def show_rating_leaderboard(df, prior=None):
+    """
+    显示高分游戏排行榜：按预先计算的Wilson下界排名取前k个，评价很少的游戏不会因为偶然的100%好评排到前面
+    prior为加载时计算的评分先验参数（用于说明文字）
+    """
+    st.subheader(t("🏆 Top-rated Games"))
+    col1, col2 = st.columns(2)
+    k = col1.selectbox(t("Games to show"), [10, 25, 50, 100], index=1, key='leaderboard_k')  # 排行榜长度
+    min_reviews = col2.number_input(t("Minimum reviews"), min_value=0, value=0, step=10, key='leaderboard_min_reviews')  # 最少评价数
+    leaders = top_rated(df, k, int(min_reviews))
+    st.dataframe(leaders[LEADERBOARD_COLUMNS], use_container_width=True, hide_index=True)
+    if prior:  # 说明排名依据和先验参数
+        st.caption(t("Ranked by the Wilson 95% lower bound of the positive ratio; rating_rank is the rank in the full catalogue. "
+                     "The Bayesian rating adds {weight:,.0f} reviews at the catalogue average ({mean:.1f}%) to every game.",
+                     weight=prior['weight'], mean=prior['mean'] * 100))
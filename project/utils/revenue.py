@@ -0,0 +1,72 @@
+import numpy as np  # 导入numpy用于批量区间运算和分组求和
+import pandas as pd  # 导入pandas用于结果整理
+import streamlit as st  # 导入streamlit用于价格比例输入控件
+from utils.buckets import bucket_codes, bucket_labels  # 从utils.buckets模块导入价格分桶函数
+from utils.memory import memory_budget  # 从utils.memory模块导入共享内存预算
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+
+REVENUE_DIMENSIONS = {'Genre': 'main_genre', 'Publisher': 'publisher', 'Release year': 'release_year', 'Price range': 'price'}  # 收入汇总维度 -> 分组列（价格按价格区间分组）
+DEFAULT_PRICE_SHARE = (1.0, 1.0)  # 实际到手价格占标价的比例区间（默认按标价计算毛收入）
+
+
+def estimate_revenue(df, price_share=DEFAULT_PRICE_SHARE):
+    """
+    按销量区间和价格批量计算每款游戏的收入区间（区间乘法：价格和销量都非负，下界乘下界、上界乘上界）
+    price_share为实际到手价格占标价的比例区间（如扣除平台分成和折扣后为(0.5, 0.7)）
+    返回 {'low', 'mid', 'high'} -> float数组
+    """
+    price = df['price'].to_numpy(dtype=float)
+    share_low, share_high = price_share
+    low = price * share_low * df['owners_low'].to_numpy(dtype=float)  # 价格下界 × 销量下界
+    high = price * share_high * df['owners_high'].to_numpy(dtype=float)  # 价格上界 × 销量上界
+    mid = price * (share_low + share_high) / 2 * df['owners_median'].to_numpy(dtype=float)  # 区间中点
+    return {'low': low, 'mid': mid, 'high': high}
+
+
+def revenue_by(df, estimates, dim):
+    """
+    按维度汇总收入区间（每个界一次bincount；区间的和等于各界分别求和）
+    dim为REVENUE_DIMENSIONS中的名称
+    返回DataFrame（列：分组、game_count、paid_games、revenue_low、revenue_mid、revenue_high），价格区间按区间顺序，其余按中值降序
+    """
+    column = REVENUE_DIMENSIONS[dim]
+    if column == 'price':  # 价格按价格区间分组
+        codes, groups = bucket_codes(df['price'], 'price').astype(np.int64), np.asarray(bucket_labels('price'), dtype=object)
+    else:
+        codes, groups = pd.factorize(df[column], sort=column == 'release_year')  # 分组编码（缺失值为-1）
+        groups = np.asarray(groups, dtype=object)
+    valid = codes >= 0
+    codes = codes[valid]
+    n = len(groups)
+    table = pd.DataFrame({
+        dim: groups,
+        'game_count': np.bincount(codes, minlength=n),  # 游戏数
+        'paid_games': np.bincount(codes, weights=(df['price'].to_numpy(dtype=float)[valid] > 0), minlength=n).astype(np.int64),  # 付费游戏数
+        **{f'revenue_{bound}': np.bincount(codes, weights=np.nan_to_num(values[valid]), minlength=n) for bound, values in estimates.items()},  # 收入区间各界的合计
+    })
+    if column != 'price' and column != 'release_year':  # 类型和发行商按收入中值排序
+        table = table.sort_values(['revenue_mid', dim], ascending=[False, True]).reset_index(drop=True)
+    return table
+
+
+def view_revenue(df, view_key, price_share=DEFAULT_PRICE_SHARE):
+    """
+    返回当前视图的收入区间，按视图（数据版本和过滤条件）和价格比例保存在内存预算中
+    """
+    return memory_budget.get_or_compute('views', ('revenue', view_key, tuple(price_share)), estimate_revenue, df, price_share)
+
+
+def revenue_totals(estimates):
+    """
+    返回收入区间各界的合计 {'low', 'mid', 'high'}
+    """
+    return {bound: float(np.nansum(values)) for bound, values in estimates.items()}
+
+
+def price_share_input(key):
+    """
+    显示实际到手价格比例的区间滑块（默认为标价，即毛收入）
+    返回(下界, 上界)
+    """
+    return st.slider(t("Realized share of list price"), 0.0, 1.0, DEFAULT_PRICE_SHARE, 0.05, key=key,
+                     help=t("Net revenue after the platform fee and discounts, as a share of the list price. Widen the range to carry that uncertainty into the estimates."))
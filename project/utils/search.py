@@ -0,0 +1,133 @@
+import numpy as np  # 导入numpy用于倒排索引的数组运算
+import pandas as pd  # 导入pandas用于向量化的文本规范化
+import streamlit as st  # 导入streamlit用于缓存索引对象
+
+SEARCH_FIELDS = {'name': 3.0, 'developer': 1.0, 'publisher': 1.0}  # 参与索引的字段及其权重（名称命中最重要）
+PREFIX_WEIGHT = 0.8  # 前缀匹配的得分折扣
+FUZZY_WEIGHT = 0.5  # 拼写容错匹配的得分折扣
+FUZZY_MIN_LENGTH = 4  # 只有长度不小于4的词才启用拼写容错，避免短词误匹配
+
+
+def normalize_text(series):
+    """
+    将文本列规范化为小写、以空格分隔的词序列
+    返回规范化后的Series
+    """
+    return (series.fillna('').astype(str).str.lower()  # 缺失值填充为空串并统一小写
+            .str.replace(r'[\W_]+', ' ', regex=True)  # 所有非字母数字字符替换为空格
+            .str.strip())  # 去掉首尾空格
+
+
+def _deletes(token):
+    """
+    生成词的所有单字符删除变体（SymSpell编辑距离1）
+    返回变体集合
+    """
+    return {token[:i] + token[i + 1:] for i in range(len(token))}  # 逐位删除一个字符
+
+
+@st.cache_resource(show_spinner=False)  # 索引只在数据加载后构建一次，并在会话之间共享同一对象
+def build_search_index(df):
+    """
+    基于name、developer、publisher构建内存倒排索引
+    返回包含词表、倒排表（CSR格式）和拼写容错表的索引字典
+    """
+    n_rows = len(df)  # 数据行数
+    fields = df[list(SEARCH_FIELDS)].reset_index(drop=True)  # 使用行位置作为索引，便于倒排表存储
+    parts = []  # 存储每个字段展开后的(行位置, 词, 权重)
+    for field, weight in SEARCH_FIELDS.items():  # 遍历每个索引字段
+        tokens = normalize_text(fields[field]).str.split().explode().dropna()  # 分词并展开为长表
+        parts.append(pd.DataFrame({
+            'row': tokens.index.to_numpy(),  # 行位置
+            'token': tokens.to_numpy(),  # 词
+            'weight': weight  # 字段权重
+        }))
+    postings = pd.concat(parts, ignore_index=True)  # 合并所有字段
+    postings = postings.sort_values('weight', ascending=False).drop_duplicates(['row', 'token'])  # 同一行同一词只保留最高权重
+
+    vocab, token_ids = np.unique(postings['token'].to_numpy(dtype=str), return_inverse=True)  # 排序后的词表及每条记录的词编号
+    order = np.argsort(token_ids, kind='stable')  # 按词编号排序，得到CSR倒排表
+    offsets = np.searchsorted(token_ids[order], np.arange(len(vocab) + 1))  # 每个词在倒排表中的起止位置
+
+    fuzzy = {}  # 删除变体 -> 词编号列表
+    for token_id, token in enumerate(vocab):  # 遍历词表构建拼写容错表
+        if len(token) >= FUZZY_MIN_LENGTH:  # 只为足够长的词生成变体
+            for variant in _deletes(token) | {token}:  # 包含词本身及其删除变体
+                fuzzy.setdefault(variant, []).append(token_id)
+
+    return {
+        'vocab': vocab,  # 排序词表，用于前缀二分查找
+        'offsets': offsets,  # CSR偏移量
+        'rows': postings['row'].to_numpy(dtype=np.int32)[order],  # 倒排表中的行位置
+        'weights': postings['weight'].to_numpy(dtype=np.float32)[order],  # 倒排表中的字段权重
+        'fuzzy': fuzzy,  # 拼写容错表
+        'labels': df.index.to_numpy(),  # 行位置到DataFrame索引标签的映射
+        'popularity': df['owners_median'].to_numpy(dtype=np.float64) if 'owners_median' in df else np.zeros(n_rows)  # 得分相同时按销量排序
+    }
+
+
+def _match_token(index, token, allow_prefix):
+    """
+    查找单个查询词命中的行：精确匹配、前缀匹配、拼写容错匹配
+    返回(行位置数组, 得分数组)，每行只保留最高得分
+    """
+    vocab, offsets = index['vocab'], index['offsets']  # 词表和偏移量
+    lo = np.searchsorted(vocab, token, side='left')  # 词在排序词表中的起始位置
+    if allow_prefix:  # 前缀匹配：所有以token开头的词在词表中连续排列
+        hi = np.searchsorted(vocab, token + '\U0010ffff', side='left')  # 前缀区间的结束位置
+    else:
+        hi = lo + 1 if lo < len(vocab) and vocab[lo] == token else lo  # 只取精确命中的词
+
+    if hi > lo:  # 存在精确或前缀命中
+        rows = index['rows'][offsets[lo]:offsets[hi]]  # 命中词的倒排表是一段连续切片
+        weights = index['weights'][offsets[lo]:offsets[hi]].copy()  # 对应的字段权重
+        exact = lo < len(vocab) and vocab[lo] == token  # 判断是否有精确命中的词
+        if exact:
+            weights[offsets[lo + 1] - offsets[lo]:] *= PREFIX_WEIGHT  # 精确词之后的部分均为前缀命中，打折
+        else:
+            weights *= PREFIX_WEIGHT  # 全部为前缀命中
+    elif len(token) >= FUZZY_MIN_LENGTH:  # 无精确/前缀命中时启用拼写容错
+        token_ids = set()  # 候选词编号
+        for variant in _deletes(token) | {token}:  # 查询词及其删除变体
+            token_ids.update(index['fuzzy'].get(variant, ()))
+        if not token_ids:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)  # 没有任何命中
+        slices = [np.arange(offsets[t], offsets[t + 1]) for t in token_ids]  # 每个候选词的倒排表区间
+        positions = np.concatenate(slices)  # 合并所有区间
+        rows = index['rows'][positions]  # 命中的行位置
+        weights = index['weights'][positions] * FUZZY_WEIGHT  # 拼写容错命中打折
+    else:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)  # 短词且无命中
+
+    order = np.argsort(-weights, kind='stable')  # 按得分从高到低排列
+    rows, first = np.unique(rows[order], return_index=True)  # 每行只保留得分最高的命中
+    return rows, weights[order][first]
+
+
+def search_games(index, query, limit=None):
+    """
+    在索引中搜索游戏，支持多词、前缀和拼写容错查询
+    所有查询词都必须命中（AND语义），最后一个词按前缀匹配
+    返回按相关度排序的DataFrame索引标签数组
+    """
+    tokens = normalize_text(pd.Series([query])).iloc[0].split()  # 规范化并切分查询
+    if not tokens:  # 空查询不返回结果
+        return index['labels'][:0]
+
+    all_rows, all_scores = [], []  # 收集每个查询词的命中
+    for i, token in enumerate(tokens):  # 逐个处理查询词
+        rows, scores = _match_token(index, token, allow_prefix=(i == len(tokens) - 1))  # 最后一个词视为正在输入，按前缀匹配
+        if len(rows) == 0:  # 任一词无命中则整体无结果
+            return index['labels'][:0]
+        all_rows.append(rows)
+        all_scores.append(scores)
+
+    rows, inverse, counts = np.unique(np.concatenate(all_rows), return_inverse=True, return_counts=True)  # 统计每行命中的查询词数
+    scores = np.bincount(inverse, weights=np.concatenate(all_scores))  # 累加每行得分
+    keep = counts == len(tokens)  # 只保留命中全部查询词的行
+    rows, scores = rows[keep], scores[keep]
+
+    order = np.lexsort((-index['popularity'][rows], -scores))  # 先按得分，再按销量降序排列
+    if limit is not None:
+        order = order[:limit]  # 截取前limit个结果
+    return index['labels'][rows[order]]
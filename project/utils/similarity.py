@@ -0,0 +1,144 @@
+import numpy as np  # 导入numpy用于数值计算
+import pandas as pd  # 导入pandas用于数据处理
+import scipy.sparse as sp  # 导入scipy稀疏矩阵用于标签向量和批量点积
+import streamlit as st  # 导入streamlit用于缓存索引对象
+
+TAG_FIELDS = {'genres': 1.0, 'categories': 0.5, 'steamspy_tags': 1.0}  # 参与相似度计算的标签字段及其权重
+NUMERIC_FEATURES = ['price', 'positive_ratio', 'owners_median', 'average_playtime']  # 参与相似度计算的数值特征
+LOG_FEATURES = ['price', 'owners_median', 'average_playtime']  # 长尾分布的数值特征先取对数
+NUMERIC_WEIGHT = 0.35  # 数值特征块在最终向量中的权重（标签块权重为1）
+
+
+def build_tag_matrix(series, weight=1.0):
+    """
+    将分号分隔的标签字符串列转换为稀疏的游戏×标签矩阵
+    返回(CSR稀疏矩阵, 标签名称数组)
+    """
+    tokens = series.fillna('').astype(str).reset_index(drop=True).str.split(';').explode()  # 切分标签并展开为长表
+    tokens = tokens.str.strip()  # 去掉标签两侧空格
+    tokens = tokens[tokens != '']  # 去掉空标签
+    codes, names = pd.factorize(tokens, sort=True)  # 标签编码
+    matrix = sp.csr_matrix(
+        (np.full(len(codes), weight, dtype=np.float32), (tokens.index.to_numpy(), codes)),  # 每个(游戏, 标签)对记一次
+        shape=(len(series), len(names))
+    )
+    matrix.sum_duplicates()  # 同一游戏重复的标签合并
+    matrix.data[:] = weight  # 合并后仍保持0/权重的二值取值
+    return matrix, np.asarray(names)
+
+
+def _l2_normalize_rows(matrix):
+    """
+    将稀疏矩阵每行归一化为单位长度（全零行保持不变）
+    返回归一化后的CSR矩阵
+    """
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())  # 每行的L2范数
+    norms[norms == 0] = 1.0  # 避免除以0
+    return sp.diags(1.0 / norms).dot(matrix).tocsr()  # 左乘对角矩阵完成按行缩放
+
+
+@st.cache_resource(show_spinner=False)  # 相似度索引每个数据版本只构建一次
+def build_similarity_index(df):
+    """
+    构建游戏相似度索引：TF-IDF加权的标签稀疏向量 + 标准化数值特征
+    所有行向量归一化后，余弦相似度即为点积
+    返回包含特征矩阵及其转置的索引字典
+    """
+    blocks = []  # 存储各字段的稀疏块
+    feature_names = []  # 存储特征名称
+    for field, weight in TAG_FIELDS.items():  # 遍历每个标签字段
+        matrix, names = build_tag_matrix(df[field], weight)  # 构建该字段的标签矩阵
+        doc_freq = np.bincount(matrix.indices, minlength=matrix.shape[1])  # 每个标签出现的游戏数
+        idf = np.log((1 + len(df)) / (1 + doc_freq)) + 1  # 平滑IDF，稀有标签权重更高
+        blocks.append(matrix.dot(sp.diags(idf.astype(np.float32))))  # 按列乘以IDF
+        feature_names.extend(f"{field}:{name}" for name in names)  # 记录带字段前缀的标签名称
+    tags = _l2_normalize_rows(sp.hstack(blocks).tocsr())  # 标签块按行归一化
+
+    numeric = df[NUMERIC_FEATURES].astype(float).fillna(0).copy()  # 提取数值特征
+    numeric[LOG_FEATURES] = np.log1p(numeric[LOG_FEATURES].clip(lower=0))  # 长尾特征取对数
+    numeric = (numeric - numeric.mean()) / numeric.std(ddof=0).replace(0, 1)  # 标准化为z分数
+    numeric = numeric.to_numpy(dtype=np.float32) * (NUMERIC_WEIGHT / np.sqrt(len(NUMERIC_FEATURES)))  # 缩放数值块权重
+    feature_names.extend(NUMERIC_FEATURES)  # 记录数值特征名称
+
+    features = _l2_normalize_rows(sp.hstack([tags, sp.csr_matrix(numeric)]).tocsr().astype(np.float32))  # 拼接后整体归一化
+    return {
+        'features': features,  # 游戏×特征的CSR矩阵（行已归一化）
+        'features_t': features.T.tocsc(),  # 稀疏转置矩阵（特征×游戏的CSC，与features共享非零项），按列块切片后再转为稠密
+        'feature_names': np.asarray(feature_names),  # 特征名称
+        'labels': df.index.to_numpy(),  # 行位置到DataFrame索引标签的映射
+        'names': df['name'].to_numpy(),  # 游戏名称，便于无界面调用时直接输出可读结果
+        'positions': pd.Series(np.arange(len(df)), index=df.index)  # 索引标签到行位置的映射
+    }
+
+
+def _candidate_mask(index, candidate_labels):
+    """
+    将候选索引标签转换为行位置的布尔掩码
+    返回布尔数组，未指定候选时返回None
+    """
+    if candidate_labels is None:
+        return None
+    return np.isin(index['labels'], np.asarray(candidate_labels))  # 标记候选行
+
+
+def _top_k(scores, k):
+    """
+    对相似度矩阵的每一行取前k个最大值（argpartition避免完整排序）
+    返回(行位置矩阵, 得分矩阵)，按得分降序排列
+    """
+    k = min(k, scores.shape[1])  # k不能超过候选数量
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64), np.empty((scores.shape[0], 0), dtype=scores.dtype)
+    part = np.argpartition(scores, -k, axis=1)[:, -k:]  # 每行前k个（无序），避免对整行取负产生副本
+    part_scores = np.take_along_axis(scores, part, axis=1)  # 对应的得分
+    order = np.argsort(-part_scores, axis=1, kind='stable')  # 在k个元素内排序
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+def find_similar_games(index, label, k=10, candidate_labels=None):
+    """
+    查找与指定游戏最相似的k个游戏（无需Streamlit，可直接调用）
+    candidate_labels可限制推荐范围（例如当前过滤结果）
+    返回包含索引标签和相似度得分的DataFrame
+    """
+    position = index['positions'][label]  # 查询游戏的行位置
+    scores = index['features'].dot(index['features_t'][:, [position]].toarray()).ravel()  # 一次稀疏矩阵×稠密向量乘积得到全部相似度
+    scores[position] = -np.inf  # 排除游戏本身
+    mask = _candidate_mask(index, candidate_labels)  # 候选范围掩码
+    if mask is not None:
+        scores[~mask] = -np.inf  # 排除候选范围外的游戏
+    k = min(k, int(np.isfinite(scores).sum()))  # 候选不足k个时缩小k
+    rows, top_scores = _top_k(scores[np.newaxis, :], k)  # 取前k个
+    return pd.DataFrame({
+        'label': index['labels'][rows[0]],  # 相似游戏的索引标签
+        'similarity': top_scores[0]  # 余弦相似度
+    })
+
+
+def batch_similar_games(index, k=10, batch_size=1024):
+    """
+    批量计算每个游戏的前k个相似游戏
+    按批次计算：每批的特征行与转置矩阵的列块转为稠密后相乘，不保存完整的稠密转置矩阵，控制中间结果的内存占用
+    返回长表DataFrame：source（源游戏标签）、source_name、rank、similar（相似游戏标签）、similar_name、similarity
+    """
+    features, features_t, labels, names = index['features'], index['features_t'], index['labels'], index['names']  # 特征矩阵、转置、标签和名称
+    n_rows = features.shape[0]  # 游戏总数
+    k = min(k, n_rows - 1)  # 排除自身后最多n-1个
+    all_rows = np.empty((n_rows, k), dtype=np.int64)  # 存储每个游戏的相似游戏行位置
+    all_scores = np.empty((n_rows, k), dtype=np.float32)  # 存储对应得分
+    for start in range(0, n_rows, batch_size):  # 按批次处理
+        stop = min(start + batch_size, n_rows)  # 批次结束位置
+        rows = features[start:stop].toarray()  # 当前批次的稠密特征行
+        scores = np.empty((stop - start, n_rows), dtype=np.float32)  # 批次×全部游戏的相似度矩阵
+        for col in range(0, n_rows, batch_size):  # 转置矩阵按列块转为稠密，临时内存为特征数×batch_size
+            scores[:, col:col + batch_size] = rows @ features_t[:, col:col + batch_size].toarray()
+        scores[np.arange(stop - start), np.arange(start, stop)] = -np.inf  # 排除自身
+        all_rows[start:stop], all_scores[start:stop] = _top_k(scores, k)  # 每行取前k个
+    return pd.DataFrame({
+        'source': np.repeat(labels, k),  # 源游戏标签
+        'source_name': np.repeat(names, k),  # 源游戏名称
+        'rank': np.tile(np.arange(1, k + 1), n_rows),  # 相似度排名
+        'similar': labels[all_rows.ravel()],  # 相似游戏标签
+        'similar_name': names[all_rows.ravel()],  # 相似游戏名称
+        'similarity': all_scores.ravel()  # 余弦相似度
+    })
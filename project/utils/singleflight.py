@@ -0,0 +1,135 @@
+import threading  # 导入threading用于跨会话线程同步
+import time  # 导入time用于计算等待超时
+
+POLL_SECONDS = 0.1  # 等待者检查超时和取消的间隔
+DEFAULT_TIMEOUT = 120  # 默认最长等待时间（秒）
+
+
+class FlightTimeout(TimeoutError):
+    """
+    等待其他调用者的计算超时
+    """
+
+
+class FlightCancelled(Exception):
+    """
+    等待者主动取消了等待
+    """
+
+
+class _Flight:
+    """
+    一次进行中的计算：等待者通过done事件获取结果或异常
+    """
+
+    def __init__(self):
+        self.done = threading.Event()  # 计算结束的信号
+        self.result = None  # 计算结果
+        self.error = None  # 计算抛出的普通异常（传递给所有等待者）
+        self.abandoned = False  # 领头者被中断（如会话重新运行），等待者需要重新发起计算
+        self.waiters = 0  # 当前等待者数量
+        self.leader = threading.current_thread()  # 领头者线程（由领头者创建），等待者据此检查领头者是否仍在运行
+
+
+class SingleFlight:
+    """
+    单飞去重：相同键的并发调用只由第一个调用者（领头者）在自己的线程中计算一次，
+    其余调用者等待并共享同一个结果；结果不在计算结束后保留（缓存由调用方负责）
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()  # 保护进行中计算的字典
+        self._flights = {}  # 键 -> 进行中的计算
+
+    def run(self, key, func, *args, timeout=DEFAULT_TIMEOUT, should_cancel=None, **kwargs):
+        """
+        执行func(*args, **kwargs)，相同key的并发调用共享一次计算
+        等待超过timeout秒时抛出FlightTimeout；should_cancel返回True时抛出FlightCancelled
+        领头者被BaseException（如Streamlit的停止/重新运行）中断，或领头者线程未发出完成信号就已结束时，
+        等待者中的一个接替重新计算，不必等到超时
+        返回计算结果
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout  # 等待截止时间
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)  # 是否已有相同的计算在进行
+                leader = flight is None
+                if leader:  # 没有则由当前调用者计算
+                    flight = self._flights[key] = _Flight()
+                else:
+                    flight.waiters += 1
+            if leader:
+                return self._lead(key, flight, func, args, kwargs)
+            try:
+                self._wait(key, flight, deadline, should_cancel)
+            finally:
+                with self._lock:
+                    flight.waiters -= 1
+            if flight.abandoned:  # 领头者被中断，重新竞争领头者
+                continue
+            if flight.error is not None:  # 计算失败，所有等待者得到同一个异常
+                raise flight.error
+            return flight.result
+
+    def _lead(self, key, flight, func, args, kwargs):
+        """
+        领头者执行计算并通知所有等待者
+        """
+        try:
+            flight.result = func(*args, **kwargs)
+            return flight.result
+        except Exception as error:  # 普通异常传递给等待者
+            flight.error = error
+            raise
+        except BaseException:  # 中断（取消、重新运行、退出）不传递，让等待者接替
+            flight.abandoned = True
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]  # 后续调用重新计算
+            flight.done.set()
+
+    def _abandon(self, key, flight):
+        """
+        将领头者已不在运行的计算标记为放弃并移除，唤醒所有等待者重新竞争领头者
+        """
+        with self._lock:
+            if flight.done.is_set():  # 已经结束（正常完成或已被其他等待者放弃）
+                return
+            flight.abandoned = True
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.done.set()
+
+    def _wait(self, key, flight, deadline, should_cancel):
+        """
+        分段等待计算结束，每段之间检查领头者是否存活、超时和取消
+        """
+        while not flight.done.wait(POLL_SECONDS if deadline is None else max(0.0, min(POLL_SECONDS, deadline - time.monotonic()))):
+            if not flight.leader.is_alive():  # 领头者线程结束前总会发出完成信号；线程已结束但没有信号说明领头者已失效
+                self._abandon(key, flight)
+                return
+            if should_cancel is not None and should_cancel():  # 调用方取消等待
+                raise FlightCancelled()
+            if deadline is not None and time.monotonic() >= deadline:  # 等待超时
+                raise FlightTimeout("Timed out waiting for in-flight computation")
+
+    def waiting(self, key):
+        """
+        返回某个键当前的等待者数量（无进行中的计算时为0）
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            return flight.waiters if flight is not None else 0
+
+
+_default_group = SingleFlight()  # 进程内共享的默认单飞组（所有Streamlit会话共用）
+
+
+def single_flight(key, func, *args, **kwargs):
+    """
+    使用进程内默认单飞组执行计算（参数同SingleFlight.run）
+    返回计算结果
+    """
+    return _default_group.run(key, func, *args, **kwargs)
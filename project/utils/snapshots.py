@@ -0,0 +1,279 @@
+import argparse  # 导入argparse用于命令行入库和查询
+import json  # 导入json用于读写快照清单
+import os  # 导入os用于文件路径处理
+import pandas as pd  # 导入pandas用于数据处理
+import pyarrow as pa  # 导入pyarrow用于列式存储
+import pyarrow.parquet as pq  # 导入pyarrow.parquet用于读写Parquet分区
+from utils.io import preprocess_data  # 从utils.io模块导入与应用共用的预处理函数
+from utils.ratings import RATING_COLUMNS  # 从utils.ratings模块导入依赖整个目录的评分列
+
+SNAPSHOT_KEY = 'appid'  # 快照中唯一标识游戏的键
+DELETED_COLUMN = '_deleted'  # 墓碑标记列：该游戏在此快照中被移除
+MANIFEST_FILE = 'manifest.json'  # 快照清单文件名
+KEYFRAME_INTERVAL = 7  # 每隔多少个快照写一次完整快照，其余只写变化的行
+PARTITION_FILE = 'part-0.parquet'  # 每个日期分区内的数据文件名
+
+
+def _read_manifest(store_dir):
+    """
+    读取快照清单（按日期升序）
+    返回清单条目列表，每条包含date、kind、rows、columns
+    """
+    path = os.path.join(store_dir, MANIFEST_FILE)  # 清单文件路径
+    if not os.path.exists(path):  # 新的快照库还没有清单
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_manifest(store_dir, entries):
+    """
+    原子地写入快照清单（先写临时文件再替换），避免写入中断导致清单损坏
+    """
+    path = os.path.join(store_dir, MANIFEST_FILE)  # 清单文件路径
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(entries, f, indent=2)
+    os.replace(path + '.tmp', path)  # 原子替换
+
+
+def _partition_path(store_dir, snapshot_date):
+    """
+    返回某个快照日期分区的数据文件路径
+    """
+    return os.path.join(store_dir, f"snapshot_date={snapshot_date}", PARTITION_FILE)
+
+
+def _normalize_date(value):
+    """
+    将日期统一为ISO格式字符串（YYYY-MM-DD），字符串比较即可按时间排序
+    """
+    return pd.Timestamp(value).date().isoformat()
+
+
+def _prepare_snapshot(df):
+    """
+    整理待入库的快照：去掉无法列式存储的列（如Period）和依赖整个目录的评分列，按appid排序并去重
+    返回整理后的DataFrame
+    """
+    period_columns = [c for c in df.columns if isinstance(df[c].dtype, pd.PeriodDtype)]  # Period列可由日期重新推导，不入库
+    rating_columns = [c for c in RATING_COLUMNS if c in df.columns]  # 评分排名随任一游戏变化，入库会让几乎所有行都算作变化；可重新推导，不入库
+    frame = df.drop(columns=period_columns + rating_columns).drop_duplicates(SNAPSHOT_KEY, keep='last')  # 每个appid只保留一行
+    frame = frame.sort_values(SNAPSHOT_KEY).reset_index(drop=True)  # 按appid排序，appid的增量编码才紧凑
+    frame[DELETED_COLUMN] = False  # 正常行的墓碑标记为False
+    return frame
+
+
+def _changed_rows(previous, current):
+    """
+    对比上一快照的完整状态与当前快照，找出新增、变化和被移除的游戏
+    返回只包含这些行的DataFrame（被移除的游戏写为墓碑行）
+    """
+    columns = [c for c in current.columns if c not in (SNAPSHOT_KEY, DELETED_COLUMN)]  # 参与对比的列
+    prev = previous.set_index(SNAPSHOT_KEY).reindex(columns=columns)  # 上一状态，列与当前快照对齐
+    cur = current.set_index(SNAPSHOT_KEY)[columns]  # 当前快照
+    common = cur.index.intersection(prev.index)  # 两个快照都有的游戏
+    a, b = cur.loc[common], prev.loc[common]  # 对齐后的新旧值
+    unchanged = ((a == b) | (a.isna() & b.isna())).all(axis=1)  # 所有列都相同（含同为缺失）的行
+    added = cur.index.difference(prev.index)  # 新上架的游戏
+    removed = prev.index.difference(cur.index)  # 被移除的游戏
+
+    rows = pd.concat([cur.loc[added], a[~unchanged.to_numpy()]])  # 新增行和变化行
+    rows[DELETED_COLUMN] = False
+    tombstones = pd.DataFrame(index=removed, columns=columns).astype(cur.dtypes.to_dict(), errors='ignore')  # 墓碑行（其余列为空）
+    tombstones[DELETED_COLUMN] = True
+    rows = pd.concat([rows, tombstones]) if len(tombstones) else rows
+    rows.index.name = SNAPSHOT_KEY
+    return rows.reset_index().sort_values(SNAPSHOT_KEY).reset_index(drop=True)
+
+
+def _write_partition(store_dir, snapshot_date, rows):
+    """
+    将一个快照分区写为Parquet：appid使用增量编码（DELTA_BINARY_PACKED），其余列使用字典编码，整体zstd压缩
+    """
+    path = _partition_path(store_dir, snapshot_date)  # 分区文件路径
+    os.makedirs(os.path.dirname(path), exist_ok=True)  # 创建分区目录
+    table = pa.Table.from_pandas(rows, preserve_index=False)  # 转为Arrow表
+    dictionary_columns = [c for c in table.column_names if c != SNAPSHOT_KEY]  # appid不用字典编码
+    pq.write_table(table, path,
+                   compression='zstd',  # zstd压缩
+                   use_dictionary=dictionary_columns,  # 低基数字段使用字典编码
+                   column_encoding={SNAPSHOT_KEY: 'DELTA_BINARY_PACKED'})  # 排序后的appid增量编码
+
+
+def ingest_snapshot(store_dir, snapshot_date, df=None, csv_path=None):
+    """
+    将一份带日期的数据副本追加到快照库
+    df为已预处理的DataFrame；只提供csv_path时读取原始CSV并复用preprocess_data预处理
+    每KEYFRAME_INTERVAL个快照写一次完整快照，其余只写与上一快照相比变化的行
+    返回该快照的清单条目
+    """
+    if df is None:  # 未提供DataFrame时从原始CSV读取并预处理
+        df = preprocess_data(pd.read_csv(csv_path))
+    snapshot_date = _normalize_date(snapshot_date)  # 规范化日期
+    os.makedirs(store_dir, exist_ok=True)  # 创建快照库目录
+    entries = _read_manifest(store_dir)  # 已有快照
+    if entries and snapshot_date <= entries[-1]['date']:  # 快照库只允许按日期追加
+        raise ValueError(f"Snapshot store is append-only: {snapshot_date} is not after the latest snapshot {entries[-1]['date']}")
+
+    frame = _prepare_snapshot(df)  # 整理待入库数据
+    last_full = max((i for i, e in enumerate(entries) if e['kind'] == 'full'), default=None)  # 最近一次完整快照的位置
+    if last_full is None or len(entries) - last_full >= KEYFRAME_INTERVAL:  # 需要写完整快照
+        kind, rows = 'full', frame
+    else:  # 只写变化的行
+        previous = snapshot_as_of(store_dir, entries[-1]['date'])  # 上一快照的完整状态
+        kind, rows = 'delta', _changed_rows(previous, frame)
+
+    _write_partition(store_dir, snapshot_date, rows)  # 写入分区
+    entry = {'date': snapshot_date, 'kind': kind, 'rows': len(rows), 'total_rows': len(frame),
+             'columns': [c for c in frame.columns if c != DELETED_COLUMN]}  # 清单条目
+    _write_manifest(store_dir, entries + [entry])  # 分区写完后再更新清单，保证清单中的快照都是完整的
+    return entry
+
+
+def list_snapshots(store_dir):
+    """
+    列出快照库中的所有快照
+    返回清单DataFrame
+    """
+    return pd.DataFrame(_read_manifest(store_dir), columns=['date', 'kind', 'rows', 'total_rows', 'columns'])
+
+
+def _chain(entries, as_of_date):
+    """
+    找到重建某日期状态所需的快照链：该日期之前最近的完整快照及其后的增量快照
+    返回清单条目列表
+    """
+    upto = [e for e in entries if e['date'] <= as_of_date]  # 不晚于查询日期的快照
+    if not upto:
+        raise ValueError(f"No snapshot on or before {as_of_date}")
+    start = max(i for i, e in enumerate(upto) if e['kind'] == 'full')  # 最近的完整快照
+    return upto[start:]
+
+
+def _read_chain(store_dir, chain, columns=None, appids=None):
+    """
+    读取快照链中的分区：只读取需要的列，并把appid过滤下推到Parquet读取
+    返回(带_snapshot日期列的长表DataFrame（按快照顺序排列）, 完整快照中各列的数据类型)
+    """
+    parts = []  # 每个分区读取的结果
+    for entry in chain:  # 依次读取快照链中的分区
+        wanted = entry['columns'] if columns is None else [c for c in columns if c in entry['columns'] and c != SNAPSHOT_KEY]  # 该分区中存在的所需列
+        read_columns = [SNAPSHOT_KEY, DELETED_COLUMN] + [c for c in wanted if c != SNAPSHOT_KEY]  # 实际读取的列
+        filters = [(SNAPSHOT_KEY, 'in', list(appids))] if appids is not None else None  # appid过滤条件
+        table = pq.read_table(_partition_path(store_dir, entry['date']), columns=read_columns, filters=filters)  # 列裁剪 + 谓词下推
+        parts.append(table.to_pandas().assign(_snapshot=entry['date']))
+    return pd.concat(parts, ignore_index=True), parts[0].dtypes  # 墓碑行会让整数列变为浮点，保留完整快照的类型用于还原
+
+
+def _restore_dtypes(state, dtypes):
+    """
+    去掉墓碑行后，把列的数据类型还原为完整快照中的类型
+    返回还原类型后的DataFrame
+    """
+    restorable = {c: dtypes[c] for c in state.columns if c in dtypes.index and state[c].dtype != dtypes[c] and not state[c].isna().any()}  # 不含缺失值才能安全还原
+    return state.astype(restorable) if restorable else state
+
+
+def snapshot_as_of(store_dir, as_of_date, columns=None, appids=None):
+    """
+    查询某日期时的数据状态（time-travel查询）
+    只读取最近完整快照及其后的增量分区，并且只读所需列和所需appid
+    返回按appid排序的DataFrame
+    """
+    chain = _chain(_read_manifest(store_dir), _normalize_date(as_of_date))  # 重建所需的快照链
+    combined, dtypes = _read_chain(store_dir, chain, columns, appids)  # 读取快照链
+    state = combined.drop_duplicates(SNAPSHOT_KEY, keep='last')  # 每个appid取最新的一行
+    state = state[~state[DELETED_COLUMN].astype(bool)]  # 去掉已被移除的游戏
+    state = _restore_dtypes(state.drop(columns=['_snapshot', DELETED_COLUMN]), dtypes)  # 还原数据类型
+    return state.sort_values(SNAPSHOT_KEY).reset_index(drop=True)
+
+
+def diff_snapshots(store_dir, date_a, date_b, columns=None, appids=None):
+    """
+    比较两个日期之间的数据变化
+    数值列额外给出 <列名>_change = 日期b的值 - 日期a的值，status标记added/removed/changed/unchanged
+    返回按appid对齐的DataFrame
+    """
+    before = snapshot_as_of(store_dir, date_a, columns, appids)  # 日期a的状态
+    after = snapshot_as_of(store_dir, date_b, columns, appids)  # 日期b的状态
+    merged = before.merge(after, on=SNAPSHOT_KEY, how='outer', suffixes=('_before', '_after'), indicator=True)  # 按appid对齐
+    value_columns = [c for c in after.columns if c != SNAPSHOT_KEY and c in before.columns]  # 两个日期都有的列
+
+    changed = pd.Series(False, index=merged.index)  # 是否有列发生变化
+    for column in value_columns:  # 逐列比较
+        old, new = merged[f"{column}_before"], merged[f"{column}_after"]
+        changed |= ~((old == new) | (old.isna() & new.isna()))
+        if pd.api.types.is_numeric_dtype(old) and pd.api.types.is_numeric_dtype(new) and not pd.api.types.is_bool_dtype(new):
+            merged[f"{column}_change"] = new - old  # 数值列的变化量
+
+    merged['status'] = 'unchanged'  # 默认未变化
+    merged.loc[changed, 'status'] = 'changed'
+    merged.loc[merged['_merge'] == 'left_only', 'status'] = 'removed'  # 只在日期a存在
+    merged.loc[merged['_merge'] == 'right_only', 'status'] = 'added'  # 只在日期b存在
+    return merged.drop(columns='_merge')
+
+
+def metric_history(store_dir, appids, columns, start=None, end=None):
+    """
+    查询指定游戏的指标在一段时间内每个快照日期的取值（例如最近90天的销量和好评变化）
+    只读取覆盖该时间段的快照链，并把appid过滤下推到Parquet读取
+    返回长表DataFrame：snapshot_date、appid及所需列
+    """
+    entries = _read_manifest(store_dir)  # 所有快照
+    if not entries:
+        raise ValueError("Snapshot store is empty")
+    end = _normalize_date(end) if end is not None else entries[-1]['date']  # 结束日期默认为最新快照
+    start = _normalize_date(start) if start is not None else entries[0]['date']  # 开始日期默认为最早快照
+    chain = _chain(entries, max(start, entries[0]['date']))  # 开始日期所在的快照链起点
+    chain = [e for e in entries if chain[0]['date'] <= e['date'] <= end]  # 从该完整快照一直读到结束日期
+    combined, dtypes = _read_chain(store_dir, chain, columns, appids)  # 读取相关分区的少量行
+
+    history = []  # 每个快照日期的状态
+    for snapshot_date in [e['date'] for e in chain if e['date'] >= start]:  # 查询区间内的每个快照日期
+        state = combined[combined['_snapshot'] <= snapshot_date].drop_duplicates(SNAPSHOT_KEY, keep='last')  # 该日期的最新值
+        state = state[~state[DELETED_COLUMN].astype(bool)]  # 去掉已被移除的游戏
+        history.append(state.drop(columns=['_snapshot', DELETED_COLUMN]).assign(snapshot_date=snapshot_date))
+    if not history:
+        return pd.DataFrame(columns=['snapshot_date', SNAPSHOT_KEY, *columns])
+    result = _restore_dtypes(pd.concat(history, ignore_index=True), dtypes)  # 还原数据类型
+    return result[['snapshot_date', SNAPSHOT_KEY] + [c for c in result.columns if c not in ('snapshot_date', SNAPSHOT_KEY)]]
+
+
+def main():
+    """
+    命令行入口：python -m utils.snapshots <ingest|list|as-of|diff> ...
+    """
+    parser = argparse.ArgumentParser(description="Steam dataset snapshot store")  # 命令行参数解析器
+    parser.add_argument('--store', default='snapshots', help="Snapshot store directory")  # 快照库目录
+    commands = parser.add_subparsers(dest='command', required=True)  # 子命令
+
+    ingest = commands.add_parser('ingest', help="Append a dated copy of steam.csv")  # 入库子命令
+    ingest.add_argument('csv_path')
+    ingest.add_argument('date')
+
+    commands.add_parser('list', help="List stored snapshots")  # 列出快照子命令
+
+    as_of = commands.add_parser('as-of', help="Export the dataset state as of a date to CSV")  # 时间点查询子命令
+    as_of.add_argument('date')
+    as_of.add_argument('output')
+    as_of.add_argument('--columns', nargs='*')
+
+    diff = commands.add_parser('diff', help="Export the changes between two dates to CSV")  # 差异查询子命令
+    diff.add_argument('date_a')
+    diff.add_argument('date_b')
+    diff.add_argument('output')
+    diff.add_argument('--columns', nargs='*')
+
+    args = parser.parse_args()  # 解析命令行参数
+    if args.command == 'ingest':
+        print(ingest_snapshot(args.store, args.date, csv_path=args.csv_path))
+    elif args.command == 'list':
+        print(list_snapshots(args.store).drop(columns='columns').to_string(index=False))
+    elif args.command == 'as-of':
+        snapshot_as_of(args.store, args.date, args.columns).to_csv(args.output, index=False)
+    elif args.command == 'diff':
+        diff_snapshots(args.store, args.date_a, args.date_b, args.columns).to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
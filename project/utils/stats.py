@@ -0,0 +1,128 @@
+import numpy as np  # 导入numpy用于向量化重抽样
+import pandas as pd  # 导入pandas用于结果整理
+import streamlit as st  # 导入streamlit用于缓存计算结果
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
+
+BOOTSTRAP_RESAMPLES = 2000  # 默认重抽样次数
+CONFIDENCE_LEVEL = 0.95  # 默认置信水平
+MAX_BATCH_ELEMENTS = 4_000_000  # 每批索引矩阵的最大元素数，控制内存占用
+RANDOM_SEED = 42  # 固定随机种子，保证每次重新运行结果一致
+COMPARISON_METRICS = ['positive_ratio', 'average_playtime', 'owners_median']  # 分组对比使用的指标
+METRIC_NAMES = {'positive_ratio': 'Positive rating', 'average_playtime': 'Average playtime', 'owners_median': 'Sales'}  # 指标的展示名称
+
+
+def bootstrap_means(values, n_resamples=BOOTSTRAP_RESAMPLES, rng=None):
+    """
+    对一组样本的多个指标同时做自助法重抽样
+    values为 样本数×指标数 的矩阵；每批用一个 重抽样次数×样本数 的索引矩阵一次取样，所有指标共用同一组索引
+    返回 重抽样次数×指标数 的均值矩阵
+    """
+    values = np.asarray(values, dtype=float)  # 转为浮点矩阵
+    if values.ndim == 1:  # 单个指标时补成二维
+        values = values[:, np.newaxis]
+    rng = rng if rng is not None else np.random.default_rng(RANDOM_SEED)  # 随机数生成器
+    n_samples, n_metrics = values.shape  # 样本数和指标数
+    means = np.full((n_resamples, n_metrics), np.nan)  # 存储重抽样均值
+    if n_samples == 0:  # 空样本无法重抽样
+        return means
+
+    columns = np.ascontiguousarray(values.T)  # 转置为 指标×样本，取样时内存连续
+    batch = max(1, MAX_BATCH_ELEMENTS // n_samples)  # 每批的重抽样次数
+    for start in range(0, n_resamples, batch):  # 分批生成索引矩阵
+        stop = min(start + batch, n_resamples)  # 批次结束位置
+        indices = rng.integers(0, n_samples, size=(stop - start, n_samples))  # 有放回抽样的索引矩阵
+        for j in range(n_metrics):  # 指标数很少，逐个指标取样求均值
+            means[start:stop, j] = columns[j][indices].mean(axis=1)
+    return means
+
+
+def cohens_d(a, b):
+    """
+    计算两组样本的Cohen's d效应量（合并标准差）
+    返回效应量，样本不足时返回NaN
+    """
+    n_a, n_b = len(a), len(b)  # 两组样本数
+    if n_a < 2 or n_b < 2:  # 样本不足无法估计方差
+        return np.nan
+    pooled = np.sqrt(((n_a - 1) * np.var(a, ddof=1) + (n_b - 1) * np.var(b, ddof=1)) / (n_a + n_b - 2))  # 合并标准差
+    return (np.mean(a) - np.mean(b)) / pooled if pooled > 0 else np.nan
+
+
+@st.cache_data(show_spinner=False, max_entries=64)  # 按数据内容缓存，同一过滤结果只重抽样一次（限制条目数，避免无限增长）
+def _compare_groups(df, group_col, metrics, n_resamples, confidence, seed):
+    """
+    对二分组做自助法置信区间和效应量计算（被compare_groups缓存调用）
+    返回(分组统计DataFrame, 效应量DataFrame)
+    """
+    rng = np.random.default_rng(seed)  # 随机数生成器
+    alpha = (1 - confidence) / 2  # 双侧分位点
+    groups = sorted(df[group_col].dropna().unique())  # 分组取值（布尔列为[False, True]）
+    metrics = list(metrics)  # 指标列表
+
+    group_rows = []  # 分组统计结果
+    boot = {}  # 每组的重抽样均值矩阵
+    for group in groups:  # 每组各自重抽样
+        values = df.loc[df[group_col] == group, metrics].to_numpy(dtype=float)  # 该组的指标矩阵
+        boot[group] = bootstrap_means(values, n_resamples, rng)  # 重抽样均值
+        low, high = np.quantile(boot[group], [alpha, 1 - alpha], axis=0)  # 百分位置信区间
+        for j, metric in enumerate(metrics):
+            group_rows.append({'group': group, 'metric': metric, 'count': len(values),
+                               'mean': values[:, j].mean(), 'ci_low': low[j], 'ci_high': high[j]})
+
+    effect_rows = []  # 效应量结果
+    if len(groups) == 2:  # 只对二分组计算差异
+        base, other = groups  # 差异定义为 other - base（布尔列即 True组 - False组）
+        diffs = boot[other] - boot[base]  # 两组独立重抽样，差值的分布
+        low, high = np.quantile(diffs, [alpha, 1 - alpha], axis=0)  # 差值的置信区间
+        for j, metric in enumerate(metrics):
+            a = df.loc[df[group_col] == other, metric].to_numpy(dtype=float)  # other组样本
+            b = df.loc[df[group_col] == base, metric].to_numpy(dtype=float)  # base组样本
+            effect_rows.append({'metric': metric,
+                                'difference': a.mean() - b.mean(),  # 均值差
+                                'ci_low': low[j], 'ci_high': high[j],  # 均值差的置信区间
+                                'cohens_d': cohens_d(a, b),  # 效应量
+                                'significant': bool(low[j] > 0 or high[j] < 0)})  # 置信区间不含0即显著
+    return (pd.DataFrame(group_rows, columns=['group', 'metric', 'count', 'mean', 'ci_low', 'ci_high']),
+            pd.DataFrame(effect_rows, columns=['metric', 'difference', 'ci_low', 'ci_high', 'cohens_d', 'significant']))
+
+
+def compare_groups(df, group_col, metrics, n_resamples=BOOTSTRAP_RESAMPLES, confidence=CONFIDENCE_LEVEL, seed=RANDOM_SEED):
+    """
+    比较二分组（如is_free、multi_platform）在多个指标上的均值
+    每组的均值置信区间和组间差异置信区间均由向量化自助法得到，并给出Cohen's d效应量
+    返回(分组统计DataFrame, 效应量DataFrame)
+    """
+    metrics = tuple(metrics)  # 转为元组作为缓存键
+    return _compare_groups(df[[group_col, *metrics]], group_col, metrics, n_resamples, confidence, seed)
+
+
+def effect_size_label(d):
+    """
+    按Cohen惯例将效应量划分为文字等级
+    返回等级描述
+    """
+    if pd.isna(d):
+        return "n/a"
+    size = abs(d)  # 效应量绝对值
+    if size < 0.2:
+        return "negligible"
+    if size < 0.5:
+        return "small"
+    if size < 0.8:
+        return "medium"
+    return "large"
+
+
+def describe_effect(effect, group_name, baseline_name, metric_name):
+    """
+    将一行效应量结果转为一句可读结论
+    返回结论字符串
+    """
+    names = dict(metric=t(metric_name), group=t(group_name), baseline=t(baseline_name))  # 结论中的指标和分组名称（按界面语言）
+    if pd.isna(effect['difference']):  # 数据不足
+        return t("{metric}: not enough data to compare {group} and {baseline}", **names)
+    if not effect['significant']:  # 置信区间含0
+        return t("{metric}: no significant difference between {group} and {baseline} (d = {d:.2f})", d=effect['cohens_d'], **names)
+    direction = t("higher") if effect['difference'] > 0 else t("lower")  # 差异方向
+    return t("{metric}: {group} are significantly {direction} than {baseline} ({size} effect, d = {d:.2f})",
+             direction=direction, size=t(effect_size_label(effect['cohens_d'])), d=effect['cohens_d'], **names)
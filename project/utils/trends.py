@@ -0,0 +1,167 @@
+import numpy as np  # 导入numpy用于向量化时间序列计算
+import pandas as pd  # 导入pandas用于数据处理
+import streamlit as st  # 导入streamlit用于缓存计算结果
+
+SEASON_LENGTH = 12  # 季节周期（月）
+ROLLING_WINDOW = 12  # 滚动平均窗口（月）
+FIT_WINDOW = 24  # 预测时用于拟合线性趋势的最近月份数
+FORECAST_HORIZON = 6  # 默认预测月数
+MIN_SERIES_LENGTH = 2 * SEASON_LENGTH  # 做季节分解所需的最少月份数
+
+
+def build_release_matrix(df, group_col=None):
+    """
+    构建 分组×年月 的发布数量矩阵，所有分组一次bincount完成
+    group_col为None时只有一个"All"分组；分组列为分号分隔的多值字符串（如steamspy_tags）时自动展开
+    返回(计数矩阵, 分组名称数组, 年月PeriodIndex)
+    """
+    valid = df['release_year'].notna() & df['release_month'].notna()  # 排除日期缺失的游戏
+    month_ids = (df.loc[valid, 'release_year'].astype(np.int64) * 12 + df.loc[valid, 'release_month'].astype(np.int64) - 1)  # 年月编码为自公元0年起的月序号
+    if month_ids.empty:  # 没有有效日期
+        return np.zeros((0, 0)), np.array([], dtype=object), pd.PeriodIndex([], freq='M')
+
+    first, last = int(month_ids.min()), int(month_ids.max())  # 时间范围
+    n_months = last - first + 1  # 连续月份数（无发布的月份计为0）
+    periods = pd.period_range(pd.Period(year=first // 12, month=first % 12 + 1, freq='M'), periods=n_months, freq='M')  # 完整的年月索引
+
+    if group_col is None:  # 不分组，只统计总量
+        counts = np.bincount(month_ids.to_numpy() - first, minlength=n_months)[np.newaxis, :]
+        return counts.astype(float), np.array(['All'], dtype=object), periods
+
+    groups = df.loc[valid, group_col].fillna('').astype(str)  # 分组列
+    if groups.str.contains(';').any():  # 多值标签列按分号展开
+        groups = groups.str.split(';').explode()
+    groups = groups[groups != '']  # 去掉空分组
+    group_codes, group_names = pd.factorize(groups, sort=True)  # 分组编码
+    month_pos = month_ids.loc[groups.index].to_numpy() - first  # 展开后每条记录的月份位置
+    flat = group_codes * n_months + month_pos  # 二维单元格的扁平编号
+    counts = np.bincount(flat, minlength=len(group_names) * n_months).reshape(len(group_names), n_months)  # 分组×月份计数矩阵
+    return counts.astype(float), np.asarray(group_names, dtype=object), periods
+
+
+def rolling_mean(matrix, window=ROLLING_WINDOW):
+    """
+    沿时间轴计算尾随滚动平均（累积和实现，所有分组同时计算）
+    窗口未满的位置为NaN
+    返回与输入形状相同的矩阵
+    """
+    result = np.full(matrix.shape, np.nan)  # 初始化结果
+    if matrix.shape[1] < window:  # 序列长度不足一个窗口
+        return result
+    csum = np.cumsum(np.pad(matrix, ((0, 0), (1, 0))), axis=1)  # 前面补0的累积和
+    result[:, window - 1:] = (csum[:, window:] - csum[:, :-window]) / window  # 窗口和除以窗口长度
+    return result
+
+
+def seasonal_decompose(matrix, first_period, season_length=SEASON_LENGTH):
+    """
+    对所有分组同时做经典加法季节分解：趋势（居中2×12移动平均）、季节指数、残差
+    first_period为第一列对应的年月，用于对齐日历月份
+    返回(趋势矩阵, 季节指数矩阵[分组×12, 下标0为1月], 残差矩阵)
+    """
+    n_groups, n_months = matrix.shape  # 分组数和月份数
+    trend = np.full(matrix.shape, np.nan)  # 趋势分量
+    seasonal_index = np.zeros((n_groups, season_length))  # 季节指数
+    if n_months < MIN_SERIES_LENGTH:  # 数据不足两个周期时不做季节分解
+        return trend, seasonal_index, matrix - np.nanmean(matrix, axis=1, keepdims=True)
+
+    half = season_length // 2  # 半个周期
+    csum = np.cumsum(np.pad(matrix, ((0, 0), (1, 0))), axis=1)  # 累积和
+    window_mean = (csum[:, season_length:] - csum[:, :-season_length]) / season_length  # 以每个位置开始的12个月均值
+    trend[:, half:n_months - half] = (window_mean[:, :-1] + window_mean[:, 1:]) / 2  # 相邻两个12月均值再平均，得到居中的2×12移动平均
+
+    month_of_year = (first_period.month - 1 + np.arange(n_months)) % season_length  # 每列对应的日历月份（0-11）
+    detrended = matrix - trend  # 去趋势序列
+    for month in range(season_length):  # 按日历月份求平均（只循环12次，分组维度向量化）
+        seasonal_index[:, month] = np.nanmean(detrended[:, month_of_year == month], axis=1)
+    seasonal_index -= seasonal_index.mean(axis=1, keepdims=True)  # 季节指数中心化，保证一年内合计为0
+
+    residual = detrended - seasonal_index[:, month_of_year]  # 残差
+    return trend, seasonal_index, residual
+
+
+def forecast_releases(matrix, seasonal_index, first_period, horizon=FORECAST_HORIZON, fit_window=FIT_WINDOW):
+    """
+    对所有分组同时做短期预测：去季节化后对最近fit_window个月做闭式最小二乘线性拟合，再加回季节指数
+    返回(预测矩阵, 下界, 上界)，形状为 分组×horizon，区间为±1.96倍拟合残差标准差
+    """
+    n_groups, n_months = matrix.shape  # 分组数和月份数
+    season_length = seasonal_index.shape[1]  # 季节周期
+    month_of_year = (first_period.month - 1 + np.arange(n_months + horizon)) % season_length  # 历史和预测期的日历月份
+    deseasonalized = matrix - seasonal_index[:, month_of_year[:n_months]]  # 去季节化序列
+
+    window = min(fit_window, n_months)  # 拟合窗口不超过序列长度
+    y = deseasonalized[:, n_months - window:]  # 最近window个月
+    t = np.arange(window, dtype=float)  # 时间变量
+    t_centered = t - t.mean()  # 中心化时间
+    denominator = max((t_centered ** 2).sum(), 1e-12)  # 时间方差（窗口为1时避免除以0）
+    slope = (y - y.mean(axis=1, keepdims=True)) @ t_centered / denominator  # 所有分组的斜率（一次矩阵乘法）
+    intercept = y.mean(axis=1) - slope * t.mean()  # 所有分组的截距
+
+    fitted = intercept[:, np.newaxis] + slope[:, np.newaxis] * t  # 拟合值
+    sigma = np.sqrt(((y - fitted) ** 2).mean(axis=1))  # 拟合残差标准差
+    future_t = np.arange(window, window + horizon, dtype=float)  # 预测期的时间变量
+    forecast = intercept[:, np.newaxis] + slope[:, np.newaxis] * future_t + seasonal_index[:, month_of_year[n_months:]]  # 线性趋势 + 季节指数
+    lower = np.clip(forecast - 1.96 * sigma[:, np.newaxis], 0, None)  # 下界（发布数量不能为负）
+    upper = forecast + 1.96 * sigma[:, np.newaxis]  # 上界
+    return np.clip(forecast, 0, None), lower, upper
+
+
+@st.cache_data(show_spinner=False, max_entries=32)  # 按数据内容缓存，同一数据版本只计算一次（限制条目数，避免无限增长）
+def _compute_release_trends(df, group_col, horizon):
+    """
+    计算发布数量的时间序列、滚动平均、季节分解和预测（被compute_release_trends缓存调用）
+    返回结果字典
+    """
+    counts, groups, periods = build_release_matrix(df, group_col)  # 分组×年月计数矩阵
+    if counts.shape[1] == 0:  # 没有有效数据
+        empty = np.zeros((len(groups), 0))
+        return {'groups': groups, 'periods': periods, 'counts': counts, 'rolling': counts, 'trend': counts,
+                'seasonal_index': np.zeros((len(groups), SEASON_LENGTH)), 'residual': counts,
+                'forecast_periods': pd.PeriodIndex([], freq='M'), 'forecast': empty, 'forecast_lower': empty, 'forecast_upper': empty}
+
+    trend, seasonal_index, residual = seasonal_decompose(counts, periods[0])  # 季节分解
+    forecast, lower, upper = forecast_releases(counts, seasonal_index, periods[0], horizon)  # 短期预测
+    return {
+        'groups': groups,  # 分组名称
+        'periods': periods,  # 历史年月
+        'counts': counts,  # 每月发布数量
+        'rolling': rolling_mean(counts),  # 12个月滚动平均
+        'trend': trend,  # 趋势分量
+        'seasonal_index': seasonal_index,  # 季节指数（1-12月）
+        'residual': residual,  # 残差
+        'forecast_periods': pd.period_range(periods[-1] + 1, periods=horizon, freq='M'),  # 预测年月
+        'forecast': forecast,  # 预测值
+        'forecast_lower': lower,  # 预测下界
+        'forecast_upper': upper  # 预测上界
+    }
+
+
+def compute_release_trends(df, group_col=None, horizon=FORECAST_HORIZON):
+    """
+    计算发布数量趋势与预测，所有分组一次向量化完成
+    只把需要的列交给缓存函数，减少缓存键的哈希开销
+    返回结果字典（各矩阵的行与groups一一对应）
+    """
+    columns = ['release_year', 'release_month'] + ([group_col] if group_col else [])  # 需要的列
+    return _compute_release_trends(df[columns], group_col, horizon)
+
+
+def trends_to_frame(trends, index=0):
+    """
+    将某个分组的历史序列和预测整理为长表，便于绘图
+    返回包含period、value、series列的DataFrame
+    """
+    history = pd.DataFrame({
+        'period': trends['periods'].to_timestamp(),  # 年月转换为时间戳
+        'Monthly Releases': trends['counts'][index],  # 每月发布数量
+        '12-Month Rolling Mean': trends['rolling'][index],  # 滚动平均
+        'Trend': trends['trend'][index]  # 趋势分量
+    })
+    forecast = pd.DataFrame({
+        'period': trends['forecast_periods'].to_timestamp(),  # 预测年月
+        'Forecast': trends['forecast'][index],  # 预测值
+        'Forecast Lower': trends['forecast_lower'][index],  # 预测下界
+        'Forecast Upper': trends['forecast_upper'][index]  # 预测上界
+    })
+    return pd.concat([history, forecast], ignore_index=True)
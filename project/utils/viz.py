@@ -4,15 +4,14 @@ import plotly.express as px  # 导入plotly.express用于快速创建交互式
 import plotly.graph_objects as go  # 导入plotly.graph_objects用于创建自定义图表
 from plotly.subplots import make_subplots  # 导入make_subplots用于创建多子图图表
 import streamlit as st  # 导入streamlit用于数据质量显示
+from utils.stats import compare_groups, COMPARISON_METRICS, METRIC_NAMES  # 从utils.stats模块导入分组对比的自助法统计函数
+from utils.i18n import t  # 从utils.i18n模块导入界面文本翻译函数
 
-def create_all_visualizations(df):
+def create_time_trend_chart(df):
     """
-    创建所有可视化图表
-    返回包含所有图表的字典
+    1. 游戏发布数量年度趋势分析
+    返回折线图
     """
-    visuals = {}  # 存储所有图表的字典
-    
-    # 1. 游戏发布数量年度趋势分析
     yearly_releases = df.groupby('release_year').size().reset_index(name='count')  # 按年份分组统计游戏发布数量
     yearly_releases = yearly_releases[yearly_releases['release_year'] >= 1990]  # 过滤有效年份（1990年及以后）
     fig1 = px.line(yearly_releases, x='release_year', y='count',  # 创建折线图，x轴为年份，y轴为发布数量
@@ -20,29 +19,15 @@ def create_all_visualizations(df):
                   labels={'release_year': '发布年份', 'count': '发布数量'},  # 轴标签重命名
                   markers=True)  # 显示数据点标记
     fig1.update_traces(line=dict(width=3))  # 设置线条粗细为3
-    visuals['time_trend'] = fig1  # 将图表存储到字典中，键为'time_trend'
-    
-    # 2. 价格与销量关系分析
-    price_analysis_df = df[(df['price'] >= 0) & (df['price'] <= 100) & (df['owners_median'] > 0)]  # 过滤有效数据：价格0-100，销量大于0
-    fig2 = px.scatter(price_analysis_df, x='price', y='owners_median',  # 创建散点图，x轴为价格，y轴为销量
-                     hover_data=['name'],  # 悬停时显示游戏名称
-                     title='💰 游戏价格与销量关系分析',  # 图表标题
-                     labels={'price': '价格 (美元)', 'owners_median': '销量估计'},  # 轴标签重命名
-                     opacity=0.6)  # 设置点透明度为0.6
-    fig2.update_traces(marker=dict(size=8))  # 设置点大小为8
-    visuals['price_vs_sales'] = fig2  # 将图表存储到字典中，键为'price_vs_sales'
-    
-    # 3. 好评率与游戏时长关系分析
-    engagement_df = df[(df['average_playtime'] > 0) & (df['total_ratings'] > 10)]  # 过滤有效数据：游戏时长大于0，总评价数大于10
-    fig3 = px.scatter(engagement_df, x='positive_ratio', y='average_playtime',  # 创建散点图，x轴为好评率，y轴为游戏时长
-                     hover_data=['name'],  # 悬停时显示游戏名称
-                     title='⏱️ 游戏好评率与玩家参与度关系分析',  # 图表标题
-                     labels={'positive_ratio': '好评率', 'average_playtime': '平均游戏时长(分钟)'},  # 轴标签重命名
-                     opacity=0.6)  # 设置点透明度为0.6
-    fig3.update_traces(marker=dict(size=8, color='green'))  # 设置点大小为8，颜色为绿色
-    visuals['rating_vs_playtime'] = fig3  # 将图表存储到字典中，键为'rating_vs_playtime'
-    
-    # 4. 游戏类型分布分析
+    return fig1
+
+# 2-3. 价格与销量、好评率与游戏时长的散点图按查看范围渐进渲染，见create_price_sales_chart和create_rating_playtime_chart
+
+def create_genre_distribution_chart(df):
+    """
+    4. 游戏类型分布分析
+    返回条形图
+    """
     genre_counts = df['main_genre'].value_counts().head(15)  # 获取前15个游戏类型的数量统计
     genre_df = pd.DataFrame({  # 创建新的DataFrame用于绘图
         'genre': genre_counts.index,  # 游戏类型名称
@@ -57,9 +42,13 @@ def create_all_visualizations(df):
                  color='count',  # 根据数量值着色
                  color_continuous_scale='viridis')  # 使用viridis颜色方案
     fig4.update_layout(showlegend=False)  # 隐藏图例
-    visuals['genre_distribution'] = fig4  # 将图表存储到字典中，键为'genre_distribution'
-    
-    # 5. 发行商分析
+    return fig4
+
+def create_publisher_chart(df):
+    """
+    5. 发行商分析
+    返回条形图
+    """
     publisher_stats = df.groupby('publisher').agg({  # 按发行商分组统计
         'name': 'count',  # 游戏数量
         'positive_ratio': 'mean',  # 平均好评率
@@ -75,9 +64,13 @@ def create_all_visualizations(df):
                  labels={'game_count': '发行游戏数量', 'publisher': '发行商'},  # 轴标签重命名
                  color='game_count',  # 根据数量值着色
                  color_continuous_scale='plasma')  # 使用plasma颜色方案
-    visuals['publisher_analysis'] = fig5  # 将图表存储到字典中，键为'publisher_analysis'
-    
-    # 6. 平台支持分析
+    return fig5
+
+def create_platform_support_chart(df):
+    """
+    6. 平台支持分析
+    返回饼图
+    """
     platform_stats = pd.DataFrame({  # 创建平台统计DataFrame
         '平台': ['Windows', 'Mac', 'Linux'],  # 平台名称
         '支持游戏数量': [  # 各平台支持的游戏数量
@@ -91,9 +84,13 @@ def create_all_visualizations(df):
                  color='平台',  # 按平台着色
                  color_discrete_map={'Windows': 'blue', 'Mac': 'gray', 'Linux': 'yellow'})  # 自定义平台颜色
     fig6.update_traces(textposition='inside', textinfo='percent+label')  # 设置文本显示在内部，显示百分比和标签
-    visuals['platform_support'] = fig6  # 将图表存储到字典中，键为'platform_support'
-    
-    # 7. 免费与付费游戏对比分析
+    return fig6
+
+def create_free_vs_paid_chart(df):
+    """
+    7. 免费与付费游戏对比分析（含自助法置信区间误差线）
+    返回多子图条形图
+    """
     free_paid_comparison = df.groupby('is_free').agg({  # 按是否免费分组
         'positive_ratio': 'mean',  # 平均好评率
         'average_playtime': 'mean',  # 平均游戏时长
@@ -102,6 +99,7 @@ def create_all_visualizations(df):
     }).reset_index()  # 重置索引
     free_paid_comparison = free_paid_comparison.rename(columns={'name': 'game_count'})  # 重命名列，避免歧义
     free_paid_comparison['类型'] = free_paid_comparison['is_free'].map({True: '免费游戏', False: '付费游戏'})  # 映射类型名称
+    free_paid_stats, _ = compare_groups(df, 'is_free', COMPARISON_METRICS)  # 自助法计算每组均值的置信区间
     
     fig7 = make_subplots(rows=1, cols=3,  # 创建1行3列的子图布局
                         subplot_titles=('平均好评率', '平均游戏时长(分钟)', '平均销量'),  # 子图标题
@@ -109,27 +107,49 @@ def create_all_visualizations(df):
     
     fig7.add_trace(go.Bar(x=free_paid_comparison['类型'],  # X轴为游戏类型
                          y=free_paid_comparison['positive_ratio'],  # Y轴为好评率
-                         marker_color=['lightblue', 'lightcoral']),  # 自定义颜色
+                         marker_color=['lightblue', 'lightcoral'],  # 自定义颜色
+                         error_y=confidence_error_bars(free_paid_stats, 'positive_ratio', free_paid_comparison['is_free'])),  # 95%置信区间误差线
                   row=1, col=1)  # 第1行第1列位置
     
     fig7.add_trace(go.Bar(x=free_paid_comparison['类型'],  # X轴为游戏类型
                          y=free_paid_comparison['average_playtime'],  # Y轴为游戏时长
-                         marker_color=['lightblue', 'lightcoral']),  # 自定义颜色
+                         marker_color=['lightblue', 'lightcoral'],  # 自定义颜色
+                         error_y=confidence_error_bars(free_paid_stats, 'average_playtime', free_paid_comparison['is_free'])),  # 95%置信区间误差线
                   row=1, col=2)  # 第1行第2列位置
     
     fig7.add_trace(go.Bar(x=free_paid_comparison['类型'],  # X轴为游戏类型
                          y=free_paid_comparison['owners_median'],  # Y轴为销量
-                         marker_color=['lightblue', 'lightcoral']),  # 自定义颜色
+                         marker_color=['lightblue', 'lightcoral'],  # 自定义颜色
+                         error_y=confidence_error_bars(free_paid_stats, 'owners_median', free_paid_comparison['is_free'])),  # 95%置信区间误差线
                   row=1, col=3)  # 第1行第3列位置
     
     fig7.update_layout(title_text='🆓 免费游戏 vs 💰 付费游戏全方位对比分析',  # 主标题
                       showlegend=False,  # 隐藏图例
                       height=500)  # 设置图表高度
-    visuals['free_vs_paid'] = fig7  # 将图表存储到字典中，键为'free_vs_paid'
+    return fig7
 
-    # 8. 月度发布趋势分析
+def monthly_release_counts(df):
+    """
+    按月份统计游戏发布数量（1月到12月）
+    返回DataFrame（列：release_month、game_count）
+    """
     monthly_counts = df.groupby('release_month').size().reset_index(name='game_count')  # 按月份分组统计游戏数量
-    monthly_counts = monthly_counts.sort_values('release_month')  # 按月份数字排序（1月到12月）
+    return monthly_counts.sort_values('release_month')  # 按月份数字排序（1月到12月）
+
+def monthly_peak(df):
+    """
+    返回发布高峰月份及其游戏数量(月份, 数量)
+    """
+    monthly_counts = monthly_release_counts(df)
+    peak_month = monthly_counts.loc[monthly_counts['game_count'].idxmax()]  # 找到游戏数量最多的月份
+    return int(peak_month['release_month']), int(peak_month['game_count'])  # 高峰月份的数字和游戏数量
+
+def create_monthly_release_chart(df):
+    """
+    8. 月度发布趋势分析（标注高峰月份）
+    返回条形图
+    """
+    monthly_counts = monthly_release_counts(df)  # 各月份的发布数量
     
     fig8 = px.bar(monthly_counts, 
                  x='release_month',  # X轴：月份（1-12）
@@ -139,9 +159,7 @@ def create_all_visualizations(df):
                  color='game_count',  # 根据数量着色
                  color_continuous_scale='blues')  # 使用蓝色渐变颜色方案
     
-    peak_month = monthly_counts.loc[monthly_counts['game_count'].idxmax()]  # 找到游戏数量最多的月份
-    peak_month_num = int(peak_month['release_month'])  # 高峰月份的数字
-    peak_month_count = int(peak_month['game_count'])   # 高峰月份的游戏数量
+    peak_month_num, peak_month_count = monthly_peak(df)  # 高峰月份及其游戏数量
     
     fig8.update_layout(
         xaxis=dict(tickmode='linear', dtick=1),  # 设置X轴刻度为整数，每个月份都显示
@@ -156,83 +174,296 @@ def create_all_visualizations(df):
         arrowhead=2,  # 箭头样式
         bgcolor="yellow"  # 标注背景色
     )
-    
-    visuals['monthly_analysis'] = fig8  # 将图表存储到字典中，键为'monthly_analysis'
-    visuals['peak_month_info'] = (peak_month_num, peak_month_count)  # 存储高峰月份信息供分析使用
-    
-    return visuals  # 返回包含所有图表的字典
+    return fig8
+
+VISUAL_BUILDERS = {  # 图表名 -> 构建函数（各标签页按需构建，见utils.figcache.LazyFigures）
+    'time_trend': create_time_trend_chart,
+    'genre_distribution': create_genre_distribution_chart,
+    'publisher_analysis': create_publisher_chart,
+    'platform_support': create_platform_support_chart,
+    'free_vs_paid': create_free_vs_paid_chart,
+    'monthly_analysis': create_monthly_release_chart,
+    'peak_month_info': monthly_peak  # 高峰月份信息供分析使用
+}
+
+def create_all_visualizations(df):
+    """
+    创建所有可视化图表
+    返回包含所有图表的字典
+    """
+    return {name: build(df) for name, build in VISUAL_BUILDERS.items()}  # 一次构建全部图表
+
+def confidence_error_bars(group_stats, metric, groups):
+    """
+    将compare_groups得到的置信区间转换为plotly误差线参数
+    groups为图中柱子对应的分组取值顺序
+    返回error_y字典
+    """
+    stats = group_stats[group_stats['metric'] == metric].set_index('group').reindex(list(groups))  # 按柱子顺序对齐分组统计
+    return dict(type='data',  # 使用数据值作为误差
+                array=(stats['ci_high'] - stats['mean']).to_numpy(),  # 上侧误差
+                arrayminus=(stats['mean'] - stats['ci_low']).to_numpy())  # 下侧误差
+
+def create_group_comparison_chart(group_stats, group_labels, title):
+    """
+    创建带置信区间误差线的分组均值对比图（每个指标一个子图）
+    group_labels为分组取值到展示名称的映射
+    返回图表对象
+    """
+    metrics = list(dict.fromkeys(group_stats['metric']))  # 保持指标顺序
+    fig = make_subplots(rows=1, cols=max(len(metrics), 1),  # 每个指标一个子图
+                        subplot_titles=[METRIC_NAMES.get(m, m) for m in metrics])  # 子图标题
+    for i, metric in enumerate(metrics, start=1):  # 遍历每个指标
+        stats = group_stats[group_stats['metric'] == metric]  # 该指标的分组统计
+        fig.add_trace(go.Bar(x=stats['group'].map(group_labels),  # X轴为分组名称
+                             y=stats['mean'],  # Y轴为均值
+                             error_y=confidence_error_bars(group_stats, metric, stats['group']),  # 95%置信区间误差线
+                             marker_color=['lightblue', 'lightcoral'][:len(stats)]),  # 自定义颜色
+                      row=1, col=i)
+    fig.update_layout(title_text=title, showlegend=False, height=450)  # 主标题、隐藏图例、设置高度
+    return fig
+
+def create_platform_combination_chart(combos):
+    """
+    创建平台组合游戏数与平均销量的对比图
+    combos为summarize_platform_combinations的结果
+    返回图表对象
+    """
+    fig = make_subplots(rows=1, cols=2, subplot_titles=('游戏数量', '平均销量'))  # 左右两个子图
+    fig.add_trace(go.Bar(x=combos['platforms'], y=combos['game_count'], marker_color='steelblue',  # 各组合的游戏数
+                         text=[f"{share:.1%}" for share in combos['share']], textposition='outside'),  # 标注占比
+                  row=1, col=1)
+    fig.add_trace(go.Bar(x=combos['platforms'], y=combos['avg_owners'], marker_color='darkorange'),  # 各组合的平均销量
+                  row=1, col=2)
+    fig.update_layout(title_text='🧩 平台组合分布与销量对比', showlegend=False, height=450)  # 主标题、隐藏图例、设置高度
+    return fig
 
-def create_small_multiples(df):
+def create_compare_trend_chart(yearly):
+    """
+    创建多个过滤切片的年度发布数量对比折线图（每个切片一条线）
+    yearly为compare_slices返回的年度计数表
+    返回图表对象
+    """
+    fig = px.line(yearly, x='release_year', y='count', color='slice',  # 每个切片一条线
+                  title='⚖️ 各切片游戏发布数量年度趋势对比',  # 图表标题
+                  labels={'release_year': '发布年份', 'count': '发布数量', 'slice': '切片'},  # 轴标签重命名
+                  markers=True)  # 显示数据点标记
+    fig.update_layout(legend=dict(orientation='h', yanchor='bottom', y=1.02))  # 图例放在图表上方，避免挤占绘图区
+    return fig
+
+def create_compare_genre_chart(genres, labels, top_n=10, delta=False):
+    """
+    创建多个过滤切片的类型占比对比图：取各切片合计数量最多的top_n个类型
+    delta为True时显示各切片相对第一个切片（基准）的占比差（百分点）
+    返回图表对象
+    """
+    top = genres.groupby('genre')['count'].sum().nlargest(top_n).index  # 所有切片合计最多的类型
+    table = genres[genres['genre'].isin(top)].pivot(index='genre', columns='slice', values='share').reindex(index=top, columns=labels)  # 类型×切片的占比
+    if delta:  # 相对基准切片的差值
+        table = table[labels[1:]].sub(table[labels[0]], axis=0)
+    long = table.reset_index().melt(id_vars='genre', var_name='slice', value_name='share')  # 转为长表便于分组绘图
+    fig = px.bar(long, x='genre', y='share', color='slice', barmode='group',  # 分组条形图
+                 title=f'⚖️ 各切片游戏类型占比{"相对基准的差值" if delta else "对比"}（前{top_n}个类型）',  # 图表标题
+                 labels={'genre': '游戏类型', 'share': '占比差（百分点）' if delta else '占比 (%)', 'slice': '切片'})  # 轴标签重命名
+    fig.update_layout(legend=dict(orientation='h', yanchor='bottom', y=1.02))  # 图例放在图表上方
+    return fig
+
+def create_compare_platform_chart(platforms):
+    """
+    创建多个过滤切片的平台支持比例对比图
+    返回图表对象
+    """
+    fig = px.bar(platforms, x='platform', y='share', color='slice', barmode='group',  # 分组条形图
+                 title='⚖️ 各切片平台支持比例对比',  # 图表标题
+                 labels={'platform': '平台', 'share': '支持比例 (%)', 'slice': '切片'},  # 轴标签重命名
+                 hover_data=['game_count'])  # 悬停显示游戏数量
+    fig.update_layout(legend=dict(orientation='h', yanchor='bottom', y=1.02))  # 图例放在图表上方
+    return fig
+
+def create_revenue_chart(table, dim, top_n=15):
+    """
+    创建收入估计图：柱高为收入中值，误差线为收入区间（低、高估计）
+    table为revenue_by返回的汇总表；类型和发行商取收入中值最高的top_n个并横向显示
+    返回图表对象
+    """
+    horizontal = dim in ('Genre', 'Publisher')  # 类别较多的维度横向显示
+    table = table.head(top_n) if horizontal else table
+    error = dict(array=table['revenue_high'] - table['revenue_mid'], arrayminus=table['revenue_mid'] - table['revenue_low'])  # 区间上下界相对中值的距离
+    fig = go.Figure(go.Bar(
+        x=table['revenue_mid'] if horizontal else table[dim],  # 收入中值
+        y=table[dim] if horizontal else table['revenue_mid'],
+        orientation='h' if horizontal else 'v',
+        error_x=error if horizontal else None,  # 收入区间误差线
+        error_y=None if horizontal else error,
+        marker_color='seagreen',
+        customdata=table[['revenue_low', 'revenue_high', 'game_count']],
+        hovertemplate=('%{y}<br>中值: $%{x:,.0f}' if horizontal else '%{x}<br>中值: $%{y:,.0f}')  # 悬停显示收入中值、区间和游戏数量
+                      + '<br>区间: $%{customdata[0]:,.0f} – $%{customdata[1]:,.0f}<br>游戏数量: %{customdata[2]:,}<extra></extra>'))
+    fig.update_layout(title=f'💵 估算收入（低/中/高）' + (f' 前{top_n}' if horizontal else ''),  # 图表标题
+                      xaxis_title='估算收入 (美元)' if horizontal else dim, yaxis_title=None if horizontal else '估算收入 (美元)', height=500)  # 轴标题
+    if horizontal:
+        fig.update_yaxes(autorange='reversed')  # 收入最高的在最上面
+    if dim == 'Price range':
+        fig.update_xaxes(type='category')  # 价格区间按区间顺序显示
+    return fig
+
+def create_cooccurrence_heatmap(matrix, metric):
+    """
+    创建标签共现热力图：matrix为heatmap_frame返回的标签×标签矩阵
+    提升度和PMI使用以独立（提升度1、PMI 0）为中点的红蓝发散配色
+    返回图表对象
+    """
+    names = {'count': '共现游戏数', 'lift': '提升度', 'pmi': 'PMI'}  # 指标名称
+    diverging = metric != 'count'  # 提升度和PMI以独立为中点
+    fig = px.imshow(matrix, text_auto='.2f' if diverging else True, aspect='auto',  # 标签×标签热力图
+                    color_continuous_scale='RdBu_r' if diverging else 'viridis',
+                    color_continuous_midpoint=(1.0 if metric == 'lift' else 0.0) if diverging else None,
+                    labels={'color': names[metric]},
+                    title=f'🧩 标签共现热力图（{names[metric]}）')  # 图表标题
+    fig.update_layout(height=650, xaxis_title=None, yaxis_title=None)
+    fig.update_xaxes(tickangle=-45)  # 标签名称倾斜显示
+    return fig
+
+def price_sales_points(df):
+    """
+    价格与销量散点图使用的数据：价格0-100，销量大于0
+    """
+    return df[(df['price'] >= 0) & (df['price'] <= 100) & (df['owners_median'] > 0)]  # 过滤有效数据：价格0-100，销量大于0
+
+def engagement_points(df):
+    """
+    好评率与游戏时长散点图使用的数据：游戏时长大于0，总评价数大于10
+    """
+    return df[(df['average_playtime'] > 0) & (df['total_ratings'] > 10)]  # 过滤有效数据：游戏时长大于0，总评价数大于10
+
+def small_multiples_points(df):
+    """
+    小倍数图使用的数据：前6个热门类型的游戏
+    """
+    top_genres = df['main_genre'].value_counts().head(6).index.tolist()  # 获取前6个热门类型
+    return df[df['main_genre'].isin(top_genres)]  # 筛选这些类型的数据
+
+def create_adaptive_scatter(points, detail, x, y, title, labels, hover_data=None, color=None, facet_col=None):
+    """
+    创建渐进式散点图
+    明细模式每个点为一款游戏；概览模式每个点为一个分箱单元格，点的大小表示单元格内的游戏数
+    返回图表对象
+    """
+    facet_args = dict(facet_col=facet_col, facet_col_wrap=3) if facet_col else {}  # 分面参数
+    if detail:  # 明细模式
+        fig = px.scatter(points, x=x, y=y, color=color, hover_data=hover_data,  # 每款游戏一个点
+                         title=title, labels=labels, opacity=0.6, **facet_args)
+        fig.update_traces(marker=dict(size=8))  # 设置点大小为8
+    else:  # 概览模式
+        fig = px.scatter(points, x=x, y=y, color=color, size='count', size_max=30,  # 点大小表示游戏数
+                         title=f"{title}（概览）", labels={**labels, 'count': '游戏数量'}, opacity=0.6, **facet_args)
+    return fig
+
+def create_price_sales_chart(points, detail=True):
+    """
+    创建价格与销量关系散点图（支持概览和明细两种分辨率）
+    """
+    return create_adaptive_scatter(points, detail, 'price', 'owners_median',
+                                   title='💰 游戏价格与销量关系分析',  # 图表标题
+                                   labels={'price': '价格 (美元)', 'owners_median': '销量估计'},  # 轴标签重命名
+                                   hover_data=['name'])  # 悬停时显示游戏名称
+
+def create_rating_playtime_chart(points, detail=True):
+    """
+    创建好评率与游戏时长关系散点图（支持概览和明细两种分辨率）
+    """
+    fig = create_adaptive_scatter(points, detail, 'positive_ratio', 'average_playtime',
+                                  title='⏱️ 游戏好评率与玩家参与度关系分析',  # 图表标题
+                                  labels={'positive_ratio': '好评率', 'average_playtime': '平均游戏时长(分钟)'},  # 轴标签重命名
+                                  hover_data=['name'])  # 悬停时显示游戏名称
+    fig.update_traces(marker=dict(color='green'))  # 设置点颜色为绿色
+    return fig
+
+def create_small_multiples(points, detail=True):
     """
     创建小倍数图替代地图（因为没有地理字段）
+    points为small_multiples_points选出的数据（明细）或其分箱结果（概览）
     返回小倍数图表对象
     """
-    top_genres = df['main_genre'].value_counts().head(6).index.tolist()  # 获取前6个热门类型
-    genre_subset = df[df['main_genre'].isin(top_genres)]  # 筛选这些类型的数据
-    
-    fig = px.scatter(genre_subset, 
-                    x='price',  # X轴：价格
-                    y='positive_ratio',  # Y轴：好评率
-                    color='main_genre',  # 按类型着色
-                    facet_col='main_genre',  # 按类型分面（创建多个子图）
-                    facet_col_wrap=3,  # 每行显示3个子图
-                    hover_data=['name', 'release_year'],  # 悬停显示的信息
-                    title="📊 热门游戏类型：价格 vs 好评率多维度对比",  # 图表标题
-                    labels={'price': '价格 (美元)', 'positive_ratio': '好评率'})  # 轴标签重命名
+    fig = create_adaptive_scatter(points, detail,
+                                  x='price',  # X轴：价格
+                                  y='positive_ratio',  # Y轴：好评率
+                                  color='main_genre',  # 按类型着色
+                                  facet_col='main_genre',  # 按类型分面（创建多个子图）
+                                  hover_data=['name', 'release_year'],  # 悬停显示的信息
+                                  title="📊 热门游戏类型：价格 vs 好评率多维度对比",  # 图表标题
+                                  labels={'price': '价格 (美元)', 'positive_ratio': '好评率'})  # 轴标签重命名
     
     fig.update_layout(height=600)  # 设置图表高度
     return fig  # 返回图表对象
 
-def create_data_quality_section(df):
+def compute_data_quality(df, quarantine=None):
+    """
+    计算数据质量指标：缺失值、重复记录、完整性和数据验证检查
+    quarantine为加载时因日期无法解析而被隔离的行（dataset_details中的date_quarantine）
+    返回结果字典（供报告页面和API共用）
+    """
+    missing_data = df.isnull().sum()  # 计算每列的缺失值数量
+    total_cells = np.prod(df.shape)  # 计算总单元格数（行数×列数）
+    complete_rows = df.notnull().all(axis=1).sum()  # 计算完整记录数（没有任何缺失值的行）
+    missing_stats = pd.DataFrame({
+        'Column Name': df.columns,  # 所有列名
+        'Missing Count': missing_data.values,  # 每列的缺失值数量
+        'Missing Percentage': (missing_data / len(df) * 100).values  # 每列的缺失值百分比
+    })
+    quarantine = pd.DataFrame() if quarantine is None else quarantine  # 加载时因日期无法解析而被隔离的行
+    return {
+        'missing_percentage': (missing_data.sum() / total_cells) * 100,  # 缺失值百分比
+        'duplicates': int(df.duplicated().sum()),  # 完全重复的记录数量
+        'completeness': (complete_rows / len(df)) * 100,  # 完整记录百分比
+        'missing_stats': missing_stats[missing_stats['Missing Count'] > 0],  # 只保留有缺失值的列
+        'quarantined_dates': quarantine,  # 被隔离的行
+        'validation_checks': [  # 数据验证检查项列表
+            ("Prices are non-negative", bool((df['price'] >= 0).all())),  # 检查所有价格是否都非负
+            ("Positive ratings between 0-1", bool(((df['positive_ratio'] >= 0) & (df['positive_ratio'] <= 1)).all())),  # 检查好评率范围
+            ("Playtime is non-negative", bool((df['average_playtime'] >= 0).all())),  # 检查游戏时长非负
+            ("Release dates are reasonable", bool((df['release_year'] >= 1990).all())),  # 检查发布日期合理性
+            ("All release dates parsed", quarantine.empty)  # 检查是否有行因日期无法解析被隔离
+        ]
+    }
+
+def create_data_quality_section(df, quarantine=None):
     """
     创建数据质量检查部分
     显示数据完整性、缺失值、重复值等信息
     """
-    st.header("📊 Data Quality Report")  # 数据质量部分的主标题
+    st.header(t("📊 Data Quality Report"))  # 数据质量部分的主标题
+    quality = compute_data_quality(df, quarantine)  # 计算数据质量指标
     
     col1, col2, col3 = st.columns(3)  # 创建三列布局显示关键质量指标
     
     with col1:
-        missing_data = df.isnull().sum()  # 计算每列的缺失值数量
-        total_cells = np.prod(df.shape)  # 计算总单元格数（行数×列数）
-        missing_percentage = (missing_data.sum() / total_cells) * 100  # 计算缺失值百分比
-        st.metric("Total Missing Values", f"{missing_percentage:.2f}%")  # 显示缺失值比例指标
+        st.metric(t("Total Missing Values"), f"{quality['missing_percentage']:.2f}%")  # 显示缺失值比例指标
     
     with col2:
-        duplicates = df.duplicated().sum()  # 计算完全重复的记录数量
-        st.metric("Duplicate Records", duplicates)  # 显示重复记录数指标
+        st.metric(t("Duplicate Records"), quality['duplicates'])  # 显示重复记录数指标
     
     with col3:
-        complete_rows = df.notnull().all(axis=1).sum()  # 计算完整记录数（没有任何缺失值的行）
-        completeness = (complete_rows / len(df)) * 100  # 计算完整记录百分比
-        st.metric("Complete Records", f"{completeness:.2f}%")  # 显示完整性指标
+        st.metric(t("Complete Records"), f"{quality['completeness']:.2f}%")  # 显示完整性指标
     
-    st.subheader("Detailed Data Quality Metrics")  # 详细的数据质量分析子标题
+    st.subheader(t("Detailed Data Quality Metrics"))  # 详细的数据质量分析子标题
     
-    missing_stats = pd.DataFrame({
-        'Column Name': df.columns,  # 所有列名
-        'Missing Count': df.isnull().sum().values,  # 每列的缺失值数量
-        'Missing Percentage': (df.isnull().sum() / len(df) * 100).values  # 每列的缺失值百分比
-    })
-    missing_stats = missing_stats[missing_stats['Missing Count'] > 0]  # 只显示有缺失值的列
+    missing_stats = quality['missing_stats']  # 有缺失值的列
     
     if len(missing_stats) > 0:  # 如果有缺失值
-        st.write("**Missing Values by Column:**")  # 表格标题
+        st.write(t("**Missing Values by Column:**"))  # 表格标题
         st.dataframe(missing_stats, use_container_width=True)  # 显示缺失值统计表格
     else:
-        st.success("✅ No missing values found")  # 如果没有缺失值，显示成功消息
-    
-    st.subheader("Data Validation Checks")  # 数据验证检查子标题
+        st.success(t("✅ No missing values found"))  # 如果没有缺失值，显示成功消息
     
-    validation_checks = [  # 定义数据验证检查项列表
-        ("Prices are non-negative", (df['price'] >= 0).all()),  # 检查所有价格是否都非负
-        ("Positive ratings between 0-1", ((df['positive_ratio'] >= 0) & (df['positive_ratio'] <= 1)).all()),  # 检查好评率范围
-        ("Playtime is non-negative", (df['average_playtime'] >= 0).all()),  # 检查游戏时长非负
-        ("Release dates are reasonable", (df['release_year'] >= 1990).all())  # 检查发布日期合理性
-    ]
+    st.subheader(t("Data Validation Checks"))  # 数据验证检查子标题
     
-    for check_name, check_result in validation_checks:  # 遍历每个验证检查项
+    for check_name, check_result in quality['validation_checks']:  # 遍历每个验证检查项
         if check_result:  # 如果检查通过
-            st.success(f"✅ {check_name}")  # 显示成功图标和检查名称
+            st.success(f"✅ {t(check_name)}")  # 显示成功图标和检查名称
         else:  # 如果检查失败
-            st.error(f"❌ {check_name}")  # 显示错误图标和检查名称
\ No newline at end of file
+            st.error(f"❌ {t(check_name)}")  # 显示错误图标和检查名称
+    
+    if not quality['quarantined_dates'].empty:  # 显示被隔离的行，便于修正数据源
+        st.write(t("**Quarantined Rows ({count} with missing or unparseable release dates, excluded from the analysis):**", count=len(quality['quarantined_dates'])))
+        st.dataframe(quality['quarantined_dates'], use_container_width=True)  # 显示隔离记录表格
\ No newline at end of file